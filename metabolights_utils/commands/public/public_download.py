@@ -3,8 +3,10 @@ from typing import Union
 
 import click
 
+from metabolights_utils.commands.utils import echo_transfer_progress
 from metabolights_utils.provider import definitions
-from metabolights_utils.provider.ftp.model import LocalDirectory
+from metabolights_utils.provider.ftp.model import FtpTransferOrder, LocalDirectory
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
 from metabolights_utils.provider.ftp_repository import MetabolightsFtpRepository
 from metabolights_utils.provider.utils import is_metadata_filename_pattern
 
@@ -41,6 +43,27 @@ from metabolights_utils.provider.utils import is_metadata_filename_pattern
     default=False,
     help="Downloads files and override current local copies.",
 )
+@click.option(
+    "--max_connections",
+    "-n",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of parallel FTP connections to download data files.",
+)
+@click.option(
+    "--transfer_order",
+    "-t",
+    default=FtpTransferOrder.SMALLEST_FIRST.value,
+    type=click.Choice([x.value for x in FtpTransferOrder]),
+    help="Order of parallel data file downloads.",
+)
+@click.option(
+    "--max_rate",
+    "-r",
+    default=0,
+    type=click.FloatRange(min=0),
+    help="Maximum total download rate of data files in MB/s. 0 is unlimited.",
+)
 @click.argument("study_id")
 @click.argument("file", required=False)
 def public_download(
@@ -51,6 +74,9 @@ def public_download(
     ftp_server_url: Union[None, str] = None,
     ftp_root_directory: Union[None, str] = None,
     override_local_files: bool = False,
+    max_connections: int = 1,
+    transfer_order: str = FtpTransferOrder.SMALLEST_FIRST.value,
+    max_rate: float = 0,
 ):
     """
     Download study data and metadata files from MetaboLights FTP server.
@@ -78,6 +104,8 @@ def public_download(
             delete_unlisted_metadata_files=False,
         )
     else:
+        rate_limiter = FtpRateLimiter(max_rate * 1024**2) if max_rate else None
+        monitor = FtpTransferMonitor(callbacks=[echo_transfer_progress])
         result: LocalDirectory = client.download_study_data_files(
             study_id=study_id,
             local_path=local_path,
@@ -86,7 +114,12 @@ def public_download(
             skip_files=None,
             delete_unlisted_local_files=False,
             keep_local_files=None,
+            max_connections=max_connections,
+            transfer_order=FtpTransferOrder(transfer_order),
+            rate_limiter=rate_limiter,
+            monitor=monitor,
         )
+        click.echo(err=True)
 
     if result.success:
         if result.actions:
@@ -1,10 +1,15 @@
 import json
-from typing import Any, Callable, Dict, Literal, Union
+from typing import Any, Callable, Dict, Literal, TextIO, Union
 
 import click
 
 from metabolights_utils.commands.utils import convert_html_to_plain_text, split_to_lines
 from metabolights_utils.provider import definitions
+from metabolights_utils.provider.http_cache import HttpResponseCache
+from metabolights_utils.provider.public_search import (
+    PublicSearchException,
+    iterate_public_search_results,
+)
 from metabolights_utils.provider.utils import rest_api_post
 
 JoinOperator = Literal["and", "or"]
@@ -58,6 +63,40 @@ JoinOperator = Literal["and", "or"]
     default=False,
     help="Shows raw result in json format.",
 )
+@click.option(
+    "--cache_path",
+    "-c",
+    default=definitions.default_local_http_cache_path,
+    help="Path to store search responses.",
+)
+@click.option(
+    "--cache_ttl",
+    "-t",
+    default=definitions.default_http_cache_ttl_in_seconds,
+    type=int,
+    help="Cached search responses are used without revalidation for this period (seconds).",
+)
+@click.option(
+    "--no_cache",
+    is_flag=True,
+    default=False,
+    help="Sends search request without using cached responses.",
+)
+@click.option(
+    "--all",
+    "all_results",
+    is_flag=True,
+    default=False,
+    help="Fetches all matched items page by page and prints each item as a JSON line. "
+    "limit is used as page size.",
+)
+@click.option(
+    "--output",
+    "-o",
+    default="-",
+    type=click.File("w"),
+    help="Output file of --all option. Default is standard output.",
+)
 @click.argument("query", required=False)
 def public_search(
     search_rest_api_url: str = "",
@@ -68,6 +107,11 @@ def public_search(
     query: Union[None, str] = None,
     study_ids: bool = False,
     raw: bool = False,
+    cache_path: str = definitions.default_local_http_cache_path,
+    cache_ttl: int = definitions.default_http_cache_ttl_in_seconds,
+    no_cache: bool = False,
+    all_results: bool = False,
+    output: Union[None, TextIO] = None,
 ):
     """
     Search public studies with query keywords. If there are multiple search keywords and no join operator (+, |) defined, results are merged with the selected query join operator (and, or)
@@ -92,11 +136,36 @@ def public_search(
         exit(1)
     headers = {}
     url = f"{search_rest_api_url.rstrip('/')}/{sub_path.lstrip('/')}"
+    cache = None
+    if not no_cache:
+        cache = HttpResponseCache(cache_path, ttl_in_seconds=cache_ttl)
+    if all_results:
+        items = iterate_public_search_results(
+            query=query,
+            body=body,
+            query_join_operator=query_join_operator,
+            skip=skip,
+            page_size=limit,
+            search_rest_api_url=search_rest_api_url,
+            cache=cache,
+        )
+        output = output or click.get_text_stream("stdout")
+        try:
+            for item in items:
+                if study_ids:
+                    output.write(f"{item.get('studyId', '')}\n")
+                else:
+                    output.write(f"{json.dumps(item)}\n")
+        except PublicSearchException as ex:
+            click.echo(str(ex), err=True)
+            exit(1)
+        exit(0)
     response, error = rest_api_post(
         url=url,
         headers=headers,
         parameters=parameters,
         json_body=body,
+        cache=cache,
     )
     if response and not error:
         if raw and "content" in response:
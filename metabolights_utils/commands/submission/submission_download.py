@@ -48,6 +48,13 @@ from metabolights_utils.provider.submission_repository import (
     default=definitions.default_local_submission_credentials_file_path,
     help="Path to store cache files of study submission file indices, study models, etc.",
 )
+@click.option(
+    "--max_workers",
+    "-n",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Number of parallel metadata file downloads.",
+)
 @click.argument("study_id")
 @click.argument("files", required=False)
 def submission_download(
@@ -59,6 +66,7 @@ def submission_download(
     rest_api_base_url: Union[None, str] = None,
     override_local_files: bool = False,
     credentials_file_path: str = "",
+    max_workers: int = 4,
 ):
     """
     Download submission study metadata files.
@@ -78,6 +86,7 @@ def submission_download(
         study_id=study_id,
         override_local_files=override_local_files,
         delete_unlisted_metadata_files=False,
+        max_workers=max_workers,
     )
     study_path = os.path.join(client.local_storage_root_path, study_id)
     click.echo(f"Download submission study {study_id} on {study_path} status:")
@@ -2,7 +2,9 @@ from typing import List, Union
 
 import click
 
+from metabolights_utils.commands.utils import echo_transfer_progress
 from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
 from metabolights_utils.provider.submission_repository import (
     MetabolightsSubmissionRepository,
 )
@@ -45,6 +47,27 @@ from metabolights_utils.provider.submission_repository import (
     "-a",
     help="MetaboLights user API token.",
 )
+@click.option(
+    "--max_connections",
+    "-n",
+    default=4,
+    type=click.IntRange(min=1),
+    help="Number of parallel metadata file uploads and FTP connections to upload data files.",
+)
+@click.option(
+    "--blocksize",
+    "-b",
+    default=8192,
+    type=click.IntRange(min=1024),
+    help="Size of data blocks in bytes sent to FTP server.",
+)
+@click.option(
+    "--max_rate",
+    "-r",
+    default=0,
+    type=click.FloatRange(min=0),
+    help="Maximum total upload rate of data files in MB/s. 0 is unlimited.",
+)
 @click.argument("study_id")
 @click.argument("metadata_files", required=False)
 def submission_upload(
@@ -57,6 +80,9 @@ def submission_upload(
     override_remote_files: bool = False,
     credentials_file_path: str = "",
     user_api_token: Union[str, None] = None,
+    max_connections: int = 4,
+    blocksize: int = 8192,
+    max_rate: float = 0,
 ):
     """
     Uploads local files to private FTP and start sync task to update study folder.
@@ -82,12 +108,12 @@ def submission_upload(
         exit(1)
     success, message = client.upload_metadata_files(
         study_id=study_id,
+        metadata_files_path=None,
         override_remote_files=override_remote_files,
         metadata_files=metadata_files,
-        ftp_server_url=ftp_details.ftp_host,
-        ftp_username=ftp_details.ftp_user,
-        ftp_password=ftp_details.ftp_password,
         user_api_token=user_api_token,
+        rest_api_base_url=rest_api_base_url,
+        max_workers=max_connections,
     )
     if success:
         click.echo(f"Upload private study {study_id} metadata files: Success")
@@ -95,14 +121,20 @@ def submission_upload(
     else:
         click.echo(f"Upload private study {study_id} metadata files: Failed {message}")
         exit(1)
+    rate_limiter = FtpRateLimiter(max_rate * 1024**2) if max_rate else None
+    monitor = FtpTransferMonitor(callbacks=[echo_transfer_progress])
     success, message = client.upload_data_files(
         study_id=study_id,
-        local_path=local_path,
         remote_folder_directory=ftp_details.ftp_folder,
         ftp_server_url=ftp_details.ftp_host,
         ftp_username=ftp_details.ftp_user,
         ftp_password=ftp_details.ftp_password,
+        max_connections=max_connections,
+        blocksize=blocksize,
+        rate_limiter=rate_limiter,
+        monitor=monitor,
     )
+    click.echo(err=True)
     if success:
         click.echo(f"Upload private study {study_id} data files: Success")
         click.echo(message)
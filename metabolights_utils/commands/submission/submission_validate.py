@@ -1,5 +1,5 @@
 import os
-from typing import Union
+from typing import List, TextIO, Tuple, Union
 
 import click
 
@@ -31,36 +31,64 @@ from metabolights_utils.provider.submission_repository import (
 @click.option(
     "--validation_file_path",
     "-v",
-    help="Path to store validation file.",
+    help="Path to store validation file. It is a folder path if there are multiple studies.",
 )
-@click.argument("study_id")
+@click.option(
+    "--study_ids_file",
+    "-f",
+    type=click.File("r"),
+    help="File with a study id in each line. Use - to read from standard input.",
+)
+@click.option(
+    "--max_workers",
+    "-n",
+    default=8,
+    type=click.IntRange(min=1),
+    help="Number of studies validated at the same time in batch mode.",
+)
+@click.argument("study_ids", nargs=-1)
 def submission_validate(
-    study_id: str = "",
+    study_ids: Tuple[str, ...] = (),
     rest_api_base_url: Union[None, str] = None,
     local_cache_path: Union[None, str] = None,
-    validation_file_path: bool = False,
+    validation_file_path: Union[None, str] = None,
     credentials_file_path: str = "",
+    study_ids_file: Union[None, TextIO] = None,
+    max_workers: int = 8,
 ):
     """
     Validate submitted study and save validation report on local storage.
 
-    study_id: MetaboLights study accession number (MTBLSxxxx).
+    study_ids: MetaboLights study accession numbers (MTBLSxxxx).
 
+    Multiple studies are validated concurrently, and the result of each study
+    is printed as a JSON line when its validation is completed.
     """
-    if not validation_file_path:
-        validation_file_path = os.path.join(
-            local_cache_path, study_id, f"{study_id}_validation_report.tsv"
-        )
-    validation_file_path = os.path.realpath(validation_file_path)
-    dir_name = os.path.dirname(validation_file_path)
-    os.makedirs(dir_name, exist_ok=True)
-
-    study_id = study_id.upper().strip()
+    study_ids = [x.upper().strip() for x in study_ids if x.strip()]
+    if study_ids_file:
+        study_ids.extend(x.upper().strip() for x in study_ids_file if x.strip())
+    study_ids = list(dict.fromkeys(study_ids))
+    if not study_ids:
+        click.echo("There is no study id to validate.")
+        exit(1)
     client = MetabolightsSubmissionRepository(
         local_storage_cache_path=local_cache_path,
         rest_api_base_url=rest_api_base_url,
         credentials_file_path=credentials_file_path,
     )
+    if len(study_ids) > 1 or study_ids_file:
+        validate_studies(
+            client, study_ids, local_cache_path, validation_file_path, max_workers
+        )
+        return
+
+    study_id = study_ids[0]
+    if not validation_file_path:
+        validation_file_path = get_validation_file_path(study_id, local_cache_path)
+    validation_file_path = os.path.realpath(validation_file_path)
+    dir_name = os.path.dirname(validation_file_path)
+    os.makedirs(dir_name, exist_ok=True)
+
     success, error = client.validate_study(
         study_id,
         validation_result_file_path=validation_file_path,
@@ -77,5 +105,39 @@ def submission_validate(
         exit(1)
 
 
+def get_validation_file_path(
+    study_id: str, local_cache_path: str, folder_path: Union[None, str] = None
+) -> str:
+    filename = f"{study_id}_validation_report.tsv"
+    if folder_path:
+        return os.path.realpath(os.path.join(folder_path, filename))
+    return os.path.realpath(os.path.join(local_cache_path, study_id, filename))
+
+
+def validate_studies(
+    client: MetabolightsSubmissionRepository,
+    study_ids: List[str],
+    local_cache_path: str,
+    folder_path: Union[None, str],
+    max_workers: int,
+):
+    file_paths = {
+        x: get_validation_file_path(x, local_cache_path, folder_path) for x in study_ids
+    }
+    api_token, error = client.get_api_token()
+    if not api_token:
+        click.echo(f"Validate studies error: {error}")
+        exit(1)
+    failed = 0
+    for result in client.iterate_study_validations(
+        file_paths, max_workers=max_workers, user_api_token=api_token
+    ):
+        if not result.success:
+            failed += 1
+        click.echo(result.model_dump_json())
+    if failed:
+        exit(1)
+
+
 if __name__ == "__main__":
     submission_validate(["MTBLS5397"])
@@ -2,6 +2,7 @@ import io
 import re
 from typing import Callable, List
 
+import click
 import requests
 from bs4 import BeautifulSoup
 
@@ -10,6 +11,7 @@ from metabolights_utils.models.isa.common import IsaTable
 from metabolights_utils.models.isa.investigation_file import Study
 from metabolights_utils.models.metabolights.model import MetabolightsStudyModel
 from metabolights_utils.models.parser.enums import ParserMessageType
+from metabolights_utils.provider.ftp.model import FtpTransferProgress
 
 
 def download_file(url: str, output_path: str):
@@ -240,3 +242,23 @@ def print_columns(
                     report.append(f"{colum_name}:\n{tab}{joined_terms}")
             else:
                 report.append(f"{colum_name}: -")
+
+
+def echo_transfer_progress(progress: FtpTransferProgress):
+    """
+    Print aggregate throughput of file transfers on one line of standard error.
+    """
+    metrics = progress.metrics
+    completed = metrics.completed_files + metrics.skipped_files + metrics.failed_files
+    eta = "-"
+    if metrics.eta_in_seconds is not None:
+        eta = (
+            f"{int(metrics.eta_in_seconds // 60)}m {int(metrics.eta_in_seconds % 60)}s"
+        )
+    line = (
+        f"{completed}/{metrics.total_files} files, "
+        f"{metrics.transferred_bytes / 1024**2:.1f}/"
+        f"{metrics.total_bytes / 1024**2:.1f} MB, "
+        f"{metrics.bytes_per_second / 1024**2:.2f} MB/s, ETA {eta}"
+    )
+    click.echo(f"\r{line:<70}", nl=False, err=True)
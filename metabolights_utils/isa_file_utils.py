@@ -1,4 +1,9 @@
+import asyncio
+import hashlib
+import itertools
 import logging
+import os
+import uuid
 from pathlib import Path
 from typing import Any, List, Tuple, Union
 
@@ -6,9 +11,12 @@ from metabolights_utils.isatab import Writer
 from metabolights_utils.models.isa.common import IsaTable, IsaTableColumn, IsaTableFile
 from metabolights_utils.models.isa.enums import ColumnsStructure
 from metabolights_utils.models.metabolights.model import MetabolightsStudyModel
+from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
 
 logger = logging.getLogger(__name__)
 
+_SANITISE_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
 
 class IsaFileUtils:
     @staticmethod
@@ -18,7 +26,17 @@ class IsaFileUtils:
         values_in_quotation_mark: bool = False,
         investigation_module_name: Union[None, str] = None,
         sync_comments_from_fields: bool = True,
-    ):
+        skip_unchanged_files: bool = False,
+    ) -> List[str]:
+        """Saves investigation and ISA table files of study model.
+
+        ISA table files are saved concurrently in worker threads.
+        If skip_unchanged_files is True, ISA table files with the same content
+        are not updated and their modification times are not changed.
+
+        Returns:
+            List[str]: Relative paths of the created or updated ISA table files.
+        """
         output_dir_path = Path(output_dir)
         if not output_dir_path.exists():
             logger.info("Study save folder %s is created", output_dir)
@@ -33,18 +51,27 @@ class IsaFileUtils:
             investigation_module_name=investigation_module_name,
             sync_comments_from_fields=sync_comments_from_fields,
         )
-        for isa_table_files in (
-            mtbls_model.samples,
-            mtbls_model.assays,
-            mtbls_model.metabolite_assignments,
-        ):
-            for isa_table_file in isa_table_files.values():
-                i_file_name = isa_table_file.file_path
-                await IsaFileUtils.save_isa_table(
+        isa_table_files = [
+            x
+            for files in (
+                mtbls_model.samples,
+                mtbls_model.assays,
+                mtbls_model.metabolite_assignments,
+            )
+            for x in files.values()
+        ]
+        results = await asyncio.gather(
+            *[
+                IsaFileUtils.save_isa_table(
                     isa_table_file,
                     f"{output_dir}/{isa_table_file.file_path}",
                     values_in_quotation_mark=values_in_quotation_mark,
+                    skip_unchanged_file=skip_unchanged_files,
                 )
+                for isa_table_file in isa_table_files
+            ]
+        )
+        return [x.file_path for x, saved in zip(isa_table_files, results) if saved]
 
     @staticmethod
     def sanitise_data(value: Union[None, Any]):
@@ -62,12 +89,64 @@ class IsaFileUtils:
             str(value).replace("\n", " ").replace("\r", " ").replace("\t", " ").strip()
         )
 
+    @staticmethod
+    def sanitise_column(
+        values: List[Any], values_in_quotation_mark: bool = False
+    ) -> List[str]:
+        if values_in_quotation_mark:
+            return [
+                f'"{str(x).translate(_SANITISE_TABLE).strip()}"' if x else '""'
+                for x in values
+            ]
+        return [
+            str(x).translate(_SANITISE_TABLE).strip().strip('"') if x else ""
+            for x in values
+        ]
+
     @staticmethod
     async def save_isa_table(
         isa_table_file: IsaTableFile,
         file_path: str,
         values_in_quotation_mark=False,
-    ):
+        skip_unchanged_file: bool = False,
+    ) -> bool:
+        return await asyncio.to_thread(
+            IsaFileUtils.write_isa_table,
+            isa_table_file,
+            file_path,
+            values_in_quotation_mark=values_in_quotation_mark,
+            skip_unchanged_file=skip_unchanged_file,
+        )
+
+    @staticmethod
+    def write_isa_table(
+        isa_table_file: IsaTableFile,
+        file_path: str,
+        values_in_quotation_mark=False,
+        skip_unchanged_file: bool = False,
+        encoding: str = "utf-8",
+        rows_per_chunk: int = 10000,
+    ) -> bool:
+        """Writes ISA table to file path.
+
+        Cell values are sanitised column by column and rows are written in chunks.
+        Content is written to a temporary file on the same folder
+        and replaces the target file atomically.
+
+        Args:
+            isa_table_file (IsaTableFile): ISA table file model.
+            file_path (str): Target file path.
+            values_in_quotation_mark (bool, optional): add values in quotation mark.
+                Defaults to False.
+            skip_unchanged_file (bool, optional): If it is True and the target file has
+                the same content, the target file is not updated. Defaults to False.
+            encoding (str, optional): File encoding. Defaults to "utf-8".
+            rows_per_chunk (int, optional): Number of rows per write call.
+                Defaults to 10000.
+
+        Returns:
+            bool: True if the target file is created or updated.
+        """
         column_order_map = {}
         column_header_map = {}
         data = isa_table_file.table.data
@@ -75,38 +154,51 @@ class IsaFileUtils:
             column_order_map[column_model.column_index] = column_model.column_name
             column_header_map[column_model.column_index] = column_model.column_header
         file = Path(file_path)
-        basename = file.parent.name
         if not file.parent.exists():
             logger.info("Study save folder %s is created", file.parent)
             file.parent.mkdir(parents=True, exist_ok=True)
 
-        logger.info("Saving file: %s", basename)
-        with file.open("w") as f:
-            if values_in_quotation_mark:
-                header = [
-                    f'"{column_header_map[idx]}"'
-                    for idx in range(len(column_header_map))
-                ]
-            else:
-                header = [
-                    column_header_map[idx].strip('"')
-                    for idx in range(len(column_header_map))
-                ]
-            f.write("\t".join(header) + "\n")
-
-            column_names = [
-                column_order_map[idx] for idx in range(len(column_order_map))
+        if values_in_quotation_mark:
+            header = [
+                f'"{column_header_map[idx]}"' for idx in range(len(column_header_map))
             ]
-            for row_idx in range(len(data[column_names[0]])):
-                row = [data[column_name][row_idx] for column_name in column_names]
-                for idx, cell in enumerate(row):
-                    cell = IsaFileUtils.sanitise_data(cell) if row[idx] else ""
-                    if values_in_quotation_mark:
-                        cell = f'"{cell}"'
-                    else:
-                        cell = cell.strip('"')
-                    row[idx] = cell
-                f.write("\t".join(row) + "\n")
+        else:
+            header = [
+                column_header_map[idx].strip('"')
+                for idx in range(len(column_header_map))
+            ]
+        column_names = [column_order_map[idx] for idx in range(len(column_order_map))]
+        columns = [
+            IsaFileUtils.sanitise_column(data[x], values_in_quotation_mark)
+            for x in column_names
+        ]
+
+        sha256_hash = hashlib.sha256()
+        temp_file = file.parent / Path(f".{file.name}_{uuid.uuid4().hex}")
+        try:
+            with temp_file.open("w", encoding=encoding) as f:
+                content = "\t".join(header) + "\n"
+                rows = zip(*columns)
+                while content:
+                    f.write(content)
+                    sha256_hash.update(content.encode(encoding))
+                    lines = [
+                        "\t".join(x) for x in itertools.islice(rows, rows_per_chunk)
+                    ]
+                    content = "\n".join(lines) + "\n" if lines else ""
+            if (
+                skip_unchanged_file
+                and file.exists()
+                and HashUtils.sha256sum(file) == sha256_hash.hexdigest()
+            ):
+                logger.debug("File is not changed: %s", file.name)
+                return False
+            logger.info("Saving file: %s", file.name)
+            os.replace(temp_file, file)
+            return True
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
 
     @staticmethod
     def add_isa_table_columns(
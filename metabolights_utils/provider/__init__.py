@@ -3,10 +3,13 @@ from metabolights_utils.provider import (
     definitions,
     ftp,
     ftp_repository,
+    http_cache,
     local_folder_metadata_collector,
+    public_search,
     study_provider,
     submission_model,
     submission_repository,
+    task_waiter,
     utils,
 )
 
@@ -15,10 +18,13 @@ __all__ = [
     "async_provider",
     "definitions",
     "ftp_repository",
+    "http_cache",
     "local_folder_metadata_collector",
+    "public_search",
     "study_provider",
     "submission_model",
     "submission_repository",
+    "task_waiter",
     "utils",
     "model",
 ]
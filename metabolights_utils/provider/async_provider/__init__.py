@@ -1,3 +1,6 @@
-from metabolights_utils.provider.async_provider import study_provider
+from metabolights_utils.provider.async_provider import (
+    study_provider,
+    submission_repository,
+)
 
-__all__ = ["study_provider"]
+__all__ = ["study_provider", "submission_repository"]
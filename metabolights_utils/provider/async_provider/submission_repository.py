@@ -0,0 +1,714 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Literal, Tuple, Union
+
+import httpx
+
+from metabolights_utils.commands.submission.model import (
+    StudyResponse,
+    SubmittedStudiesResponse,
+)
+from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.model import LocalDirectory
+from metabolights_utils.provider.http_cache import HttpResponseCache
+from metabolights_utils.provider.submission_model import (
+    APIResponse,
+    FtpUploadDetails,
+    MetadataFileIndex,
+    PolicySummaryResult,
+    StudyValidationResult,
+    WorkerTaskResponseContent,
+)
+from metabolights_utils.provider.submission_repository import (
+    BaseMetabolightsSubmissionRepository,
+    get_remote_modified_time,
+)
+from metabolights_utils.provider.task_waiter import TaskWaiter
+from metabolights_utils.provider.utils import (
+    RETRY_HTTP_STATUS_CODES,
+    HttpRetryPolicy,
+    async_download_file_from_rest_api,
+    async_rest_api_get,
+    create_async_http_client,
+    is_metadata_filename_pattern,
+)
+from metabolights_utils.utils.filename_utils import join_path
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMetabolightsSubmissionRepository(BaseMetabolightsSubmissionRepository):
+    """Async version of MetabolightsSubmissionRepository.
+
+    Requests are sent with a pooled httpx.AsyncClient and task status is polled
+    without blocking the event loop. Methods have the same arguments and return
+    the same models as the sync repository. The repository should be closed
+    with aclose or used as an async context manager if it creates its own client.
+    """
+
+    def __init__(
+        self,
+        local_storage_root_path: Union[None, str] = None,
+        credentials_file_path: Union[None, str] = None,
+        ftp_server_url: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+        validation_api_base_url: Union[None, str] = None,
+        local_storage_cache_path: Union[None, str] = None,
+        http_client: Union[None, httpx.AsyncClient] = None,
+        http_cache: Union[None, HttpResponseCache] = None,
+    ) -> None:
+        super().__init__(
+            local_storage_root_path=local_storage_root_path,
+            credentials_file_path=credentials_file_path,
+            ftp_server_url=ftp_server_url,
+            rest_api_base_url=rest_api_base_url,
+            validation_api_base_url=validation_api_base_url,
+            local_storage_cache_path=local_storage_cache_path,
+            http_cache=http_cache,
+        )
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or create_async_http_client()
+
+    async def aclose(self) -> None:
+        if self._owns_http_client:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "AsyncMetabolightsSubmissionRepository":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def list_study_directory(
+        self,
+        study_id: str,
+        subdirectory: Union[str, None] = None,
+        timeout=None,
+        user_api_token: Union[str, None] = None,
+        rest_api_base_url: Union[None, str] = None,
+    ) -> Tuple[Union[None, StudyResponse], Union[None, str]]:
+        study_id = study_id.upper().strip("/") if study_id else ""
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return None, error
+        headers = {"User-Token": user_api_token}
+        sub_path = f"/studies/{study_id}/files/tree"
+        parameters = {
+            "location": "study",
+            "include_sub_dir": False,
+            "include_internal_files": False,
+        }
+        if subdirectory:
+            parameters["directory"] = subdirectory.strip("/")
+        if not rest_api_base_url:
+            rest_api_base_url = self.rest_api_base_url
+        url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+        data, error = await async_rest_api_get(
+            url,
+            self.http_client,
+            timeout=timeout,
+            cache=self.http_cache,
+            parameters=parameters,
+            headers=headers,
+        )
+        if not data:
+            return None, error
+        studies_response = StudyResponse.model_validate(data)
+        studies_response.study.sort(key=lambda x: x.file)
+        return studies_response, None
+
+    async def list_isa_metadata_files(
+        self,
+        study_id: str,
+        user_api_token: Union[str, None] = None,
+        rest_api_base_url: Union[None, str] = None,
+    ) -> Tuple[Union[StudyResponse, None], Union[None, str]]:
+        response, error = await self.list_study_directory(
+            study_id=study_id,
+            user_api_token=user_api_token,
+            rest_api_base_url=rest_api_base_url,
+        )
+        if not response:
+            return response, error
+        response.study = [
+            x for x in response.study if is_metadata_filename_pattern(x.file)
+        ]
+        return response, None
+
+    async def list_studies(
+        self, timeout=None, parameters=None
+    ) -> Tuple[Union[None, SubmittedStudiesResponse], Union[str, None]]:
+        api_header, error = self.get_api_token()
+        if not api_header:
+            return None, error
+        sub_path = "/studies/user"
+        url = f"{self.rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+        data, error = await async_rest_api_get(
+            url,
+            self.http_client,
+            timeout=timeout,
+            cache=self.http_cache,
+            headers={"User-Token": api_header},
+            parameters=parameters,
+        )
+        if not data:
+            return None, error
+        return SubmittedStudiesResponse.model_validate(data), None
+
+    async def get_ftp_upload_details(
+        self,
+        study_id,
+        rest_api_base_url: Union[str, None] = None,
+        user_api_token: Union[str, None] = None,
+        timeout: int = 5,
+    ) -> Tuple[Union[None, FtpUploadDetails], str]:
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return None, error
+        sub_path = f"/studies/{study_id}/upload-info"
+        api_name = "get private ftp upload details"
+        rest_api_base_url = rest_api_base_url or self.rest_api_base_url
+        try:
+            url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+            response = await self.http_client.get(
+                url=url, timeout=timeout, headers={"User-Token": user_api_token}
+            )
+            success, error = self.check_api_response(api_name, response)
+            if not success:
+                return None, error
+            data = json.loads(response.text)
+            return FtpUploadDetails.model_validate(data, from_attributes=True), ""
+        except Exception as ex:
+            return None, f"{api_name} failure: {str(ex)}."
+
+    async def upload_metadata_files(
+        self,
+        study_id,
+        metadata_files_path: str,
+        user_api_token: str,
+        metadata_files: Union[List[str], None] = None,
+        override_remote_files: bool = False,
+        rest_api_base_url: Union[None, str] = None,
+        remove_unreferenced_metadata_files: bool = False,
+        max_workers: Union[None, int] = None,
+        max_retries: Union[None, int] = None,
+    ) -> Tuple[bool, str]:
+        """Uploads new and updated metadata files concurrently.
+
+        At most max_workers files are uploaded at the same time.
+        """
+        if not metadata_files_path:
+            local_path = join_path(self.local_storage_root_path)
+            study_folder = Path(local_path) / Path(study_id)
+        else:
+            study_folder = Path(metadata_files_path)
+        study_path = str(study_folder.resolve())
+
+        rest_api_base_url = rest_api_base_url or self.rest_api_base_url
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return False, error
+
+        response, _ = await self.list_isa_metadata_files(
+            study_id=study_id,
+            user_api_token=user_api_token,
+            rest_api_base_url=rest_api_base_url,
+        )
+        if not response:
+            return False, "Errors while listing metadata files."
+        remote_files = {x.file: x for x in response.study}
+
+        if not study_folder.exists():
+            return False, f"Study path does not exist: {study_path}"
+        if not metadata_files or override_remote_files:
+            files = os.listdir(study_path)
+            metadata_files = [x for x in files if is_metadata_filename_pattern(x)]
+        metadata_files = [Path(x).name for x in metadata_files]
+
+        will_be_deleted_files = []
+        if remove_unreferenced_metadata_files:
+            will_be_deleted_files = list(set(remote_files) - set(metadata_files))
+
+        index = self.load_metadata_file_index(study_id)
+        new_requested_files = self.select_metadata_files_to_upload(
+            study_folder,
+            metadata_files,
+            remote_files,
+            index,
+            override_remote_files=override_remote_files,
+        )
+        if not new_requested_files:
+            return (
+                False,
+                "There is no metadata file to upload or "
+                "local metadata files are up-to-date.",
+            )
+
+        headers = {"User-Token": user_api_token}
+        timeout = 120
+        sub_path = f"/studies/{study_id}/drag-drop-upload"
+        file_paths = [study_folder / Path(x) for x in new_requested_files]
+        url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+        retry_policy = HttpRetryPolicy(max_retries=max_retries)
+        semaphore = asyncio.Semaphore(
+            max_workers or definitions.default_http_max_workers
+        )
+
+        async def upload(file_path: Path) -> Union[None, str]:
+            async with semaphore:
+                return await self.upload_metadata_file(
+                    url, file_path, headers, timeout=timeout, retry_policy=retry_policy
+                )
+
+        results = await asyncio.gather(*[upload(x) for x in file_paths])
+        errors = [x for x in results if x]
+        uploaded_files = [
+            x.name for x, error in zip(file_paths, results, strict=True) if not error
+        ]
+        if uploaded_files:
+            await self.update_metadata_file_index(
+                index, study_folder, uploaded_files, user_api_token, rest_api_base_url
+            )
+
+        if errors:
+            return False, "Upload failures:\n" + "\n".join(errors)
+        if remove_unreferenced_metadata_files:
+            sub_path = f"/studies/{study_id}/files"
+            file_delete_payload = {
+                "files": [{"name": file_name} for file_name in will_be_deleted_files]
+            }
+            url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+            response = await self.http_client.post(
+                url=url, timeout=timeout, headers=headers, json=file_delete_payload
+            )
+            if response.status_code not in (200, 201):
+                return (
+                    False,
+                    f"Failed to delete files: {response.status_code} {response.text}",
+                )
+            for file_name in will_be_deleted_files:
+                index.files.pop(file_name, None)
+            self.save_metadata_file_index(index)
+
+        return True, "Success"
+
+    async def upload_metadata_file(
+        self,
+        url: str,
+        file_path: Path,
+        headers: Dict[str, str],
+        timeout: Union[None, int] = None,
+        retry_policy: Union[None, HttpRetryPolicy] = None,
+    ) -> Union[None, str]:
+        """Uploads a metadata file and returns the error message if it fails."""
+        retry_policy = retry_policy or HttpRetryPolicy()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            try:
+                # Metadata files are small, so they are read at once.
+                content = await asyncio.to_thread(file_path.read_bytes)
+                response = await self.http_client.post(
+                    url=url,
+                    timeout=timeout,
+                    headers=headers,
+                    files=[("file", (file_path.name, content))],
+                )
+                if response.status_code in (200, 201):
+                    return None
+                error = f"{file_path.name}: {response.status_code} {response.text}"
+                retryable = response.status_code in RETRY_HTTP_STATUS_CODES
+            except httpx.TransportError as ex:
+                error = f"{file_path.name}: {ex}"
+                retryable = True
+            except Exception as ex:
+                return f"{file_path.name}: {ex}"
+            if not retryable or attempt > retry_policy.max_retries:
+                return error
+            wait_time = retry_policy.get_wait_time(attempt, response)
+            logger.warning(
+                "Upload error %s. Retrying in %.2f seconds...", error, wait_time
+            )
+            await asyncio.sleep(wait_time)
+
+    async def update_metadata_file_index(
+        self,
+        index: MetadataFileIndex,
+        study_folder: Path,
+        file_names: List[str],
+        user_api_token: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+    ) -> None:
+        response, error = await self.list_isa_metadata_files(
+            study_id=index.study_id,
+            user_api_token=user_api_token,
+            rest_api_base_url=rest_api_base_url,
+        )
+        if not response:
+            logger.warning("Metadata file index is not updated: %s", error)
+            return
+        remote_files = {x.file: x for x in response.study}
+        self.set_metadata_file_states(index, study_folder, file_names, remote_files)
+        self.save_metadata_file_index(index)
+
+    async def download_submission_metadata_files(
+        self,
+        study_id: str,
+        metadata_files_path: Union[str, None] = None,
+        metadata_files: Union[List[str], None] = None,
+        override_local_files: bool = False,
+        delete_unlisted_metadata_files: bool = True,
+        max_workers: Union[None, int] = None,
+    ) -> LocalDirectory:
+        """Downloads new and updated metadata files concurrently."""
+        api_header, error = self.get_api_token()
+        if not api_header:
+            return LocalDirectory(code=400, message=f"user token error: {error}")
+        if not study_id:
+            return LocalDirectory(code=400, message="Invalid study_id")
+        local_path = metadata_files_path or join_path(self.local_storage_root_path)
+        response = LocalDirectory(root_path=local_path)
+        study_id = study_id.upper().strip("/")
+
+        result, error = await self.list_isa_metadata_files(study_id)
+        if not result:
+            return LocalDirectory(
+                code=404, message="There is no metadata file to download."
+            )
+        descriptors = {x.file: x for x in result.study}
+        requested_files = metadata_files or [x.file for x in result.study]
+        requested_files = [
+            x
+            for x in requested_files
+            if is_metadata_filename_pattern(x) and x in descriptors
+        ]
+
+        study_path = os.path.join(local_path, study_id)
+        index = self.load_metadata_file_index(study_id)
+        new_requested_files = self.select_metadata_files_to_download(
+            response,
+            study_id,
+            study_path,
+            requested_files,
+            descriptors,
+            index,
+            override_local_files=override_local_files,
+        )
+        try:
+            sub_path = f"/studies/{study_id}/download"
+            url = self.rest_api_base_url.strip("/") + "/" + sub_path.strip("/")
+            semaphore = asyncio.Semaphore(
+                max_workers or definitions.default_http_max_workers
+            )
+
+            async def download(filename: str) -> Tuple[bool, str]:
+                async with semaphore:
+                    return await async_download_file_from_rest_api(
+                        url,
+                        os.path.join(study_path, filename),
+                        self.http_client,
+                        timeout=60,
+                        headers={"User-Token": api_header},
+                        parameters={"file": filename},
+                        modification_time=get_remote_modified_time(
+                            descriptors[filename]
+                        ),
+                        is_zip_response=True,
+                    )
+
+            results = await asyncio.gather(*[download(x) for x in new_requested_files])
+            self.complete_metadata_file_downloads(
+                response,
+                study_id,
+                study_path,
+                dict(zip(new_requested_files, results, strict=True)),
+                descriptors,
+                index,
+                delete_unlisted_metadata_files=delete_unlisted_metadata_files,
+            )
+        except Exception as ex:
+            logger.error("Metadata files download error %s: %s", study_id, str(ex))
+            response.code = 500
+            response.message = str(ex)
+        return response
+
+    async def get_jwt_token(
+        self,
+        user_api_token: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+        timeout: int = 30,
+    ) -> Tuple[Union[None, str], Union[None, str]]:
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return None, error
+        api_name = "validation v2 get jwt token"
+        rest_api_base_url = rest_api_base_url or self.rest_api_base_url
+        url = f"{rest_api_base_url.rstrip('/')}/auth/login-with-token"
+        try:
+            response = await self.http_client.post(
+                url=url, timeout=timeout, json={"token": user_api_token}
+            )
+        except Exception as ex:
+            return None, f"Validation task v2 authentication failure: {str(ex)}."
+        success, error = self.check_api_response(api_name, response)
+        if not success:
+            return None, error
+        jwt_token = response.headers.get("jwt")
+        if not jwt_token:
+            return None, "Failure of authentication."
+        return jwt_token, None
+
+    async def validate_study(
+        self,
+        study_id: str,
+        validation_result_file_path: str,
+        pool_period: int = 5,
+        retry: int = 20,
+        timeout: int = 30,
+        validation_api_base_url: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+        user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> Tuple[Union[None, bool], Union[None, str]]:
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
+        jwt_token, error = await self.get_jwt_token(
+            user_api_token, rest_api_base_url, timeout=timeout
+        )
+        if not jwt_token:
+            logger.error("Validation authentication error: %s", error)
+            return None, error
+
+        headers = {"accept": "application/json"}
+        headers["Authorization"] = f"Bearer {jwt_token}"
+        api_name = "validation v2 task start"
+        validation_api_base_url = (
+            validation_api_base_url or self.validation_api_base_url
+        )
+        sub_path = f"/submissions/v2/validations/{study_id}"
+        url = f"{validation_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+        try:
+            response = await self.http_client.post(
+                url=url, timeout=timeout, headers=headers
+            )
+            success, error = self.check_api_response(api_name, response)
+            if not success:
+                logger.error("%s: %s", api_name, error)
+                return None, error
+            task_start_response = APIResponse[WorkerTaskResponseContent].model_validate(
+                json.loads(response.text), by_alias=True
+            )
+            if not task_start_response.content.task:
+                return None, f"Failure of {api_name}."
+            task_id = task_start_response.content.task.task_id
+        except Exception as ex:
+            logger.error("%s: %s", api_name, ex)
+            return None, f"Validation task v2 start failure: {str(ex)}."
+
+        headers["task-id"] = task_id
+        api_name = "validation task v2 status check"
+        task_check_url = f"{url.rstrip('/')}/{task_id.strip('/')}"
+
+        async def poll_task_status() -> Tuple[bool, Union[None, APIResponse]]:
+            try:
+                response = await self.http_client.get(
+                    url=task_check_url, timeout=timeout, headers=headers
+                )
+            except httpx.TransportError:
+                return False, None
+            success, _ = self.check_api_response(api_name, response)
+            if not success:
+                return False, None
+            task_status_response = APIResponse[
+                WorkerTaskResponseContent[PolicySummaryResult]
+            ].model_validate(json.loads(response.text), by_alias=True)
+            content = task_status_response.content
+            task = content.task if content else None
+            return bool(task and task.ready), task_status_response
+
+        try:
+            done, task_status_response = await task_waiter.wait_async(poll_task_status)
+            if not done or not task_status_response.content.task_result:
+                return None, f"Failure of {api_name}."
+            if not task_status_response.content.task.is_successful:
+                return None, f"Task {task_id} is not successful."
+            result = task_status_response.content.task_result
+            file_path = Path(validation_result_file_path)
+            if file_path.is_dir():
+                return (
+                    None,
+                    f"Validation result file path is a directory: {validation_result_file_path}",
+                )
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            with file_path.open("w", encoding="utf-8") as f:
+                json.dump(result.model_dump(by_alias=True), f, indent=4)
+            return True, task_id
+        except Exception as ex:
+            logger.error("%s: %s", api_name, ex)
+            return None, f"{api_name} failure: {str(ex)}."
+
+    async def validate_studies(
+        self,
+        validation_result_file_paths: Dict[str, str],
+        max_workers: Union[None, int] = None,
+        pool_period: int = 5,
+        retry: int = 20,
+        timeout: int = 30,
+        user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> Dict[str, Tuple[bool, str]]:
+        """Validates studies concurrently and saves their validation results.
+
+        validation_result_file_paths maps study ids to their result file paths.
+        Returns success flag and message of each study. Message is the task id
+        of a successful validation, otherwise the failure reason.
+        """
+        results = await self.gather_study_validations(
+            validation_result_file_paths,
+            max_workers=max_workers,
+            pool_period=pool_period,
+            retry=retry,
+            timeout=timeout,
+            user_api_token=user_api_token,
+            task_waiter=task_waiter,
+        )
+        return {x.study_id: (x.success, x.message) for x in results}
+
+    async def gather_study_validations(
+        self,
+        validation_result_file_paths: Dict[str, str],
+        max_workers: Union[None, int] = None,
+        pool_period: int = 5,
+        retry: int = 20,
+        timeout: int = 30,
+        user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> List[StudyValidationResult]:
+        """Validates studies concurrently and returns results in study order.
+
+        Validation tasks of at most max_workers studies are started
+        and waited at the same time.
+        """
+        semaphore = asyncio.Semaphore(
+            max_workers or definitions.default_http_max_workers
+        )
+
+        async def validate(study_id: str) -> StudyValidationResult:
+            async with semaphore:
+                start = time.perf_counter()
+                file_path = validation_result_file_paths[study_id]
+                success, message = await self.validate_study(
+                    study_id,
+                    validation_result_file_path=file_path,
+                    pool_period=pool_period,
+                    retry=retry,
+                    timeout=timeout,
+                    user_api_token=user_api_token,
+                    task_waiter=task_waiter,
+                )
+                return StudyValidationResult(
+                    study_id=study_id,
+                    success=bool(success),
+                    message=message or "",
+                    validation_result_file_path=file_path,
+                    duration_in_seconds=time.perf_counter() - start,
+                )
+
+        return list(
+            await asyncio.gather(*[validate(x) for x in validation_result_file_paths])
+        )
+
+    async def sync_private_ftp_metadata_files(
+        self,
+        study_id: str,
+        pool_period: int = 10,
+        retry: int = 10,
+        timeout: int = 10,
+        user_api_token: Union[None, str] = None,
+    ):
+        return await self.sync_from_private_ftp(
+            study_id,
+            "metadata",
+            pool_period,
+            retry,
+            timeout,
+            user_api_token=user_api_token,
+        )
+
+    async def sync_private_ftp_data_files(
+        self,
+        study_id: str,
+        pool_period: int = 10,
+        retry: int = 1000,
+        timeout: int = 10,
+        user_api_token: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+    ):
+        return await self.sync_from_private_ftp(
+            study_id,
+            "data",
+            pool_period,
+            retry,
+            timeout,
+            user_api_token=user_api_token,
+            rest_api_base_url=rest_api_base_url,
+        )
+
+    async def sync_from_private_ftp(
+        self,
+        study_id: str,
+        sync_type: Literal["metadata", "data"] = "metadata",
+        pool_period: int = 10,
+        retry: int = 10,
+        timeout: int = 10,
+        user_api_token: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> Tuple[bool, Union[None, str]]:
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return False, error
+        headers = {
+            "User-Token": user_api_token,
+            "Dry-Run": "false",
+            "Sync-Type": sync_type,
+            "Source-Staging-Area": "private-ftp",
+            "Target-Staging-Area": "rw-study"
+            if sync_type == "metadata"
+            else "readonly-study",
+        }
+        rest_api_base_url = rest_api_base_url or self.rest_api_base_url
+        sub_path = f"/studies/{study_id}/study-folders/rsync-task"
+        url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
+        response = await self.http_client.post(
+            url=url, timeout=timeout, headers=headers
+        )
+        if response.status_code not in (200, 201):
+            return False, response.text
+        if not json.loads(response.text).get("task_id"):
+            return False, "Response does not have a task id"
+
+        async def poll_task_status() -> Tuple[bool, Union[None, str]]:
+            response = await self.http_client.get(
+                url=url, timeout=timeout, headers=headers
+            )
+            if response:
+                status = json.loads(response.text).get("status")
+                if status and ("SUCCESS" in status or "FAIL" in status):
+                    return True, status
+            return False, None
+
+        done, status = await task_waiter.wait_async(poll_task_status)
+        if not done:
+            return False, "No result"
+        return "SUCCESS" in status, status
@@ -11,10 +11,20 @@ default_local_submission_credentials_file_path = (
     f"{home}/metabolights_data/submission/credentials/.login"
 )
 default_local_repority_cache_path = f"{home}/metabolights_data/studies/cache"
+default_local_http_cache_path = f"{home}/metabolights_data/studies/cache/http"
 default_rest_api_url = "https://www.ebi.ac.uk/metabolights/ws"
 default_validation_api_url = "https://www.ebi.ac.uk/metabolights/ws3"
 default_study_search_rest_api_url = "https://www.ebi.ac.uk/metabolights/ws3"
 default_private_ftp_server_url = "ftp-private.ebi.ac.uk"
+default_ftp_max_connections_per_server = 8
+default_ftp_folder_max_age_in_seconds = 24 * 60 * 60
+default_ftp_server_slot_timeout_in_seconds = 300
+default_http_max_connections = 32
+default_http_max_connections_per_host = 8
+default_http_max_retries = 3
+default_http_backoff_factor = 0.5
+default_http_max_workers = 4
+default_http_cache_ttl_in_seconds = 300
 
 IGNORED_FILE_PATTERNS = {r"^AUDIT_FILES(/|$)(.*)", r"^INTERNAL_FILES(/|$)(.*)"}
 
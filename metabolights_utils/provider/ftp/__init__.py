@@ -1,11 +1,19 @@
 from metabolights_utils.provider.ftp import (
+    connection_pool,
     default_ftp_client,
     folder_metadata_collector,
     model,
+    progress,
+    sync,
+    transfer,
 )
 
 __all__ = [
+    "connection_pool",
     "default_ftp_client",
     "folder_metadata_collector",
     "model",
+    "progress",
+    "sync",
+    "transfer",
 ]
@@ -0,0 +1,146 @@
+import contextlib
+import logging
+import queue
+import threading
+from typing import Dict, Iterator, List, Tuple, Union
+
+from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.default_ftp_client import DefaultFtpClient
+
+logger = logging.getLogger(__name__)
+
+_server_slots: Dict[str, Tuple[threading.BoundedSemaphore, int]] = {}
+_server_slots_lock = threading.Lock()
+
+
+class FtpConnectionPoolException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def get_server_slots(
+    ftp_server_url: str, max_connections_per_server: int
+) -> threading.BoundedSemaphore:
+    """Returns the process-wide semaphore that limits open connections to a server.
+
+    The limit is set by the first pool created for the server. A different limit
+    requested later is ignored with a warning.
+    """
+    max_connections_per_server = max(1, max_connections_per_server)
+    with _server_slots_lock:
+        if ftp_server_url not in _server_slots:
+            _server_slots[ftp_server_url] = (
+                threading.BoundedSemaphore(max_connections_per_server),
+                max_connections_per_server,
+            )
+        slots, limit = _server_slots[ftp_server_url]
+        if limit != max_connections_per_server:
+            logger.warning(
+                "Connection limit of %s is %s. Requested limit %s is ignored.",
+                ftp_server_url,
+                limit,
+                max_connections_per_server,
+            )
+        return slots
+
+
+class FtpConnectionPool:
+    """Reuses logged-in FTP connections in parallel transfers.
+
+    Connections are opened on demand, up to max_connections, with the server,
+    root directory and credentials of the given client. Each connection is kept
+    in a client session until the pool is closed. Open connections, including
+    idle ones, are also limited per server for all pools in the process, so a
+    new connection waits until another pool closes its connections. If no
+    connection is closed in server_slot_timeout_in_seconds,
+    FtpConnectionPoolException is raised. No limit if the timeout is None.
+    """
+
+    def __init__(
+        self,
+        client: DefaultFtpClient,
+        max_connections: int = 4,
+        max_connections_per_server: Union[None, int] = None,
+        server_slot_timeout_in_seconds: Union[
+            None, float
+        ] = definitions.default_ftp_server_slot_timeout_in_seconds,
+    ) -> None:
+        if not max_connections_per_server:
+            max_connections_per_server = (
+                definitions.default_ftp_max_connections_per_server
+            )
+        self.client = client
+        self.server_slot_timeout_in_seconds = server_slot_timeout_in_seconds
+        self.max_connections = max(1, min(max_connections, max_connections_per_server))
+        self._server_slots = get_server_slots(
+            client.ftp_server_url, max_connections_per_server
+        )
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._idle_clients: "queue.LifoQueue[DefaultFtpClient]" = queue.LifoQueue()
+        self._clients: List[DefaultFtpClient] = []
+        self._clients_lock = threading.Lock()
+
+    @property
+    def connection_count(self) -> int:
+        """Number of open connections of the pool."""
+        with self._clients_lock:
+            return len(self._clients)
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[DefaultFtpClient]:
+        """Returns an idle client or opens a new one if the pool is not full."""
+        with self._slots:
+            try:
+                client = self._idle_clients.get_nowait()
+            except queue.Empty:
+                client = self._create_client()
+            try:
+                yield client
+            finally:
+                self._idle_clients.put(client)
+
+    def close(self) -> None:
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            self._close_client(client)
+        while not self._idle_clients.empty():
+            self._idle_clients.get_nowait()
+        logger.debug(
+            "%s FTP connections to %s are closed.",
+            len(clients),
+            self.client.ftp_server_url,
+        )
+
+    def __enter__(self) -> "FtpConnectionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _create_client(self) -> DefaultFtpClient:
+        # The server slot is held while the connection is open.
+        if not self._server_slots.acquire(timeout=self.server_slot_timeout_in_seconds):
+            raise FtpConnectionPoolException(
+                f"No FTP connection to {self.client.ftp_server_url} is available "
+                f"in {self.server_slot_timeout_in_seconds} seconds. "
+                "Other connection pools use all connections to the server."
+            )
+        try:
+            client = self.client.clone()
+            client.__enter__()
+        except Exception:
+            self._server_slots.release()
+            raise
+        with self._clients_lock:
+            self._clients.append(client)
+        return client
+
+    def _close_client(self, client: DefaultFtpClient) -> None:
+        try:
+            client.__exit__(None, None, None)
+        finally:
+            self._server_slots.release()
@@ -1,16 +1,63 @@
+import contextlib
+import ftplib
 import logging
 import os
+import posixpath
 import re
 import shutil
+import socket
+import time
 from ftplib import FTP
-from typing import List, Set, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Set, Tuple, TypeVar, Union
 
-from metabolights_utils.provider.ftp.model import FtpFolderContent, LocalDirectory
+from metabolights_utils.provider.ftp.model import (
+    FtpFileDescriptor,
+    FtpFolderContent,
+    LocalDirectory,
+    get_timestamp,
+    parse_mlsd_facts,
+)
 from metabolights_utils.utils.filename_utils import join_path
 
 logger = logging.getLogger(__name__)
 
 code_pattern = re.compile(r"\s*(\d+)\s+(.*)\s*")
+server_address_pattern = re.compile(r"^(.+):(\d+)$")
+
+# Errors after a dropped or timed out control connection (e.g. 421 timeout).
+# Other OSErrors (e.g. no space left on local disk) are not retried.
+CONNECTION_ERRORS = (
+    EOFError,
+    ConnectionError,
+    socket.timeout,
+    ftplib.error_temp,
+)
+
+PART_FILE_EXTENSION = ".part"
+
+# Uploaded files are renamed from temp file names after their content is stored
+TEMP_FILE_PREFIX = ".temp_"
+
+# Facts requested from servers that support MLSD and MLST commands
+MLST_FACTS = "type;size;modify;UNIX.mode;"
+
+T = TypeVar("T")
+
+
+class FtpDownloadException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class FtpUploadException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
 
 
 class DefaultFtpClient:
@@ -22,6 +69,8 @@ class DefaultFtpClient:
         username: Union[str, None] = None,
         password: Union[str, None] = None,
         timeout: Union[None, int] = None,
+        keepalive_interval: Union[None, float] = 30,
+        use_mlsd: bool = True,
     ) -> None:
         self.ftp_server_url = ftp_server_url
         self.remote_repository_root_directory = (
@@ -45,6 +94,56 @@ class DefaultFtpClient:
         logger.info("Connect to %s  as user %s .", self.ftp_server_url, user)
 
         self.ftp: Union[None, FTP] = None
+        self.keepalive_interval = keepalive_interval
+        # None until FEAT response of the server is checked.
+        self.mlsd_supported: Union[None, bool] = None if use_mlsd else False
+        self.mfmt_supported: Union[None, bool] = None
+        # Login folder. Remote paths are relative to it if root directory is empty.
+        self.home_directory: Union[None, str] = None
+        self._session_depth = 0
+        self._last_activity_time = 0.0
+
+    def clone(self) -> "DefaultFtpClient":
+        """Returns a new client with the same server, root directory and credentials."""
+        return DefaultFtpClient(
+            local_storage_root_path=self.local_storage_root_path,
+            ftp_server_url=self.ftp_server_url,
+            remote_repository_root_directory=self.remote_repository_root_directory,
+            username=self.username,
+            password=self.password,
+            timeout=self.timeout,
+            keepalive_interval=self.keepalive_interval,
+            use_mlsd=self.mlsd_supported is not False,
+        )
+
+    @property
+    def in_session(self) -> bool:
+        return self._session_depth > 0
+
+    @contextlib.contextmanager
+    def session(self) -> Iterator["DefaultFtpClient"]:
+        """Keeps one logged-in connection for all FTP calls within the block.
+
+        Sessions can be nested. The connection is closed when the outermost
+        session ends. An idle connection is checked with NOOP before it is reused
+        and it is reconnected if the server closed it.
+        """
+        self._session_depth += 1
+        try:
+            yield self
+        finally:
+            self._session_depth -= 1
+            if not self._session_depth:
+                self.quit()
+
+    def __enter__(self) -> "DefaultFtpClient":
+        self._session_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._session_depth -= 1
+        if not self._session_depth:
+            self.quit()
 
     def is_ftp_directory(self, name):
         current = self.ftp.pwd()
@@ -56,19 +155,111 @@ class DefaultFtpClient:
             return False
 
     def connect(self):
+        if self.ftp:
+            if self.is_connection_alive():
+                return
+            self.close_connection(send_quit=False)
+        ftp = FTP(timeout=self.timeout)
+        host, port = self.get_server_address()
+        ftp.connect(host, port, timeout=self.timeout)
+        ftp.login(user=self.username, passwd=self.password)
+        if self.is_mlsd_supported(ftp):
+            try:
+                ftp.sendcmd(f"OPTS MLST {MLST_FACTS}")
+            except ftplib.Error as ex:
+                logger.debug("OPTS MLST command error: %s", str(ex))
+        if not self.remote_repository_root_directory and self.home_directory is None:
+            self.home_directory = ftp.pwd().rstrip("/")
+        self.ftp = ftp
+        self._last_activity_time = time.monotonic()
+        logger.debug("Connected to %s.", self.ftp_server_url)
+
+    def get_server_address(self) -> Tuple[str, int]:
+        """Returns host and port of the server URL (host or host:port)."""
+        result = server_address_pattern.match(self.ftp_server_url)
+        if result:
+            return result.group(1), int(result.group(2))
+        return self.ftp_server_url, 21
+
+    def is_connection_alive(self) -> bool:
         if not self.ftp:
-            self.ftp = FTP(
+            return False
+        idle_time = time.monotonic() - self._last_activity_time
+        if self.keepalive_interval is not None and idle_time < self.keepalive_interval:
+            return True
+        try:
+            self.ftp.voidcmd("NOOP")
+            self._last_activity_time = time.monotonic()
+            return True
+        except (ftplib.Error, EOFError, OSError) as ex:
+            logger.debug("FTP connection is not alive: %s", str(ex))
+            return False
+
+    def is_mlsd_supported(self, ftp: FTP) -> bool:
+        if self.mlsd_supported is None:
+            try:
+                features = ftp.sendcmd("FEAT")
+                self.mlsd_supported = "MLST" in features.upper()
+            except ftplib.Error as ex:
+                logger.debug("FEAT command error: %s", str(ex))
+                self.mlsd_supported = False
+            logger.debug(
+                "MLSD support on %s: %s", self.ftp_server_url, self.mlsd_supported
+            )
+        return self.mlsd_supported
+
+    def _is_not_implemented(self, ex: Exception) -> bool:
+        return isinstance(ex, ftplib.error_perm) and str(ex)[:3] in (
+            "500",
+            "501",
+            "502",
+            "504",
+        )
+
+    def get_remote_path(self, relative_path: Union[None, str] = None) -> str:
+        """Returns remote path of a path relative to the root directory.
+
+        If the root directory is empty, the login folder is the root directory.
+        """
+        relative_path = (
+            relative_path.replace("\\", "/").strip("/") if relative_path else ""
+        )
+        root_dir = self.remote_repository_root_directory or self.home_directory or ""
+        return f"{root_dir}/{relative_path}"
+
+    def run_command(self, command: Callable[[FTP], T]) -> T:
+        """Runs command on the current connection.
+
+        If the connection was closed by the server, it reconnects
+        and runs the command once more. Commands should not depend on the
+        current working directory of a previous command.
+        """
+        self.connect()
+        try:
+            result = command(self.ftp)
+        except CONNECTION_ERRORS as ex:
+            logger.warning(
+                "FTP connection error on %s: %s. Reconnecting...",
                 self.ftp_server_url,
-                timeout=self.timeout,
-                user=self.username,
-                passwd=self.password,
+                str(ex),
             )
-        self.ftp.login(user=self.username, passwd=self.password)
-        logger.debug("Connected to %s.", self.ftp_server_url)
+            self.close_connection(send_quit=False)
+            self.connect()
+            result = command(self.ftp)
+        self._last_activity_time = time.monotonic()
+        return result
 
     def quit(self):
+        if self.in_session:
+            return
+        self.close_connection()
+
+    def close_connection(self, send_quit: bool = True):
+        if self.ftp and not send_quit:
+            self.ftp.close()
+            self.ftp = None
         if self.ftp:
-            for attempt in range(3, start=1):
+            for attempt in range(1, 3):
                 try:
                     self.ftp.quit()
                     break
@@ -79,6 +270,7 @@ class DefaultFtpClient:
                             self.ftp_server_url,
                             str(ex),
                         )
+                        self.ftp.close()
                         break
                     else:
                         logger.warning(
@@ -94,17 +286,33 @@ class DefaultFtpClient:
         search_pattern: Union[str, None] = None,
     ) -> FtpFolderContent:
         directory = directory.replace("\\", "/").strip("/") if directory else ""
-        root_dir = self.remote_repository_root_directory
-        remote_directory = f"{root_dir}/{directory}"
-
-        self.connect()
+        remote_directory = self.get_remote_path(directory)
 
         command = f"LIST {search_pattern}" if search_pattern else "LIST"
-        logger.debug("Run command '%s' on %s", command, self.ftp_server_url)
         response: FtpFolderContent = FtpFolderContent(source_directory=remote_directory)
+
+        def list_content(ftp: FTP) -> str:
+            nonlocal remote_directory
+            self._reset_folder_content(response)
+            remote_directory = self.get_remote_path(directory)
+            response.source_directory = remote_directory
+            ftp.cwd(remote_directory)
+            # MLSD does not support search patterns
+            if not search_pattern and self.is_mlsd_supported(ftp):
+                logger.debug("Run command 'MLSD' on %s", self.ftp_server_url)
+                try:
+                    return ftp.retrlines("MLSD", callback=response.parse_mlsd_line)
+                except ftplib.error_perm as ex:
+                    if not self._is_not_implemented(ex):
+                        raise
+                    logger.debug("MLSD is not supported. Using LIST: %s", str(ex))
+                    self.mlsd_supported = False
+                    self._reset_folder_content(response)
+            logger.debug("Run command '%s' on %s", command, self.ftp_server_url)
+            return ftp.retrlines(command, callback=response.parse_line)
+
         try:
-            self.ftp.cwd(remote_directory)
-            return_code = self.ftp.retrlines(command, callback=response.parse_line)
+            return_code = self.run_command(list_content)
             result = code_pattern.search(return_code)
             if result and result.groups():
                 response.code = int(result.groups()[0])
@@ -121,38 +329,139 @@ class DefaultFtpClient:
         finally:
             self.quit()
 
+    def get_file_descriptor(self, relative_path: str) -> FtpFolderContent:
+        """Returns type, size and modify time of a remote file or folder.
+
+        The response has one descriptor if the path exists. MLST is used
+        if the server supports it, otherwise the parent folder is listed
+        with the file name as search pattern.
+        """
+        relative_path = relative_path.replace("\\", "/").strip("/")
+        remote_path = self.get_remote_path(relative_path)
+        remote_parent_directory, filename = posixpath.split(remote_path)
+        response = FtpFolderContent(source_directory=remote_parent_directory)
+
+        def get_descriptor(ftp: FTP) -> str:
+            nonlocal remote_path, remote_parent_directory
+            self._reset_folder_content(response)
+            # Login folder is known after the first connection.
+            remote_path = self.get_remote_path(relative_path)
+            remote_parent_directory = posixpath.dirname(remote_path)
+            response.source_directory = remote_parent_directory
+            if self.is_mlsd_supported(ftp):
+                try:
+                    lines = ftp.sendcmd(f"MLST {remote_path}").splitlines()
+                    for line in lines[1:-1]:
+                        name, facts = parse_mlsd_facts(line)
+                        response.add_mlsd_entry(name or filename, facts)
+                    return lines[-1]
+                except ftplib.error_perm as ex:
+                    if not self._is_not_implemented(ex):
+                        raise
+                    logger.debug("MLST is not supported. Using LIST: %s", str(ex))
+                    self.mlsd_supported = False
+                    self._reset_folder_content(response)
+            listing = FtpFolderContent(source_directory=remote_parent_directory)
+            ftp.cwd(remote_parent_directory)
+            return_code = ftp.retrlines(f"LIST {filename}", callback=listing.parse_line)
+            # LIST returns folder content if the path is a folder.
+            if (
+                len(listing.descriptors) == 1
+                and listing.descriptors[0].base_name == filename
+                and not listing.descriptors[0].is_directory
+            ):
+                response.descriptors = listing.descriptors
+                response.files = listing.files
+                response.links = listing.links
+            else:
+                response.descriptors = [
+                    FtpFileDescriptor(base_name=filename, is_directory=True)
+                ]
+                response.folders = [filename]
+            return return_code
+
+        try:
+            return_code = self.run_command(get_descriptor)
+            result = code_pattern.search(return_code)
+            if result and result.groups():
+                response.code = int(result.groups()[0])
+                response.message = result.groups()[1]
+            response.success = bool(response.descriptors)
+            return response
+        except Exception as ex:
+            logger.error("FTP path %s descriptor error: %s", remote_path, str(ex))
+            result = code_pattern.search(str(ex))
+            if result and result.groups():
+                response.code = int(result.groups()[0])
+                response.message = result.groups()[1]
+            return response
+        finally:
+            self.quit()
+
+    def _reset_folder_content(self, response: FtpFolderContent) -> None:
+        response.descriptors, response.files = [], []
+        response.folders, response.links = [], set()
+
     def upload_files(
         self,
         remote_directory: Union[str, None] = None,
         file_paths: Union[List[str], None] = None,
+        blocksize: int = 8192,
+        skip_unchanged_files: bool = False,
+        resume: bool = False,
+        mtime_tolerance_in_seconds: float = 60,
     ) -> Tuple[bool, str]:
+        """Uploads local files to a remote folder on one connection.
+
+        Args:
+            remote_directory (Union[str, None], optional): Remote folder path
+                relative to the root directory.
+            file_paths (Union[List[str], None], optional): Local file paths.
+            blocksize (int, optional): Size of data blocks sent to the server.
+            skip_unchanged_files (bool, optional): Skip files if remote file has
+                the same size and it is not older than the local file.
+            resume (bool, optional): Continue uploads from temp files of
+                interrupted uploads.
+            mtime_tolerance_in_seconds (float, optional): Tolerance of modify
+                time comparison.
+
+        Returns:
+            Tuple[bool, str]: Status and error messages.
+        """
         remote_directory = remote_directory.strip("/") if remote_directory else ""
-        self.connect()
 
         errors = []
         try:
-            self.ftp.cwd(remote_directory)
-            for file_path in file_paths:
-                filename = os.path.basename(file_path)
-                temp_filename = f".temp_{filename}"
-                try:
-                    with open(file_path, "rb") as file:
-                        self.ftp.storbinary(f"STOR {temp_filename}", file)
-                    # Rename temp file to original name on success
-                    self.ftp.rename(temp_filename, filename)
-                    logger.info("'%s' is uploaded.", filename)
-                except Exception as ex:
-                    message = f"FTP upload error for {filename}: {str(ex)}"
-                    logger.error(message)
-                    errors.append(message)
-                    # Remove temp file on error
+            with self.session():
+                remote_files: Dict[str, FtpFileDescriptor] = {}
+                if skip_unchanged_files:
+                    result = self.list_directory(remote_directory)
+                    if not result.success:
+                        raise FtpUploadException(
+                            message=f"{result.code} {result.message}"
+                        )
+                    remote_files = {x.base_name: x for x in result.descriptors}
+                for file_path in file_paths:
+                    filename = os.path.basename(file_path)
+                    if self.is_uploaded_file(
+                        file_path,
+                        remote_files.get(filename),
+                        mtime_tolerance_in_seconds=mtime_tolerance_in_seconds,
+                    ):
+                        logger.info("'%s' is not changed. Skipping...", filename)
+                        continue
                     try:
-                        self.ftp.delete(temp_filename)
-                        logger.info("Removed temp file '%s'.", temp_filename)
-                    except Exception:
-                        logger.warning(
-                            "Failed to remove temp file '%s'.", temp_filename
+                        self.store_file(
+                            file_path,
+                            f"{remote_directory}/{filename}",
+                            blocksize=blocksize,
+                            resume=resume,
                         )
+                        logger.info("'%s' is uploaded.", filename)
+                    except Exception as ex:
+                        message = f"FTP upload error for {filename}: {str(ex)}"
+                        logger.error(message)
+                        errors.append(message)
             if errors:
                 return False, "; ".join(errors)
             return True, ""
@@ -163,6 +472,216 @@ class DefaultFtpClient:
         finally:
             self.quit()
 
+    def is_uploaded_file(
+        self,
+        local_file_path: str,
+        descriptor: Union[None, FtpFileDescriptor],
+        mtime_tolerance_in_seconds: float = 60,
+    ) -> bool:
+        """Checks the remote file has the same size and it is not older than the local file.
+
+        Modify time of uploaded files is set to the local modify time
+        if the server supports MFMT, otherwise it is the upload time.
+        """
+        if not descriptor or descriptor.is_directory or descriptor.is_link:
+            return False
+        stat = os.stat(local_file_path)
+        if descriptor.size_in_bytes != stat.st_size:
+            return False
+        if not descriptor.modified_time:
+            return False
+        remote_time = get_timestamp(descriptor.modified_time)
+        return remote_time >= stat.st_mtime - mtime_tolerance_in_seconds
+
+    def make_directories(self, relative_path: str) -> None:
+        """Creates a remote folder and its parent folders if they do not exist."""
+        names = [x for x in relative_path.replace("\\", "/").split("/") if x]
+
+        def make(ftp: FTP) -> None:
+            for index in range(1, len(names) + 1):
+                remote_path = self.get_remote_path("/".join(names[:index]))
+                try:
+                    ftp.mkd(remote_path)
+                    logger.debug("Remote folder %s is created.", remote_path)
+                except ftplib.error_perm:
+                    # folder exists or it is not permitted. Uploads will report errors.
+                    pass
+
+        try:
+            self.run_command(make)
+        finally:
+            self.quit()
+
+    def store_file(
+        self,
+        local_file_path: str,
+        relative_file_path: str,
+        blocksize: int = 8192,
+        resume: bool = False,
+        max_retries: int = 3,
+        callback: Union[None, Callable[[int], None]] = None,
+    ) -> int:
+        """Uploads a local file to a temp file and renames it to the remote file.
+
+        The remote file is replaced only after its content is stored completely.
+        In resume mode, a temp file of an interrupted upload is continued with
+        REST offset, or with APPE if the server does not support REST for STOR.
+        Modify time of the remote file is set to the local modify time
+        if the server supports MFMT.
+
+        Args:
+            local_file_path (str): Local file path.
+            relative_file_path (str): Remote file path relative to the root directory.
+            blocksize (int, optional): Size of data blocks sent to the server.
+            resume (bool, optional): Continue the temp file of a previous upload.
+                Temp file is deleted on error if it is False.
+            max_retries (int, optional): Number of attempts after a connection error.
+            callback (Union[None, Callable[[int], None]], optional): Called with
+                the size of each sent data block, and with a negative size
+                if bytes of an interrupted attempt are transferred again.
+
+        Raises:
+            FtpUploadException: Uploaded file size does not match.
+
+        Returns:
+            int: Number of uploaded bytes of the stored file.
+        """
+        relative_file_path = relative_file_path.replace("\\", "/").strip("/")
+        filename = posixpath.basename(relative_file_path)
+        temp_filename = f"{TEMP_FILE_PREFIX}{filename}"
+        file_size = os.path.getsize(local_file_path)
+        modified_time = os.path.getmtime(local_file_path)
+        uploaded_bytes = 0
+        initial_offset = None
+
+        def count(data: bytes) -> None:
+            nonlocal uploaded_bytes
+            uploaded_bytes += len(data)
+            if callback:
+                callback(len(data))
+
+        def rebase(offset: int) -> None:
+            # Bytes lost in an interrupted attempt are not counted.
+            nonlocal uploaded_bytes, initial_offset
+            if initial_offset is None or offset < initial_offset:
+                initial_offset = offset
+            lost_bytes = uploaded_bytes - (offset - initial_offset)
+            uploaded_bytes -= lost_bytes
+            if callback and lost_bytes:
+                callback(-lost_bytes)
+
+        def store(ftp: FTP) -> None:
+            remote_file_path = self.get_remote_path(relative_file_path)
+            ftp.cwd(posixpath.dirname(remote_file_path) or "/")
+            offset = 0
+            if resume:
+                offset = self.get_remote_file_size(ftp, temp_filename) or 0
+            if offset > file_size:
+                offset = 0
+            rebase(offset)
+            if not offset or offset < file_size:
+                with open(local_file_path, "rb") as file:
+                    self._store_binary(
+                        ftp, file, temp_filename, offset, blocksize, count
+                    )
+            if offset:
+                # Check appended content before the temp file is renamed.
+                size = self.get_remote_file_size(ftp, temp_filename)
+                if size is not None and size != file_size:
+                    raise FtpUploadException(
+                        message=f"{relative_file_path} size {size} does not match "
+                        f"local file size {file_size}."
+                    )
+            ftp.rename(temp_filename, filename)
+            self.set_remote_modified_time(ftp, filename, modified_time)
+
+        try:
+            for attempt in range(1, max(1, max_retries) + 1):
+                try:
+                    self.run_command(store)
+                    break
+                except CONNECTION_ERRORS as ex:
+                    if attempt >= max_retries:
+                        raise
+                    logger.warning(
+                        "%s upload is interrupted: %s. Retrying...", filename, str(ex)
+                    )
+                    self.close_connection(send_quit=False)
+        except Exception:
+            if not resume:
+                self._delete_temp_file(relative_file_path, temp_filename)
+            raise
+        finally:
+            self.quit()
+        return uploaded_bytes
+
+    def _store_binary(
+        self,
+        ftp: FTP,
+        file,
+        temp_filename: str,
+        offset: int,
+        blocksize: int,
+        callback: Callable[[bytes], None],
+    ) -> None:
+        if not offset:
+            ftp.storbinary(f"STOR {temp_filename}", file, blocksize, callback)
+            return
+        logger.debug("Resume %s upload at %s bytes", temp_filename, offset)
+        file.seek(offset)
+        try:
+            ftp.storbinary(
+                f"STOR {temp_filename}", file, blocksize, callback, rest=offset
+            )
+            return
+        except (ftplib.error_perm, ftplib.error_reply) as ex:
+            if not isinstance(ex, ftplib.error_reply) and not self._is_not_implemented(
+                ex
+            ):
+                raise
+            logger.debug("REST is not supported. Using APPE: %s", str(ex))
+        file.seek(offset)
+        ftp.storbinary(f"APPE {temp_filename}", file, blocksize, callback)
+
+    def get_remote_file_size(self, ftp: FTP, filename: str) -> Union[None, int]:
+        """Returns size of a file in the current folder, 0 if it does not exist.
+
+        Returns None if the server does not support SIZE command.
+        """
+        try:
+            # SIZE is not allowed in ASCII mode on some servers
+            ftp.voidcmd("TYPE I")
+            size = ftp.size(filename)
+            return size if size is not None else 0
+        except ftplib.error_perm as ex:
+            return None if self._is_not_implemented(ex) else 0
+
+    def set_remote_modified_time(
+        self, ftp: FTP, filename: str, modified_time: float
+    ) -> None:
+        if self.mfmt_supported is False:
+            return
+        value = time.strftime("%Y%m%d%H%M%S", time.gmtime(modified_time))
+        try:
+            ftp.sendcmd(f"MFMT {value} {filename}")
+            self.mfmt_supported = True
+        except ftplib.error_perm as ex:
+            logger.debug("MFMT command error: %s", str(ex))
+            if self._is_not_implemented(ex):
+                self.mfmt_supported = False
+
+    def _delete_temp_file(self, relative_file_path: str, temp_filename: str) -> None:
+        def delete(ftp: FTP) -> None:
+            remote_file_path = self.get_remote_path(relative_file_path)
+            ftp.cwd(posixpath.dirname(remote_file_path) or "/")
+            ftp.delete(temp_filename)
+
+        try:
+            self.run_command(delete)
+            logger.info("Removed temp file '%s'.", temp_filename)
+        except Exception:
+            logger.warning("Failed to remove temp file '%s'.", temp_filename)
+
     def download_file(
         self,
         relative_file_path: str,
@@ -173,6 +692,32 @@ class DefaultFtpClient:
         delete_unlisted_local_files: bool = True,
         keep_local_files: Union[Set[str], None] = None,
     ) -> LocalDirectory:
+        with self.session():
+            return self._download_file(
+                relative_file_path=relative_file_path,
+                local_path=local_path,
+                override_local_files=override_local_files,
+                local_files=local_files,
+                skip_files=skip_files,
+                delete_unlisted_local_files=delete_unlisted_local_files,
+                keep_local_files=keep_local_files,
+            )
+
+    def _download_file(
+        self,
+        relative_file_path: str,
+        local_path: Union[List[str], None] = None,
+        override_local_files: bool = False,
+        local_files: Union[LocalDirectory, None] = None,
+        skip_files: Union[Set[str], None] = None,
+        delete_unlisted_local_files: bool = True,
+        keep_local_files: Union[Set[str], None] = None,
+        descriptor: Union[None, FtpFileDescriptor] = None,
+    ) -> LocalDirectory:
+        """Downloads a file or a folder recursively.
+
+        Type of each child is read from the listing of its parent folder.
+        """
         local_path = local_path if local_path else self.local_storage_root_path
         local_path = join_path(local_path)
         if local_files is None:
@@ -192,47 +737,32 @@ class DefaultFtpClient:
         if skip_files and relative_file_path in skip_files:
             logger.debug("%s is in skip file list. Skipping...", relative_file_path)
             return response
-        remote_root_dir = self.remote_repository_root_directory
-
         target_path = os.path.join(local_path, relative_file_path)
         parent_path = os.path.dirname(target_path)
-        filename = os.path.basename(target_path)
 
-        remote_directory = f"{remote_root_dir}/{relative_file_path}".replace("\\", "/")
-        relative_parent_path = os.path.dirname(relative_file_path)
+        remote_directory = self.get_remote_path(relative_file_path)
 
-        remote_parent_directory = os.path.dirname(
-            os.path.join(remote_root_dir, relative_file_path)
-        )
-        remote_parent_directory = remote_parent_directory.replace("\\", "/")
-        logger.debug("List files within %s on FTP server ", relative_parent_path)
-        result = self.list_directory(relative_parent_path, search_pattern=filename)
-        is_directory = True
-        target_exists = False
-        if result.success:
-            if (
-                result.descriptors
-                and len(result.descriptors) == 1
-                and result.descriptors[0].base_name == filename
-            ):
-                is_directory = False
-            target_exists = True
-        if not target_exists:
-            logger.error("%s is not on FTP server.", relative_parent_path)
-            return LocalDirectory(
-                root_path=local_path, code=result.code, message=result.message
-            )
+        if descriptor is None:
+            logger.debug("Get type of %s on FTP server ", relative_file_path)
+            result = self.get_file_descriptor(relative_file_path)
+            if not result.success:
+                logger.error("%s is not on FTP server.", relative_file_path)
+                return LocalDirectory(
+                    root_path=local_path, code=result.code, message=result.message
+                )
+            descriptor = result.descriptors[0]
         try:
-            if not is_directory:
-                self.connect()
-                self.ftp.cwd(remote_parent_directory)
-
+            if not descriptor.is_directory:
                 if not os.path.exists(target_path) or override_local_files:
                     if not os.path.exists(parent_path):
                         logger.info("%s folder is created", parent_path)
                         os.makedirs(parent_path, exist_ok=True)
-                    with open(target_path, "wb") as local_file:
-                        self.ftp.retrbinary("RETR " + filename, local_file.write)
+
+                    self.retrieve_file(
+                        relative_file_path,
+                        target_path,
+                        expected_size=descriptor.size_in_bytes,
+                    )
                     actions[relative_file_path] = "DOWNLOADED"
                     logger.debug("%s file is downloaded", relative_file_path)
                 else:
@@ -241,6 +771,11 @@ class DefaultFtpClient:
 
                 response.local_files.append(relative_file_path)
             else:
+                result = self.list_directory(relative_file_path)
+                if not result.success:
+                    raise Exception(
+                        f"{relative_file_path} list error: {result.code} {result.message}"
+                    )
                 if not os.path.exists(target_path):
                     logger.info("%s folder is created", relative_file_path)
                     actions[relative_file_path] = "FOLDER_CREATED"
@@ -249,58 +784,35 @@ class DefaultFtpClient:
                     actions[relative_file_path] = "FOLDER_SKIPPED"
                     if delete_unlisted_local_files:
                         logger.info("delete_unlisted_local_files is enabled.")
-                        local_file_list = os.listdir(target_path)
-                        listed_folders = {
-                            x.base_name for x in result.descriptors if x.is_directory
-                        }
-                        listed_files = {
-                            x.base_name
-                            for x in result.descriptors
-                            if not x.is_directory
-                        }
-                        for item in local_file_list:
-                            if item not in listed_folders and item not in listed_files:
-                                item_path: str = os.path.join(target_path, item)
-                                relative_item_path = (
-                                    item_path.replace(f"{local_path}", "")
-                                    .strip("/")
-                                    .strip("\\")
-                                )
-                                if keep_local_files and item in keep_local_files:
-                                    actions[relative_item_path] = "SKIPPED"
-                                    logger.debug(
-                                        "%s exists. Skipping", relative_file_path
-                                    )
-                                    continue
-                                try:
-                                    if os.path.isdir(item_path):
-                                        logger.debug("%s folder is deleted.", item_path)
-                                        shutil.rmtree(item_path)
-                                        actions[relative_item_path] = "FOLDER_DELETED"
-                                    else:
-                                        logger.debug("%s file is deleted.", item_path)
-                                        os.remove(item_path)
-                                        actions[relative_item_path] = "DELETED"
-                                except Exception as ex:
-                                    logger.error("%s delete error ", item_path, str(ex))
-
-                response.local_folders.append(relative_file_path)
-                for collection in (result.folders, result.files):
-                    for entry in collection:
-                        new_relative_file_path = join_path(
-                            relative_file_path, entry
-                        ).replace("\\", "/")
-                        self.download_file(
-                            relative_file_path=new_relative_file_path,
+                        self.delete_unlisted_local_items(
+                            target_path=target_path,
                             local_path=local_path,
-                            override_local_files=override_local_files,
-                            local_files=response,
-                            skip_files=skip_files,
-                        )
-                        target_path = os.path.join(local_path, relative_file_path)
-                        logger.debug(
-                            "%s is downloaded on %s", relative_file_path, target_path
+                            listed_names={x.base_name for x in result.descriptors},
+                            actions=actions,
+                            keep_local_files=keep_local_files,
                         )
+
+                response.local_folders.append(relative_file_path)
+                # Folders first, then files. Links are not downloaded.
+                children = [x for x in result.descriptors if x.is_directory]
+                children.extend(
+                    x
+                    for x in result.descriptors
+                    if not x.is_directory and not x.is_link
+                )
+                for child in children:
+                    new_relative_file_path = join_path(
+                        relative_file_path, child.base_name
+                    ).replace("\\", "/")
+                    self._download_file(
+                        relative_file_path=new_relative_file_path,
+                        local_path=local_path,
+                        override_local_files=override_local_files,
+                        local_files=response,
+                        skip_files=skip_files,
+                        descriptor=child,
+                    )
+                    logger.debug("%s is downloaded on %s", child.base_name, target_path)
             response.success = True
             response.code = 200
             response.message = "Ok"
@@ -314,3 +826,146 @@ class DefaultFtpClient:
             self.quit()
 
         return response
+
+    def retrieve_file(
+        self,
+        relative_file_path: str,
+        target_path: str,
+        expected_size: Union[None, int] = None,
+        max_retries: int = 3,
+        callback: Union[None, Callable[[int], None]] = None,
+    ) -> int:
+        """Downloads a remote file without listing its parent directory.
+
+        The file is written to a part file next to the target path.
+        A part file left by an interrupted download is resumed with REST offset.
+        The part file is renamed to the target path after its size is checked.
+
+        Args:
+            relative_file_path (str): Remote file path relative to the root directory.
+            target_path (str): Local file path.
+            expected_size (Union[None, int], optional): File size in the listing.
+                Size is not checked if it is None.
+            max_retries (int, optional): Number of attempts to resume the download
+                after a connection error.
+            callback (Union[None, Callable[[int], None]], optional): Called with
+                the size of each received data block, and with a negative size
+                if bytes of an interrupted attempt are transferred again.
+
+        Raises:
+            FtpDownloadException: Downloaded file size does not match.
+
+        Returns:
+            int: Number of downloaded bytes of the target file.
+        """
+        relative_file_path = relative_file_path.replace("\\", "/").strip("/")
+        filename = posixpath.basename(relative_file_path)
+        part_file_path = f"{target_path}{PART_FILE_EXTENSION}"
+        downloaded_bytes = 0
+        initial_offset = None
+
+        def write(data: bytes) -> None:
+            nonlocal downloaded_bytes
+            local_file.write(data)
+            downloaded_bytes += len(data)
+            if callback:
+                callback(len(data))
+
+        def rebase(offset: int) -> None:
+            # Bytes lost in an interrupted attempt are not counted.
+            nonlocal downloaded_bytes, initial_offset
+            if initial_offset is None or offset < initial_offset:
+                initial_offset = offset
+            lost_bytes = downloaded_bytes - (offset - initial_offset)
+            downloaded_bytes -= lost_bytes
+            if callback and lost_bytes:
+                callback(-lost_bytes)
+
+        def retrieve(ftp: FTP) -> None:
+            nonlocal local_file
+            offset = 0
+            if os.path.exists(part_file_path):
+                offset = os.path.getsize(part_file_path)
+            if expected_size is not None and offset > expected_size:
+                offset = 0
+            rebase(offset)
+            if expected_size is not None and offset == expected_size and offset:
+                return
+            remote_file_path = self.get_remote_path(relative_file_path)
+            ftp.cwd(posixpath.dirname(remote_file_path) or "/")
+            with open(part_file_path, "ab" if offset else "wb") as local_file:
+                if not offset:
+                    ftp.retrbinary("RETR " + filename, write)
+                    return
+                logger.debug("Resume %s download at %s bytes", filename, offset)
+                try:
+                    ftp.retrbinary("RETR " + filename, write, rest=offset)
+                    return
+                except (ftplib.error_perm, ftplib.error_reply) as ex:
+                    if not isinstance(
+                        ex, ftplib.error_reply
+                    ) and not self._is_not_implemented(ex):
+                        raise
+                    logger.debug("REST is not supported: %s", str(ex))
+            rebase(0)
+            with open(part_file_path, "wb") as local_file:
+                ftp.retrbinary("RETR " + filename, write)
+
+        local_file = None
+        for attempt in range(1, max(1, max_retries) + 1):
+            try:
+                self.run_command(retrieve)
+                break
+            except CONNECTION_ERRORS as ex:
+                if attempt >= max_retries:
+                    raise
+                logger.warning(
+                    "%s download is interrupted: %s. Resuming...", filename, str(ex)
+                )
+                self.close_connection(send_quit=False)
+
+        size = os.path.getsize(part_file_path)
+        if expected_size is not None and size != expected_size:
+            raise FtpDownloadException(
+                message=f"{relative_file_path} size {size} does not match "
+                f"expected size {expected_size}."
+            )
+        os.replace(part_file_path, target_path)
+        return downloaded_bytes
+
+    def delete_unlisted_local_items(
+        self,
+        target_path: str,
+        local_path: str,
+        listed_names: Set[str],
+        actions: Dict[str, str],
+        keep_local_files: Union[Set[str], None] = None,
+    ) -> None:
+        for item in os.listdir(target_path):
+            if item in listed_names:
+                continue
+            # keep part files of listed files to resume their downloads
+            if (
+                item.endswith(PART_FILE_EXTENSION)
+                and item[: -len(PART_FILE_EXTENSION)] in listed_names
+            ):
+                continue
+            item_path: str = os.path.join(target_path, item)
+            relative_item_path = (
+                item_path.replace(f"{local_path}", "").strip("/").strip("\\")
+            )
+            if keep_local_files and item in keep_local_files:
+                actions[relative_item_path] = "SKIPPED"
+                logger.debug("%s exists. Skipping", relative_item_path)
+                continue
+            try:
+                if os.path.isdir(item_path):
+                    logger.debug("%s folder is deleted.", item_path)
+                    shutil.rmtree(item_path)
+                    actions[relative_item_path] = "FOLDER_DELETED"
+                else:
+                    logger.debug("%s file is deleted.", item_path)
+                    os.remove(item_path)
+                    actions[relative_item_path] = "DELETED"
+            except Exception as ex:
+                logger.error("%s delete error: %s", item_path, str(ex))
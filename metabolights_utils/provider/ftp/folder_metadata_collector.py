@@ -1,9 +1,12 @@
 import datetime
+import itertools
 import json
 import logging
 import os
 import re
-from typing import Dict, List, Tuple, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, List, Tuple, Union
 
 from pydantic import BaseModel
 
@@ -14,6 +17,7 @@ from metabolights_utils.models.metabolights.model import (
     StudyFolderMetadata,
 )
 from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.connection_pool import FtpConnectionPool
 from metabolights_utils.provider.ftp.default_ftp_client import DefaultFtpClient
 from metabolights_utils.provider.study_provider import AbstractFolderMetadataCollector
 from metabolights_utils.utils.filename_utils import join_path
@@ -24,6 +28,7 @@ logger = logging.getLogger(__name__)
 class FolderIndex(BaseModel):
     update_time: Union[None, datetime.datetime, str] = None
     content: Union[None, StudyFolderMetadata] = None
+    folder_update_times: Dict[str, datetime.datetime] = {}
 
 
 MANAGED_FOLDERS = {"", "FILES", "FILES/RAW_FILES", "FILES/DERIVED_FILES"}
@@ -36,7 +41,31 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
         study_id: str,
         folder_index_file_path: str,
         rebuild_folder_index_file: bool = False,
+        max_connections: int = 4,
+        max_pending_folders: int = 16,
+        refresh_folder_index_file: bool = False,
+        max_folder_age_in_seconds: Union[
+            None, float
+        ] = definitions.default_ftp_folder_max_age_in_seconds,
+        max_folder_ages_in_seconds: Union[None, Dict[str, float]] = None,
     ):
+        """Collects study folder metadata from FTP server and caches it in an index file.
+
+        Args:
+            refresh_folder_index_file (bool, optional): Updates the current index file
+                incrementally. Managed folders are listed again. Other folders are
+                listed again only if their modify time or size in the parent listing
+                is changed, or they are older than their max age. Unchanged folders
+                are carried forward from the current index with their subfolders.
+            max_folder_age_in_seconds (Union[None, float], optional): Default max age
+                of a folder listing in refresh mode. Modify time of a folder does not
+                change if only its subfolders change, so these changes are found
+                after the folder listing expires. Default is one day.
+                No limit if it is None.
+            max_folder_ages_in_seconds (Union[None, Dict[str, float]], optional):
+                Max ages of folder listings whose relative paths match the regex
+                patterns. The first matched pattern is used.
+        """
         if not client or not client.remote_repository_root_directory or not study_id:
             logger.error("Not valid input.")
             raise Exception("Not valid input.")
@@ -54,6 +83,11 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
         )
         logger.debug("Folder index path is %s", self.folder_index_file_path)
         self.rebuild_folder_index_file = rebuild_folder_index_file
+        self.max_connections = max_connections
+        self.max_pending_folders = max_pending_folders
+        self.refresh_folder_index_file = refresh_folder_index_file
+        self.max_folder_age_in_seconds = max_folder_age_in_seconds
+        self.max_folder_ages_in_seconds = max_folder_ages_in_seconds or {}
         self.remote_study_directory = join_path(
             self.client.remote_repository_root_directory, self.study_id
         )
@@ -68,13 +102,196 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
         metadata: Dict[str, StudyFileDescriptor],
         messages: List[str],
     ):
-        try:
-            prefix = f"{str(study_path).rstrip('/')}/"
-            directory = directory.replace("\\", "/")
-            dir_relative_path = (
-                str(directory).replace(prefix, "") if study_path != directory else ""
-            )
+        prefix = f"{str(study_path).rstrip('/')}/"
+        directory = directory.replace("\\", "/")
+        dir_relative_path = (
+            str(directory).replace(prefix, "") if study_path != directory else ""
+        )
+        for item in self.get_folder_items(self.client, dir_relative_path):
+            if isinstance(item, str):
+                messages.append(item)
+                continue
+            metadata[item.file_path] = item
+            if item.is_directory:
+                logger.debug("%s is directory, search content.", item.file_path)
+                full_path = join_path(directory, os.path.basename(item.file_path))
+                self.visit_folder(
+                    full_path.replace("\\", "/"),
+                    study_path,
+                    metadata=metadata,
+                    messages=messages,
+                )
+
+    def crawl_folders(
+        self,
+        metadata: Dict[str, StudyFileDescriptor],
+        messages: List[str],
+        max_connections: int = 4,
+        previous_index: Union[None, FolderIndex] = None,
+    ) -> Dict[str, datetime.datetime]:
+        """Lists study folders breadth-first and concurrently over a connection pool.
+
+        At most max_pending_folders listings are queued at the same time.
+        Results are merged in the same order as visit_folder. If previous index
+        is given, unchanged subfolders are carried forward from it.
+
+        Returns:
+            Dict[str, datetime.datetime]: Listing time of each folder.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        folder_update_times: Dict[str, datetime.datetime] = {}
+        previous_items = self._get_previous_folder_items(previous_index)
+        folder_items: Dict[str, List[Union[str, StudyFileDescriptor]]] = {}
+        folders = deque([""])
+        with FtpConnectionPool(self.client, max_connections=max_connections) as pool:
+            max_pending = max(1, self.max_pending_folders)
+            with ThreadPoolExecutor(max_workers=pool.max_connections) as executor:
+                pending: Dict[Future, str] = {}
+                while folders or pending:
+                    while folders and len(pending) < max_pending:
+                        folder = folders.popleft()
+                        future = executor.submit(self._list_folder, pool, folder)
+                        pending[future] = folder
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        folder = pending.pop(future)
+                        items = future.result()
+                        folder_items[folder] = items
+                        folder_update_times[folder] = now
+                        for item in items:
+                            if isinstance(item, str) or not item.is_directory:
+                                continue
+                            if self.is_unchanged_folder(item, previous_index, now):
+                                self._carry_forward(
+                                    item.file_path,
+                                    previous_index,
+                                    previous_items,
+                                    folder_items,
+                                    folder_update_times,
+                                    folders,
+                                    now,
+                                )
+                            else:
+                                folders.append(item.file_path)
+
+        stack = [iter(folder_items.get("", []))]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, str):
+                messages.append(item)
+            else:
+                metadata[item.file_path] = item
+                if item.is_directory:
+                    stack.append(iter(folder_items.get(item.file_path, [])))
+        return folder_update_times
+
+    def get_max_folder_age(self, dir_relative_path: str) -> Union[None, float]:
+        for pattern, max_age in self.max_folder_ages_in_seconds.items():
+            if re.match(pattern, dir_relative_path, re.IGNORECASE):
+                return max_age
+        return self.max_folder_age_in_seconds
+
+    def is_expired_folder(
+        self,
+        dir_relative_path: str,
+        previous_index: FolderIndex,
+        now: datetime.datetime,
+    ) -> bool:
+        max_age = self.get_max_folder_age(dir_relative_path)
+        if max_age is None:
+            return False
+        update_time = self._get_folder_update_time(previous_index, dir_relative_path)
+        return not update_time or (now - update_time).total_seconds() > max_age
+
+    def is_unchanged_folder(
+        self,
+        item: StudyFileDescriptor,
+        previous_index: Union[None, FolderIndex],
+        now: datetime.datetime,
+    ) -> bool:
+        if not previous_index or not previous_index.content or not item.modified_at:
+            return False
+        # Modify time of a folder changes only if its direct content changes.
+        # Managed folders are listed again to check their subfolders.
+        if item.file_path in MANAGED_FOLDERS:
+            return False
+        previous = previous_index.content.folders.get(item.file_path)
+        if (
+            not previous
+            or previous.modified_at != item.modified_at
+            or previous.size_in_bytes != item.size_in_bytes
+        ):
+            return False
+        return not self.is_expired_folder(item.file_path, previous_index, now)
+
+    def _carry_forward(
+        self,
+        dir_relative_path: str,
+        previous_index: FolderIndex,
+        previous_items: Dict[str, List[StudyFileDescriptor]],
+        folder_items: Dict[str, List[Union[str, StudyFileDescriptor]]],
+        folder_update_times: Dict[str, datetime.datetime],
+        folders: Deque[str],
+        now: datetime.datetime,
+    ) -> None:
+        subfolders = [dir_relative_path]
+        while subfolders:
+            folder = subfolders.pop()
+            items = [x.model_copy() for x in previous_items.get(folder, [])]
+            folder_items[folder] = items
+            update_time = self._get_folder_update_time(previous_index, folder)
+            folder_update_times[folder] = update_time or now
+            for item in items:
+                if not item.is_directory:
+                    continue
+                if self.is_expired_folder(item.file_path, previous_index, now):
+                    folders.append(item.file_path)
+                else:
+                    subfolders.append(item.file_path)
+
+    def _get_previous_folder_items(
+        self, previous_index: Union[None, FolderIndex]
+    ) -> Dict[str, List[StudyFileDescriptor]]:
+        previous_items: Dict[str, List[StudyFileDescriptor]] = {}
+        if not previous_index or not previous_index.content:
+            return previous_items
+        content = previous_index.content
+        for item in itertools.chain(content.folders.values(), content.files.values()):
+            previous_items.setdefault(item.parent_directory, []).append(item)
+        return previous_items
 
+    def _get_folder_update_time(
+        self, previous_index: FolderIndex, dir_relative_path: str
+    ) -> Union[None, datetime.datetime]:
+        update_time = previous_index.folder_update_times.get(dir_relative_path)
+        if not update_time:
+            update_time = previous_index.update_time
+            if isinstance(update_time, str):
+                try:
+                    update_time = datetime.datetime.fromisoformat(update_time)
+                except ValueError:
+                    return None
+        if update_time and not update_time.tzinfo:
+            update_time = update_time.replace(tzinfo=datetime.timezone.utc)
+        return update_time
+
+    def _list_folder(
+        self, pool: FtpConnectionPool, dir_relative_path: str
+    ) -> List[Union[str, StudyFileDescriptor]]:
+        with pool.connection() as client:
+            return self.get_folder_items(client, dir_relative_path)
+
+    def get_folder_items(
+        self, client: DefaultFtpClient, dir_relative_path: str
+    ) -> List[Union[str, StudyFileDescriptor]]:
+        """Lists a study folder and returns its file descriptors and messages in order.
+
+        Content of folders that match skip patterns is not listed.
+        """
+        items: List[Union[str, StudyFileDescriptor]] = []
+        try:
             skip_content = False
             for pattern in definitions.skip_folder_content_patterns:
                 if pattern.match(dir_relative_path):
@@ -82,14 +299,14 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                     break
             if skip_content:
                 logger.debug("%s is in ignore list. SKIPPED.", dir_relative_path)
-                messages.append(f"{dir_relative_path} is in ignore list. SKIPPED.")
-                return
+                items.append(f"{dir_relative_path} is in ignore list. SKIPPED.")
+                return items
             directory_input = (
                 join_path(self.study_id, dir_relative_path)
                 if dir_relative_path
                 else self.study_id
             )
-            result = self.client.list_directory(directory=directory_input)
+            result = client.list_directory(directory=directory_input)
 
             required_raw_data_folder_files = [
                 x
@@ -120,7 +337,7 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                     "%s directory is raw data folder. Only fid*, ser* acqu* files will be added.",
                     dir_relative_path,
                 )
-                messages.append(
+                items.append(
                     f"{dir_relative_path} directory is raw data folder. fid*, ser* acqu* files will be added."
                 )
                 selected_descriptors = required_raw_data_folder_files.copy()
@@ -129,7 +346,6 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                 )
             for item in selected_descriptors:
                 entry = item.base_name
-                full_path: str = join_path(directory, entry).replace("\\", "/")
                 relative_path = join_path(dir_relative_path, entry).replace("\\", "/")
                 base_name = os.path.basename(relative_path)
                 parent_directory = os.path.dirname(relative_path).replace("\\", "/")
@@ -143,14 +359,19 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                         "%s directory is in content ignore list. SKIPPED",
                         relative_path,
                     )
-                    messages.append(
+                    items.append(
                         f"{relative_path} directory is in content ignore list. SKIPPED"
                     )
                     continue
 
                 descriptor = StudyFileDescriptor.model_validate(
-                    item.model_dump(by_alias=True)
+                    item.model_dump(by_alias=True, exclude={"modified_time"})
                 )
+                if item.modified_time:
+                    modified_time = item.modified_time.replace(
+                        tzinfo=datetime.timezone.utc
+                    )
+                    descriptor.modified_at = int(modified_time.timestamp())
 
                 for tag in definitions.TAG_PATTERNS:
                     for pattern in definitions.TAG_PATTERNS[tag]:
@@ -160,16 +381,11 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                 descriptor.extension = ext
                 descriptor.parent_directory = parent_directory
                 descriptor.file_path = relative_path
-
-                metadata[relative_path] = descriptor
-                if item.is_directory:
-                    logger.debug("%s is directory, search content.", relative_path)
-                    self.visit_folder(
-                        full_path, study_path, metadata=metadata, messages=messages
-                    )
+                items.append(descriptor)
 
         except Exception as exc:
-            logger.exception("Directory error %s: %s", directory, str(exc))
+            logger.exception("Directory error %s: %s", dir_relative_path, str(exc))
+        return items
 
     def get_folder_metadata(
         self,
@@ -226,15 +442,51 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                     )
                 )
 
-        if not study_folder_metadata or self.rebuild_folder_index_file:
+        refresh = bool(
+            self.refresh_folder_index_file
+            and study_folder_metadata
+            and not self.rebuild_folder_index_file
+        )
+        if not study_folder_metadata or self.rebuild_folder_index_file or refresh:
             study_folder_metadata = StudyFolderMetadata()
-            logger.info("Build study folder metadata index.")
-            self.visit_folder(
-                self.remote_study_directory,
-                self.remote_study_directory,
-                metadata=metadata,
-                messages=messages,
-            )
+            now = datetime.datetime.now(datetime.timezone.utc)
+            folder_update_times = None
+            if refresh:
+                logger.info("Refresh study folder metadata index.")
+                folder_update_times = self.crawl_folders(
+                    metadata=metadata,
+                    messages=messages,
+                    max_connections=self.max_connections,
+                    previous_index=current_file_index,
+                )
+                listed_folders = [
+                    x for x in folder_update_times if folder_update_times[x] >= now
+                ]
+                msg = (
+                    f"{len(listed_folders)} folders are listed. "
+                    f"{len(folder_update_times) - len(listed_folders)} folders "
+                    "are carried forward from the current index."
+                )
+                logger.info(msg)
+                messages.append(
+                    GenericMessage(type=GenericMessageType.INFO, short=msg, detail=msg)
+                )
+            elif self.max_connections > 1:
+                logger.info("Build study folder metadata index.")
+                self.crawl_folders(
+                    metadata=metadata,
+                    messages=messages,
+                    max_connections=self.max_connections,
+                )
+            else:
+                logger.info("Build study folder metadata index.")
+                with self.client.session():
+                    self.visit_folder(
+                        self.remote_study_directory,
+                        self.remote_study_directory,
+                        metadata=metadata,
+                        messages=messages,
+                    )
             study_folder_metadata.folders = {
                 x: metadata[x] for x in metadata if metadata[x].is_directory
             }
@@ -242,8 +494,16 @@ class FtpFolderMetadataCollector(AbstractFolderMetadataCollector):
                 x: metadata[x] for x in metadata if not metadata[x].is_directory
             }
 
-            now = datetime.datetime.now(datetime.timezone.utc)
-            file_index = FolderIndex(update_time=now, content=study_folder_metadata)
+            if folder_update_times is None:
+                folder_update_times = {"": now}
+                folder_update_times.update(
+                    {x: now for x in study_folder_metadata.folders}
+                )
+            file_index = FolderIndex(
+                update_time=now,
+                content=study_folder_metadata,
+                folder_update_times=folder_update_times,
+            )
             with open(self.folder_index_file_path, "w", encoding="utf-8") as fw:
                 fw.write(file_index.model_dump_json(indent=4))
             msg = f"{self.folder_index_file_path} file is updated."
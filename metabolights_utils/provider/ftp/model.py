@@ -1,6 +1,8 @@
+import enum
+import posixpath
 import re
-from datetime import datetime
-from typing import Dict, List, Set
+from datetime import datetime, timezone
+from typing import Dict, List, Set, Tuple, Union
 
 from pydantic import BaseModel, Field
 from typing_extensions import Annotated
@@ -8,6 +10,8 @@ from typing_extensions import Annotated
 ftp_list = r"([\-\w]+)\s+(\d+)\s+(\w+)\s+(\w+)\s+(\w+)\s+(\w+\s+\w+\s+[\w:]+)\s+(.*)\s*"
 ftp_list_response_pattern = re.compile(ftp_list)
 
+MLSD_LINK_TYPES = ("os.unix=symlink", "os.unix=slink")
+
 
 class FtpResponse(BaseModel):
     success: bool = False
@@ -63,6 +67,12 @@ class FtpFolderContent(FtpFiles):
                             break
                         except ValueError:
                             continue
+                    # LIST omits the year of files modified in the last six months
+                    if modified_time and ":" in raw_time:
+                        now = datetime.now()
+                        modified_time = modified_time.replace(year=now.year)
+                        if modified_time > now:
+                            modified_time = modified_time.replace(year=now.year - 1)
                 descriptor = FtpFileDescriptor(
                     mode=octal_mode,
                     base_name=filename,
@@ -79,3 +89,134 @@ class FtpFolderContent(FtpFiles):
                 else:
                     self.files.append(groups[6])
                 self.descriptors.append(descriptor)
+
+    def parse_mlsd_line(self, line: str) -> None:
+        """Parses a machine-readable MLSD or MLST entry (RFC 3659).
+
+        Entries of the listed directory itself and its parent are ignored.
+        """
+        if not line or not line.strip():
+            return
+        filename, facts = parse_mlsd_facts(line)
+        entry_type = facts.get("type", "").lower()
+        if not filename or entry_type in ("cdir", "pdir"):
+            return
+        self.add_mlsd_entry(filename, facts)
+
+    def add_mlsd_entry(self, filename: str, facts: Dict[str, str]) -> None:
+        entry_type = facts.get("type", "").lower()
+        size = facts.get("size", facts.get("sizd", ""))
+        modified_time = None
+        modify = facts.get("modify", "")
+        if len(modify) >= 14:
+            try:
+                modified_time = datetime.strptime(modify[:14], "%Y%m%d%H%M%S")
+            except ValueError:
+                modified_time = None
+        mode = facts.get("unix.mode", "")
+        if mode:
+            try:
+                mode = oct(int(mode, 8)).replace("0o", "")
+            except ValueError:
+                mode = ""
+        descriptor = FtpFileDescriptor(
+            mode=mode,
+            base_name=filename,
+            size_in_bytes=int(size) if size.isnumeric() else 0,
+            modified_time=modified_time,
+        )
+        if entry_type.startswith(MLSD_LINK_TYPES):
+            descriptor.is_link = True
+            self.links.add(filename)
+        elif entry_type in ("dir", "cdir"):
+            descriptor.is_directory = True
+            self.folders.append(filename)
+        else:
+            self.files.append(filename)
+        self.descriptors.append(descriptor)
+
+
+def parse_mlsd_facts(line: str) -> Tuple[str, Dict[str, str]]:
+    """Returns base name and lower case facts of an MLSD or MLST entry."""
+    raw_facts, _, pathname = line.strip("\r\n").lstrip().partition(" ")
+    facts = {}
+    for fact in raw_facts.split(";"):
+        key, _, value = fact.partition("=")
+        if key:
+            facts[key.lower()] = value
+    return posixpath.basename(pathname.rstrip("/")), facts
+
+
+def get_timestamp(modified_time: datetime) -> float:
+    """Returns POSIX timestamp of a listing time. Naive times are in UTC."""
+    if not modified_time.tzinfo:
+        modified_time = modified_time.replace(tzinfo=timezone.utc)
+    return modified_time.timestamp()
+
+
+class FtpTransferOrder(str, enum.Enum):
+    SMALLEST_FIRST = "smallest-first"
+    LARGEST_FIRST = "largest-first"
+    LISTED = "listed"
+
+
+class FtpTransferItem(BaseModel):
+    relative_path: str = ""
+    size_in_bytes: int = 0
+    modified_time: Union[None, datetime] = None
+
+
+class FtpUploadItem(FtpTransferItem):
+    local_file_path: str = ""
+
+
+class FtpTransferPlan(FtpResponse):
+    folders: List[str] = []
+    items: List[FtpTransferItem] = []
+    folder_contents: Dict[str, List[str]] = {}
+
+
+class FtpTransferResult(BaseModel):
+    relative_path: str = ""
+    action: str = ""
+    size_in_bytes: int = 0
+    duration_in_seconds: float = 0
+    message: str = ""
+
+
+class FtpTransferReport(FtpResponse):
+    results: List[FtpTransferResult] = []
+    total_bytes: int = 0
+    duration_in_seconds: float = 0
+    throughput_in_bytes_per_second: float = 0
+
+
+class FtpSyncPlan(FtpResponse):
+    root_path: str = ""
+    downloads: List[FtpTransferItem] = []
+    skipped_files: List[str] = []
+    created_folders: List[str] = []
+    deleted_files: List[str] = []
+    deleted_folders: List[str] = []
+
+
+class FtpTransferMetrics(BaseModel):
+    total_files: int = 0
+    completed_files: int = 0
+    skipped_files: int = 0
+    failed_files: int = 0
+    total_bytes: int = 0
+    transferred_bytes: int = 0
+    elapsed_time_in_seconds: float = 0
+    bytes_per_second: float = 0
+    eta_in_seconds: Union[None, float] = None
+
+
+class FtpTransferProgress(BaseModel):
+    relative_path: str = ""
+    action: str = ""
+    size_in_bytes: int = 0
+    transferred_bytes: int = 0
+    bytes_per_second: float = 0
+    eta_in_seconds: Union[None, float] = None
+    metrics: FtpTransferMetrics = FtpTransferMetrics()
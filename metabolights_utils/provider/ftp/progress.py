@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Union
+
+from metabolights_utils.provider.ftp.model import (
+    FtpTransferItem,
+    FtpTransferMetrics,
+    FtpTransferProgress,
+)
+
+logger = logging.getLogger(__name__)
+
+TransferProgressCallback = Callable[[FtpTransferProgress], None]
+
+
+class FtpRateLimiter:
+    """Limits total transfer rate of all connections that share it.
+
+    It is a token bucket filled at max_bytes_per_second. A transfer that takes
+    more bytes than available waits until the bucket is refilled,
+    so connections share the bandwidth in proportion to their requests.
+    """
+
+    def __init__(
+        self,
+        max_bytes_per_second: float,
+        burst_size_in_bytes: Union[None, int] = None,
+    ) -> None:
+        self.max_bytes_per_second = max_bytes_per_second
+        # Default burst is 100 ms of traffic to keep the rate smooth.
+        self.burst_size_in_bytes = burst_size_in_bytes or max(
+            int(max_bytes_per_second / 10), 1
+        )
+        self._tokens = float(self.burst_size_in_bytes)
+        self._last_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, size_in_bytes: int) -> float:
+        """Waits until size_in_bytes can be transferred. Returns wait time."""
+        if self.max_bytes_per_second <= 0 or size_in_bytes <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst_size_in_bytes,
+                self._tokens + (now - self._last_time) * self.max_bytes_per_second,
+            )
+            self._last_time = now
+            self._tokens -= size_in_bytes
+            wait_time = max(0.0, -self._tokens / self.max_bytes_per_second)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+class _FileProgress:
+    def __init__(self, relative_path: str, size_in_bytes: int) -> None:
+        self.relative_path = relative_path
+        self.size_in_bytes = size_in_bytes
+        self.transferred_bytes = 0
+        self.start_time = time.monotonic()
+        self.last_event_time = 0.0
+
+
+class FtpTransferMonitor:
+    """Collects progress of file transfers and sends progress events to callbacks.
+
+    Events of a file are sent at most once in min_event_interval_in_seconds,
+    and always when the file transfer ends. Each event has the aggregate metrics
+    of all transfers. Callbacks are called on transfer threads.
+    """
+
+    def __init__(
+        self,
+        callbacks: Union[None, List[TransferProgressCallback]] = None,
+        min_event_interval_in_seconds: float = 0.5,
+    ) -> None:
+        self.callbacks: List[TransferProgressCallback] = list(callbacks or [])
+        self.min_event_interval_in_seconds = min_event_interval_in_seconds
+        self._metrics = FtpTransferMetrics()
+        self._start_time = time.monotonic()
+        self._files: Dict[str, _FileProgress] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: TransferProgressCallback) -> None:
+        self.callbacks.append(callback)
+
+    def start(self, items: Iterable[FtpTransferItem]) -> None:
+        """Adds files to the total files and bytes."""
+        with self._lock:
+            for item in items:
+                self._metrics.total_files += 1
+                self._metrics.total_bytes += item.size_in_bytes
+
+    def start_file(self, relative_path: str, size_in_bytes: int) -> None:
+        with self._lock:
+            self._files[relative_path] = _FileProgress(relative_path, size_in_bytes)
+
+    def update(self, relative_path: str, size_in_bytes: int) -> None:
+        """Adds transferred bytes of a file. Negative sizes remove lost bytes."""
+        now = time.monotonic()
+        with self._lock:
+            file = self._files.get(relative_path)
+            if not file:
+                return
+            file.transferred_bytes += size_in_bytes
+            self._metrics.transferred_bytes += size_in_bytes
+            if now - file.last_event_time < self.min_event_interval_in_seconds:
+                return
+            file.last_event_time = now
+            progress = self._get_progress(file, "IN_PROGRESS", now)
+        self._send(progress)
+
+    def finish_file(
+        self, relative_path: str, action: str, size_in_bytes: int = 0
+    ) -> None:
+        """Ends a file transfer. SKIPPED and ERROR files are counted separately."""
+        now = time.monotonic()
+        with self._lock:
+            file = self._files.pop(relative_path, None)
+            if not file:
+                file = _FileProgress(relative_path, size_in_bytes)
+            if action == "SKIPPED":
+                self._metrics.skipped_files += 1
+                # skipped files are not transferred
+                self._metrics.total_bytes -= file.size_in_bytes
+            elif action == "ERROR":
+                self._metrics.failed_files += 1
+                self._metrics.total_bytes -= file.size_in_bytes
+                self._metrics.transferred_bytes -= file.transferred_bytes
+            else:
+                self._metrics.completed_files += 1
+                # resumed transfers send only the missing part of a file
+                remaining = file.size_in_bytes - file.transferred_bytes
+                self._metrics.total_bytes -= max(0, remaining)
+            progress = self._get_progress(file, action, now)
+        self._send(progress)
+
+    def get_metrics(self) -> FtpTransferMetrics:
+        with self._lock:
+            return self._get_metrics(time.monotonic())
+
+    def _get_metrics(self, now: float) -> FtpTransferMetrics:
+        metrics = self._metrics.model_copy()
+        metrics.elapsed_time_in_seconds = now - self._start_time
+        if metrics.elapsed_time_in_seconds > 0:
+            metrics.bytes_per_second = (
+                metrics.transferred_bytes / metrics.elapsed_time_in_seconds
+            )
+        if metrics.bytes_per_second > 0:
+            remaining = max(0, metrics.total_bytes - metrics.transferred_bytes)
+            metrics.eta_in_seconds = remaining / metrics.bytes_per_second
+        return metrics
+
+    def _get_progress(
+        self, file: _FileProgress, action: str, now: float
+    ) -> FtpTransferProgress:
+        progress = FtpTransferProgress(
+            relative_path=file.relative_path,
+            action=action,
+            size_in_bytes=file.size_in_bytes,
+            transferred_bytes=file.transferred_bytes,
+            metrics=self._get_metrics(now),
+        )
+        elapsed_time = now - file.start_time
+        if elapsed_time > 0:
+            progress.bytes_per_second = file.transferred_bytes / elapsed_time
+        if progress.bytes_per_second > 0:
+            remaining = max(0, file.size_in_bytes - file.transferred_bytes)
+            progress.eta_in_seconds = remaining / progress.bytes_per_second
+        return progress
+
+    def _send(self, progress: FtpTransferProgress) -> None:
+        for callback in self.callbacks:
+            try:
+                callback(progress)
+            except Exception as ex:
+                logger.warning("Transfer progress callback error: %s", str(ex))
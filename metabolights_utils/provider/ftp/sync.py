@@ -0,0 +1,238 @@
+import datetime
+import logging
+import os
+import posixpath
+import shutil
+from typing import Dict, List, Set, Tuple, Union
+
+from metabolights_utils.models.metabolights.model import StudyFolderMetadata
+from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.connection_pool import FtpConnectionPool
+from metabolights_utils.provider.ftp.default_ftp_client import PART_FILE_EXTENSION
+from metabolights_utils.provider.ftp.model import (
+    FtpSyncPlan,
+    FtpTransferItem,
+    FtpTransferOrder,
+    FtpTransferPlan,
+    LocalDirectory,
+    get_timestamp,
+)
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
+from metabolights_utils.provider.ftp.transfer import FtpTransferScheduler
+from metabolights_utils.utils.filename_utils import join_path
+
+logger = logging.getLogger(__name__)
+
+
+def get_transfer_plan_from_folder_metadata(
+    study_id: str,
+    folder_metadata: StudyFolderMetadata,
+    relative_paths: List[str],
+) -> FtpTransferPlan:
+    """Converts a study folder index to a remote file list without FTP listing.
+
+    Content of folders that are not fully indexed (e.g. folders matching
+    skip folder content patterns or raw data folders) is not known,
+    so local files in these folders are not deleted. Content of study root folder
+    is not known, because ignored files are not in the index.
+    """
+    plan = FtpTransferPlan(success=True, code=200, message="Ok")
+    selected = [x.replace("\\", "/").strip("/") for x in relative_paths]
+    selected_prefixes = tuple(f"{x}/" for x in selected if x)
+
+    def is_selected(file_path: str) -> bool:
+        return not selected_prefixes or (
+            file_path in selected or file_path.startswith(selected_prefixes)
+        )
+
+    contents: Dict[str, List[str]] = {}
+    for file_path, descriptor in folder_metadata.folders.items():
+        if is_selected(file_path):
+            plan.folders.append(f"{study_id}/{file_path}")
+            contents.setdefault(file_path, [])
+        contents.setdefault(descriptor.parent_directory, []).append(
+            descriptor.base_name
+        )
+    for file_path, descriptor in folder_metadata.files.items():
+        contents.setdefault(descriptor.parent_directory, []).append(
+            descriptor.base_name
+        )
+        if is_selected(file_path):
+            modified_time = None
+            if descriptor.modified_at:
+                modified_time = datetime.datetime.fromtimestamp(
+                    descriptor.modified_at, tz=datetime.timezone.utc
+                ).replace(tzinfo=None)
+            plan.items.append(
+                FtpTransferItem(
+                    relative_path=f"{study_id}/{file_path}",
+                    size_in_bytes=descriptor.size_in_bytes,
+                    modified_time=modified_time,
+                )
+            )
+    for folder, names in contents.items():
+        if not folder or not is_selected(folder):
+            continue
+        if any(x.match(folder) for x in definitions.skip_folder_content_patterns):
+            continue
+        if any(x.startswith("acqu") for x in names):
+            continue
+        plan.folder_contents[f"{study_id}/{folder}"] = names
+    return plan
+
+
+class FtpSyncPlanner:
+    """Plans and runs minimal updates of a local mirror of remote files.
+
+    A local file is up to date if its size is the remote file size and its modify
+    time is within the tolerance of the remote modify time. Downloaded files
+    get the remote modify time, so repeated runs download only changed files.
+    Unlisted local files are deleted only in folders whose remote content is known.
+    """
+
+    def __init__(self, local_path: str, mtime_tolerance_in_seconds: float = 60):
+        self.local_path = join_path(local_path)
+        self.mtime_tolerance_in_seconds = mtime_tolerance_in_seconds
+
+    def get_local_files(
+        self, remote: FtpTransferPlan
+    ) -> Tuple[Dict[str, Tuple[int, float]], Set[str]]:
+        """Returns size and modify time of local files and local folder paths."""
+        local_files: Dict[str, Tuple[int, float]] = {}
+        local_folders: Set[str] = set()
+        remote_folders = set(remote.folders)
+        roots = [
+            x for x in remote.folders if posixpath.dirname(x) not in remote_folders
+        ]
+        for root in roots:
+            if not os.path.isdir(os.path.join(self.local_path, root)):
+                continue
+            local_folders.add(root)
+            folders = [root]
+            while folders:
+                folder = folders.pop()
+                with os.scandir(os.path.join(self.local_path, folder)) as entries:
+                    for entry in entries:
+                        path = f"{folder}/{entry.name}"
+                        if entry.is_dir(follow_symlinks=False):
+                            local_folders.add(path)
+                            folders.append(path)
+                        else:
+                            stat = entry.stat()
+                            local_files[path] = (stat.st_size, stat.st_mtime)
+        for item in remote.items:
+            if item.relative_path in local_files:
+                continue
+            file_path = os.path.join(self.local_path, item.relative_path)
+            if os.path.isfile(file_path):
+                stat = os.stat(file_path)
+                local_files[item.relative_path] = (stat.st_size, stat.st_mtime)
+        return local_files, local_folders
+
+    def is_up_to_date(
+        self, item: FtpTransferItem, size_in_bytes: int, modified_time: float
+    ) -> bool:
+        if size_in_bytes != item.size_in_bytes:
+            return False
+        if not item.modified_time:
+            return True
+        difference = abs(get_timestamp(item.modified_time) - modified_time)
+        return difference <= self.mtime_tolerance_in_seconds
+
+    def create_plan(
+        self,
+        remote: FtpTransferPlan,
+        delete_unlisted_local_files: bool = False,
+    ) -> FtpSyncPlan:
+        plan = FtpSyncPlan(
+            root_path=self.local_path,
+            success=remote.success,
+            code=remote.code,
+            message=remote.message,
+        )
+        local_files, local_folders = self.get_local_files(remote)
+        remote_files = set()
+        for item in remote.items:
+            remote_files.add(item.relative_path)
+            local_file = local_files.get(item.relative_path)
+            if local_file and self.is_up_to_date(item, *local_file):
+                plan.skipped_files.append(item.relative_path)
+            else:
+                plan.downloads.append(item)
+        plan.created_folders = [x for x in remote.folders if x not in local_folders]
+        if not delete_unlisted_local_files:
+            return plan
+
+        listed_names = {x: set(y) for x, y in remote.folder_contents.items()}
+
+        def is_unlisted(path: str) -> bool:
+            parent, name = posixpath.split(path)
+            return parent in listed_names and name not in listed_names[parent]
+
+        deleted_prefixes: Tuple[str, ...] = ()
+        for folder in sorted(local_folders):
+            if folder.startswith(deleted_prefixes) or not is_unlisted(folder):
+                continue
+            plan.deleted_folders.append(folder)
+            deleted_prefixes = deleted_prefixes + (f"{folder}/",)
+        for file_path in sorted(local_files):
+            if file_path in remote_files or file_path.startswith(deleted_prefixes):
+                continue
+            if (
+                file_path.endswith(PART_FILE_EXTENSION)
+                and file_path[: -len(PART_FILE_EXTENSION)] in remote_files
+            ):
+                continue
+            if is_unlisted(file_path):
+                plan.deleted_files.append(file_path)
+        return plan
+
+    def execute_plan(
+        self,
+        plan: FtpSyncPlan,
+        pool: FtpConnectionPool,
+        transfer_order: FtpTransferOrder = FtpTransferOrder.SMALLEST_FIRST,
+        response: Union[None, LocalDirectory] = None,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
+    ) -> LocalDirectory:
+        if response is None:
+            response = LocalDirectory(root_path=self.local_path)
+        actions = response.actions
+        try:
+            for folder in plan.deleted_folders:
+                logger.debug("%s folder is deleted.", folder)
+                shutil.rmtree(os.path.join(self.local_path, folder))
+                actions[folder] = "FOLDER_DELETED"
+            for file_path in plan.deleted_files:
+                logger.debug("%s file is deleted.", file_path)
+                os.remove(os.path.join(self.local_path, file_path))
+                actions[file_path] = "DELETED"
+            for folder in plan.created_folders:
+                logger.debug("%s folder is created", folder)
+                os.makedirs(os.path.join(self.local_path, folder), exist_ok=True)
+                actions[folder] = "FOLDER_CREATED"
+                response.local_folders.append(folder)
+            for file_path in plan.skipped_files:
+                actions[file_path] = "SKIPPED"
+                response.local_files.append(file_path)
+
+            scheduler = FtpTransferScheduler(
+                pool, order=transfer_order, rate_limiter=rate_limiter, monitor=monitor
+            )
+            report = scheduler.download_files(
+                plan.downloads, self.local_path, override_local_files=True
+            )
+            for result in report.results:
+                actions[result.relative_path] = result.action
+                if result.action != "ERROR":
+                    response.local_files.append(result.relative_path)
+            response.success = report.success
+            response.code = report.code
+            response.message = report.message
+        except Exception as ex:
+            logger.error("Sync error on %s: %s", self.local_path, str(ex))
+            response.success = False
+            response.code = 500
+            response.message = str(ex)
+        return response
@@ -0,0 +1,302 @@
+import logging
+import os
+import posixpath
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Set, Union
+
+from metabolights_utils.provider.ftp.connection_pool import FtpConnectionPool
+from metabolights_utils.provider.ftp.model import (
+    FtpTransferItem,
+    FtpTransferOrder,
+    FtpTransferPlan,
+    FtpTransferReport,
+    FtpTransferResult,
+    FtpUploadItem,
+    get_timestamp,
+)
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class FtpTransferScheduler:
+    """Downloads and uploads files in parallel over the connections of a pool.
+
+    Files are queued in transfer order. Smallest-first finishes many small files
+    early, largest-first keeps all connections busy until the end of large transfers.
+    A rate limiter shared by schedulers limits their total bandwidth,
+    and a monitor receives progress of each file transfer.
+    """
+
+    def __init__(
+        self,
+        pool: FtpConnectionPool,
+        order: FtpTransferOrder = FtpTransferOrder.SMALLEST_FIRST,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
+    ) -> None:
+        self.pool = pool
+        self.order = FtpTransferOrder(order)
+        self.rate_limiter = rate_limiter
+        self.monitor = monitor
+
+    def sort_items(self, items: Iterable[FtpTransferItem]) -> List[FtpTransferItem]:
+        if self.order == FtpTransferOrder.SMALLEST_FIRST:
+            return sorted(items, key=lambda x: x.size_in_bytes)
+        if self.order == FtpTransferOrder.LARGEST_FIRST:
+            return sorted(items, key=lambda x: x.size_in_bytes, reverse=True)
+        return list(items)
+
+    def list_files(
+        self,
+        relative_paths: List[str],
+        skip_files: Union[None, Set[str]] = None,
+    ) -> FtpTransferPlan:
+        """Lists files and folders within the relative paths recursively.
+
+        Each folder is listed once. Type and size of each entry are read
+        from the listing of its parent folder.
+        """
+        plan = FtpTransferPlan()
+        missing_paths = []
+        folders = deque()
+        with self.pool.connection() as client:
+            for relative_path in relative_paths:
+                relative_path = relative_path.replace("\\", "/").strip("/")
+                if not relative_path or (skip_files and relative_path in skip_files):
+                    continue
+                result = client.get_file_descriptor(relative_path)
+                if not result.success:
+                    logger.error("%s is not on FTP server.", relative_path)
+                    missing_paths.append(relative_path)
+                    plan.code, plan.message = result.code, result.message
+                    continue
+                descriptor = result.descriptors[0]
+                if descriptor.is_directory:
+                    folders.append(relative_path)
+                else:
+                    plan.items.append(
+                        FtpTransferItem(
+                            relative_path=relative_path,
+                            size_in_bytes=descriptor.size_in_bytes,
+                            modified_time=descriptor.modified_time,
+                        )
+                    )
+
+            while folders:
+                folder = folders.popleft()
+                result = client.list_directory(folder)
+                if not result.success:
+                    logger.error("FTP folder %s list error.", folder)
+                    missing_paths.append(folder)
+                    plan.code, plan.message = result.code, result.message
+                    continue
+                plan.folders.append(folder)
+                plan.folder_contents[folder] = [x.base_name for x in result.descriptors]
+                for descriptor in result.descriptors:
+                    path = f"{folder}/{descriptor.base_name}"
+                    if descriptor.is_link or (skip_files and path in skip_files):
+                        continue
+                    if descriptor.is_directory:
+                        folders.append(path)
+                    else:
+                        plan.items.append(
+                            FtpTransferItem(
+                                relative_path=path,
+                                size_in_bytes=descriptor.size_in_bytes,
+                                modified_time=descriptor.modified_time,
+                            )
+                        )
+        plan.success = not missing_paths
+        if plan.success:
+            plan.code, plan.message = 200, "Ok"
+        return plan
+
+    def download_files(
+        self,
+        items: Iterable[FtpTransferItem],
+        local_path: str,
+        override_local_files: bool = False,
+    ) -> FtpTransferReport:
+        ordered_items = self.sort_items(items)
+        start = time.perf_counter()
+        if self.monitor:
+            self.monitor.start(ordered_items)
+        with ThreadPoolExecutor(max_workers=self.pool.max_connections) as executor:
+            results = list(
+                executor.map(
+                    lambda x: self.download_file(x, local_path, override_local_files),
+                    ordered_items,
+                )
+            )
+        return self._create_report(results, start, "DOWNLOADED", "downloaded")
+
+    def download_file(
+        self,
+        item: FtpTransferItem,
+        local_path: str,
+        override_local_files: bool = False,
+    ) -> FtpTransferResult:
+        result = FtpTransferResult(relative_path=item.relative_path)
+        target_path = os.path.join(local_path, item.relative_path)
+        if os.path.exists(target_path) and not override_local_files:
+            result.action = "SKIPPED"
+            logger.debug("%s file exists. Skipping...", item.relative_path)
+            self._finish_file(item, result)
+            return result
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as client:
+                result.size_in_bytes = client.retrieve_file(
+                    item.relative_path,
+                    target_path,
+                    expected_size=item.size_in_bytes,
+                    callback=self._get_callback(item),
+                )
+            if item.modified_time:
+                # Keep remote modify time to compare local and remote files later.
+                timestamp = get_timestamp(item.modified_time)
+                os.utime(target_path, (timestamp, timestamp))
+            result.action = "DOWNLOADED"
+            logger.debug("%s file is downloaded", item.relative_path)
+        except Exception as ex:
+            result.action = "ERROR"
+            result.message = str(ex)
+            logger.error("FTP file %s download error: %s", item.relative_path, str(ex))
+        result.duration_in_seconds = time.perf_counter() - start
+        self._finish_file(item, result)
+        return result
+
+    def upload_files(
+        self,
+        items: Iterable[FtpUploadItem],
+        blocksize: int = 8192,
+        skip_unchanged_files: bool = False,
+        resume: bool = False,
+        mtime_tolerance_in_seconds: float = 60,
+    ) -> FtpTransferReport:
+        """Uploads local files to their relative paths on the server.
+
+        Remote folders are created and listed on one connection before uploads start.
+        Files with the same remote size that are not older than the remote files
+        are skipped if skip_unchanged_files is True.
+        """
+        ordered_items = self.sort_items(items)
+        start = time.perf_counter()
+        if self.monitor:
+            self.monitor.start(ordered_items)
+        results: List[FtpTransferResult] = []
+        uploads: List[FtpUploadItem] = []
+        folders = sorted({posixpath.dirname(x.relative_path) for x in ordered_items})
+        remote_files = {}
+        with self.pool.connection() as client:
+            for folder in folders:
+                client.make_directories(folder)
+                if not skip_unchanged_files:
+                    continue
+                result = client.list_directory(folder)
+                for descriptor in result.descriptors:
+                    path = f"{folder}/{descriptor.base_name}".strip("/")
+                    remote_files[path] = descriptor
+            for item in ordered_items:
+                if client.is_uploaded_file(
+                    item.local_file_path,
+                    remote_files.get(item.relative_path),
+                    mtime_tolerance_in_seconds=mtime_tolerance_in_seconds,
+                ):
+                    logger.debug("%s is not changed. Skipping...", item.relative_path)
+                    result = FtpTransferResult(
+                        relative_path=item.relative_path, action="SKIPPED"
+                    )
+                    self._finish_file(item, result)
+                    results.append(result)
+                else:
+                    uploads.append(item)
+        with ThreadPoolExecutor(max_workers=self.pool.max_connections) as executor:
+            results.extend(
+                executor.map(
+                    lambda x: self.upload_file(x, blocksize=blocksize, resume=resume),
+                    uploads,
+                )
+            )
+        return self._create_report(results, start, "UPLOADED", "uploaded")
+
+    def upload_file(
+        self, item: FtpUploadItem, blocksize: int = 8192, resume: bool = False
+    ) -> FtpTransferResult:
+        result = FtpTransferResult(relative_path=item.relative_path)
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as client:
+                client.store_file(
+                    item.local_file_path,
+                    item.relative_path,
+                    blocksize=blocksize,
+                    resume=resume,
+                    callback=self._get_callback(item),
+                )
+            result.size_in_bytes = item.size_in_bytes
+            result.action = "UPLOADED"
+            logger.debug("%s file is uploaded", item.relative_path)
+        except Exception as ex:
+            result.action = "ERROR"
+            result.message = str(ex)
+            logger.error("FTP file %s upload error: %s", item.relative_path, str(ex))
+        result.duration_in_seconds = time.perf_counter() - start
+        self._finish_file(item, result)
+        return result
+
+    def _get_callback(
+        self, item: FtpTransferItem
+    ) -> Union[None, Callable[[int], None]]:
+        """Returns callback of data blocks that throttles and reports the transfer."""
+        if not self.rate_limiter and not self.monitor:
+            return None
+        if self.monitor:
+            self.monitor.start_file(item.relative_path, item.size_in_bytes)
+
+        def callback(size_in_bytes: int) -> None:
+            # Negative sizes rebase progress of a restarted transfer.
+            if self.rate_limiter and size_in_bytes > 0:
+                self.rate_limiter.acquire(size_in_bytes)
+            if self.monitor:
+                self.monitor.update(item.relative_path, size_in_bytes)
+
+        return callback
+
+    def _finish_file(self, item: FtpTransferItem, result: FtpTransferResult) -> None:
+        if self.monitor:
+            self.monitor.finish_file(
+                item.relative_path, result.action, size_in_bytes=item.size_in_bytes
+            )
+
+    def _create_report(
+        self,
+        results: List[FtpTransferResult],
+        start: float,
+        action: str,
+        action_name: str,
+    ) -> FtpTransferReport:
+        report = FtpTransferReport(results=results)
+        report.duration_in_seconds = time.perf_counter() - start
+        report.total_bytes = sum(x.size_in_bytes for x in results if x.action == action)
+        if report.duration_in_seconds > 0:
+            report.throughput_in_bytes_per_second = (
+                report.total_bytes / report.duration_in_seconds
+            )
+        errors = [x for x in results if x.action == "ERROR"]
+        report.success = not errors
+        report.code = 500 if errors else 200
+        report.message = f"{len(errors)} file(s) failed." if errors else "Ok"
+        logger.info(
+            "%s files, %s bytes are %s in %.2f seconds (%.2f MB/s).",
+            len(results) - len(errors),
+            report.total_bytes,
+            action_name,
+            report.duration_in_seconds,
+            report.throughput_in_bytes_per_second / 1024 / 1024,
+        )
+        return report
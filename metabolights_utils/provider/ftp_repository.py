@@ -16,6 +16,7 @@ from metabolights_utils.models.metabolights.model import (
     StudyFolderMetadata,
 )
 from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.connection_pool import FtpConnectionPool
 from metabolights_utils.provider.ftp.default_ftp_client import (
     DefaultFtpClient,
     FtpFolderContent,
@@ -24,7 +25,17 @@ from metabolights_utils.provider.ftp.default_ftp_client import (
 from metabolights_utils.provider.ftp.folder_metadata_collector import (
     FtpFolderMetadataCollector,
 )
-from metabolights_utils.provider.ftp.model import FtpFiles
+from metabolights_utils.provider.ftp.model import (
+    FtpFiles,
+    FtpSyncPlan,
+    FtpTransferOrder,
+)
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
+from metabolights_utils.provider.ftp.sync import (
+    FtpSyncPlanner,
+    get_transfer_plan_from_folder_metadata,
+)
+from metabolights_utils.provider.ftp.transfer import FtpTransferScheduler
 from metabolights_utils.provider.local_folder_metadata_collector import (
     LocalFolderMetadataCollector,
 )
@@ -257,6 +268,25 @@ class MetabolightsFtpRepository(DefaultFtpClient):
 
         study_id = study_id.upper().strip("/")
 
+        with self.ftp_client.session():
+            return self._download_study_metadata_files(
+                study_id=study_id,
+                local_path=local_path,
+                metadata_files=metadata_files,
+                response=response,
+                delete_unlisted_metadata_files=delete_unlisted_metadata_files,
+                override_local_files=override_local_files,
+            )
+
+    def _download_study_metadata_files(
+        self,
+        study_id: str,
+        local_path: str,
+        metadata_files: Union[List[str], None],
+        response: LocalDirectory,
+        delete_unlisted_metadata_files: bool,
+        override_local_files: bool,
+    ) -> LocalDirectory:
         listed_files = []
         requested_files = metadata_files
         if not metadata_files:
@@ -329,7 +359,17 @@ class MetabolightsFtpRepository(DefaultFtpClient):
         skip_files: Union[Set[str], None] = None,
         delete_unlisted_local_files: bool = False,
         keep_local_files: Union[Set[str], None] = None,
+        max_connections: int = 1,
+        transfer_order: FtpTransferOrder = FtpTransferOrder.SMALLEST_FIRST,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
     ) -> LocalDirectory:
+        """Downloads data files and folders of a study.
+
+        If max_connections is greater than 1, or a rate limiter or a monitor
+        is given, the selected folders are listed first and files are downloaded
+        in parallel in transfer order.
+        """
         if not study_id or not study_id.strip():
             return LocalDirectory(
                 code=400,
@@ -343,20 +383,34 @@ class MetabolightsFtpRepository(DefaultFtpClient):
         if not selected_data_files:
             selected_data_files = ["FILES"]
         study_id = study_id.upper().strip("/")
+        if max_connections > 1 or rate_limiter or monitor:
+            return self._download_study_data_files_in_parallel(
+                relative_paths=[f"{study_id}/{x}" for x in selected_data_files],
+                response=response,
+                override_local_files=override_local_files,
+                skip_files=skip_files,
+                delete_unlisted_local_files=delete_unlisted_local_files,
+                keep_local_files=keep_local_files,
+                max_connections=max_connections,
+                transfer_order=transfer_order,
+                rate_limiter=rate_limiter,
+                monitor=monitor,
+            )
         try:
-            for file in selected_data_files:
-                new_relative_file_path = f"{study_id}/{file}".replace("\\", "/").rstrip(
-                    "/"
-                )
-                self.ftp_client.download_file(
-                    relative_file_path=new_relative_file_path,
-                    local_path=local_path,
-                    local_files=response,
-                    override_local_files=override_local_files,
-                    skip_files=skip_files,
-                    delete_unlisted_local_files=delete_unlisted_local_files,
-                    keep_local_files=keep_local_files,
-                )
+            with self.ftp_client.session():
+                for file in selected_data_files:
+                    new_relative_file_path = f"{study_id}/{file}".replace(
+                        "\\", "/"
+                    ).rstrip("/")
+                    self.ftp_client.download_file(
+                        relative_file_path=new_relative_file_path,
+                        local_path=local_path,
+                        local_files=response,
+                        override_local_files=override_local_files,
+                        skip_files=skip_files,
+                        delete_unlisted_local_files=delete_unlisted_local_files,
+                        keep_local_files=keep_local_files,
+                    )
             response.success = True
             response.code = 200
             response.message = "Ok"
@@ -366,6 +420,199 @@ class MetabolightsFtpRepository(DefaultFtpClient):
 
         return response
 
+    def _download_study_data_files_in_parallel(
+        self,
+        relative_paths: List[str],
+        response: LocalDirectory,
+        override_local_files: bool,
+        skip_files: Union[Set[str], None],
+        delete_unlisted_local_files: bool,
+        keep_local_files: Union[Set[str], None],
+        max_connections: int,
+        transfer_order: FtpTransferOrder,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
+    ) -> LocalDirectory:
+        local_path = join_path(response.root_path)
+        actions = response.actions
+        try:
+            with FtpConnectionPool(
+                self.ftp_client, max_connections=max_connections
+            ) as pool:
+                scheduler = FtpTransferScheduler(
+                    pool,
+                    order=transfer_order,
+                    rate_limiter=rate_limiter,
+                    monitor=monitor,
+                )
+                plan = scheduler.list_files(relative_paths, skip_files=skip_files)
+                for folder in plan.folders:
+                    target_path = os.path.join(local_path, folder)
+                    if not os.path.exists(target_path):
+                        logger.info("%s folder is created", folder)
+                        actions[folder] = "FOLDER_CREATED"
+                        os.makedirs(target_path, exist_ok=True)
+                    else:
+                        actions[folder] = "FOLDER_SKIPPED"
+                        if delete_unlisted_local_files:
+                            self.ftp_client.delete_unlisted_local_items(
+                                target_path=target_path,
+                                local_path=local_path,
+                                listed_names=set(plan.folder_contents[folder]),
+                                actions=actions,
+                                keep_local_files=keep_local_files,
+                            )
+                    response.local_folders.append(folder)
+                report = scheduler.download_files(
+                    plan.items, local_path, override_local_files=override_local_files
+                )
+            for result in report.results:
+                actions[result.relative_path] = result.action
+                if result.action != "ERROR":
+                    response.local_files.append(result.relative_path)
+            response.success = report.success
+            response.code = report.code
+            response.message = report.message
+        except Exception as ex:
+            response.code = 500
+            response.message = str(ex)
+
+        return response
+
+    def create_study_data_sync_plan(
+        self,
+        study_id: str,
+        selected_data_files: Union[List[str], None] = None,
+        local_path: Union[str, None] = None,
+        skip_files: Union[Set[str], None] = None,
+        delete_unlisted_local_files: bool = False,
+        use_folder_index: bool = False,
+        folder_index_file_path: Union[str, None] = None,
+        max_connections: int = 4,
+    ) -> FtpSyncPlan:
+        """Compares remote study data files with local files by size and modify time.
+
+        Remote files are listed on FTP server or they are read from the study
+        folder index file if use_folder_index is True.
+        """
+        with FtpConnectionPool(
+            self.ftp_client, max_connections=max_connections
+        ) as pool:
+            return self._create_study_data_sync_plan(
+                pool=pool,
+                study_id=study_id,
+                selected_data_files=selected_data_files,
+                local_path=local_path,
+                skip_files=skip_files,
+                delete_unlisted_local_files=delete_unlisted_local_files,
+                use_folder_index=use_folder_index,
+                folder_index_file_path=folder_index_file_path,
+            )
+
+    def sync_study_data_files(
+        self,
+        study_id: str,
+        selected_data_files: Union[List[str], None] = None,
+        local_path: Union[str, None] = None,
+        skip_files: Union[Set[str], None] = None,
+        delete_unlisted_local_files: bool = False,
+        use_folder_index: bool = False,
+        folder_index_file_path: Union[str, None] = None,
+        max_connections: int = 4,
+        transfer_order: FtpTransferOrder = FtpTransferOrder.SMALLEST_FIRST,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
+    ) -> LocalDirectory:
+        """Downloads only new and changed study data files in parallel.
+
+        Local files that are not on FTP server are deleted
+        if delete_unlisted_local_files is True.
+        """
+        if not study_id or not study_id.strip():
+            return LocalDirectory(
+                code=400, message="Invalid study_id", root_path=local_path
+            )
+        with FtpConnectionPool(
+            self.ftp_client, max_connections=max_connections
+        ) as pool:
+            plan = self._create_study_data_sync_plan(
+                pool=pool,
+                study_id=study_id,
+                selected_data_files=selected_data_files,
+                local_path=local_path,
+                skip_files=skip_files,
+                delete_unlisted_local_files=delete_unlisted_local_files,
+                use_folder_index=use_folder_index,
+                folder_index_file_path=folder_index_file_path,
+            )
+            if not plan.success:
+                return LocalDirectory(
+                    root_path=plan.root_path, code=plan.code, message=plan.message
+                )
+            logger.info(
+                "Sync plan of %s: %s downloads, %s skipped, %s deleted files.",
+                study_id,
+                len(plan.downloads),
+                len(plan.skipped_files),
+                len(plan.deleted_files),
+            )
+            planner = FtpSyncPlanner(plan.root_path)
+            return planner.execute_plan(
+                plan,
+                pool,
+                transfer_order=transfer_order,
+                rate_limiter=rate_limiter,
+                monitor=monitor,
+            )
+
+    def _create_study_data_sync_plan(
+        self,
+        pool: FtpConnectionPool,
+        study_id: str,
+        selected_data_files: Union[List[str], None],
+        local_path: Union[str, None],
+        skip_files: Union[Set[str], None],
+        delete_unlisted_local_files: bool,
+        use_folder_index: bool,
+        folder_index_file_path: Union[str, None],
+    ) -> FtpSyncPlan:
+        study_id = study_id.upper().strip("/") if study_id else ""
+        if not local_path:
+            local_path = f"{self.local_storage_root_path}/{study_id}"
+        if not study_id:
+            return FtpSyncPlan(
+                root_path=local_path, code=400, message="Invalid study_id"
+            )
+        if not selected_data_files:
+            selected_data_files = ["FILES"]
+        if use_folder_index:
+            folder_metadata, _ = self.get_study_folder_content(
+                study_id=study_id, folder_index_file_path=folder_index_file_path
+            )
+            if not folder_metadata:
+                return FtpSyncPlan(
+                    root_path=local_path,
+                    code=500,
+                    message="Study folder index is not available.",
+                )
+            remote = get_transfer_plan_from_folder_metadata(
+                study_id, folder_metadata, selected_data_files
+            )
+            if skip_files:
+                remote.items = [
+                    x for x in remote.items if x.relative_path not in skip_files
+                ]
+        else:
+            scheduler = FtpTransferScheduler(pool)
+            remote = scheduler.list_files(
+                [f"{study_id}/{x}" for x in selected_data_files],
+                skip_files=skip_files,
+            )
+        planner = FtpSyncPlanner(local_path)
+        return planner.create_plan(
+            remote, delete_unlisted_local_files=delete_unlisted_local_files
+        )
+
     def list_isa_metadata_files(self, study_id: str) -> FtpFiles:
         response: FtpFolderContent = self.list_study_directory(study_id=study_id)
         isa_files = FtpFiles.model_validate(response.model_dump(), from_attributes=True)
@@ -417,7 +664,16 @@ class MetabolightsFtpRepository(DefaultFtpClient):
         study_id: str,
         folder_index_file_path: Union[str, None] = None,
         rebuild_folder_index_file: bool = False,
+        refresh_folder_index_file: bool = False,
+        max_folder_age_in_seconds: Union[
+            None, float
+        ] = definitions.default_ftp_folder_max_age_in_seconds,
     ) -> Tuple[Union[None, StudyFolderMetadata], List[GenericMessage]]:
+        """Returns study folder metadata from the folder index file.
+
+        In refresh mode, folder listings older than max_folder_age_in_seconds
+        are listed again. No limit if it is None.
+        """
         if not study_id:
             return None, [
                 GenericMessage(type=GenericMessageType.ERROR, short="Invalid study_id")
@@ -430,6 +686,8 @@ class MetabolightsFtpRepository(DefaultFtpClient):
             study_id=study_id,
             folder_index_file_path=folder_index_file_path,
             rebuild_folder_index_file=rebuild_folder_index_file,
+            refresh_folder_index_file=refresh_folder_index_file,
+            max_folder_age_in_seconds=max_folder_age_in_seconds,
         )
 
         metadata, messages = collector.get_folder_metadata(study_path=None)
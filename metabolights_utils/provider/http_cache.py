@@ -0,0 +1,224 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Responses of different users are stored with different keys.
+CREDENTIAL_HTTP_HEADERS = ("user-token", "authorization")
+
+
+class HttpCacheEntry(BaseModel):
+    url: str = ""
+    status_code: int = 200
+    etag: Union[None, str] = None
+    last_modified: Union[None, str] = None
+    content_type: Union[None, str] = None
+    content: str = ""
+    stored_at: float = 0
+
+
+class HttpResponseCache:
+    """Stores successful JSON responses on disk and revalidates them.
+
+    A cached response is returned without a request until it is older than
+    ttl_in_seconds. After that, it is revalidated with If-None-Match and
+    If-Modified-Since headers, and a 304 response costs only the round trip.
+    Responses without ETag or Last-Modified headers are cached only if TTL is
+    greater than 0.
+
+    Entries are keyed by method, URL, query parameters, JSON body hash and
+    credential header hash.
+    """
+
+    def __init__(self, cache_path: str, ttl_in_seconds: float = 0) -> None:
+        self.cache_path = cache_path
+        self.ttl_in_seconds = ttl_in_seconds
+
+    def get_key(
+        self,
+        method: str,
+        url: str,
+        headers: Union[None, Dict[str, Any]] = None,
+        parameters: Union[None, Dict[str, Any]] = None,
+        json_body: Union[None, Any] = None,
+    ) -> str:
+        body = json.dumps(json_body, sort_keys=True) if json_body is not None else ""
+        headers = {k.lower(): str(v) for k, v in (headers or {}).items()}
+        credentials = [headers.get(x, "") for x in CREDENTIAL_HTTP_HEADERS]
+        key = {
+            "method": method.upper(),
+            "url": str(httpx.URL(url, params=parameters)),
+            "body": hashlib.sha256(body.encode()).hexdigest(),
+            "credentials": hashlib.sha256("\n".join(credentials).encode()).hexdigest(),
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+    def get_entry_path(self, key: str) -> Path:
+        return Path(self.cache_path) / key[:2] / f"{key}.json"
+
+    def load_entry(self, key: str) -> Union[None, HttpCacheEntry]:
+        file_path = self.get_entry_path(key)
+        if not file_path.exists():
+            return None
+        try:
+            return HttpCacheEntry.model_validate_json(
+                file_path.read_text(encoding="utf-8")
+            )
+        except Exception as ex:
+            logger.warning("Invalid HTTP cache entry %s: %s", file_path, str(ex))
+            return None
+
+    def save_entry(self, key: str, entry: HttpCacheEntry) -> None:
+        file_path = self.get_entry_path(key)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_descriptor, temp_file_path = tempfile.mkstemp(
+                dir=file_path.parent, prefix=".", suffix=".part"
+            )
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as f:
+                f.write(entry.model_dump_json())
+            os.replace(temp_file_path, file_path)
+        except Exception as ex:
+            logger.warning("HTTP cache entry is not saved %s: %s", file_path, str(ex))
+
+    def delete_entry(self, key: str) -> None:
+        file_path = self.get_entry_path(key)
+        if file_path.exists():
+            file_path.unlink()
+
+    def is_fresh(self, entry: HttpCacheEntry) -> bool:
+        return time.time() - entry.stored_at < self.ttl_in_seconds
+
+    def send(
+        self,
+        client: httpx.Client,
+        method: str,
+        url: str,
+        timeout: Union[None, int] = None,
+        headers: Union[None, Dict[str, Any]] = None,
+        parameters: Union[None, Dict[str, Any]] = None,
+        json_body: Union[None, Any] = None,
+    ) -> httpx.Response:
+        """Returns the cached response or sends the request with the client."""
+        key, entry, request_headers = self.prepare_request(
+            method, url, headers, parameters, json_body
+        )
+        if entry and self.is_fresh(entry):
+            return self.create_response(entry, method)
+        response = client.request(
+            method,
+            url,
+            timeout=timeout,
+            headers=request_headers,
+            params=parameters,
+            json=json_body,
+        )
+        return self.complete_request(key, entry, method, response)
+
+    async def send_async(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        timeout: Union[None, int] = None,
+        headers: Union[None, Dict[str, Any]] = None,
+        parameters: Union[None, Dict[str, Any]] = None,
+        json_body: Union[None, Any] = None,
+    ) -> httpx.Response:
+        """Async version of send."""
+        key, entry, request_headers = self.prepare_request(
+            method, url, headers, parameters, json_body
+        )
+        if entry and self.is_fresh(entry):
+            return self.create_response(entry, method)
+        response = await client.request(
+            method,
+            url,
+            timeout=timeout,
+            headers=request_headers,
+            params=parameters,
+            json=json_body,
+        )
+        return self.complete_request(key, entry, method, response)
+
+    def prepare_request(
+        self,
+        method: str,
+        url: str,
+        headers: Union[None, Dict[str, Any]] = None,
+        parameters: Union[None, Dict[str, Any]] = None,
+        json_body: Union[None, Any] = None,
+    ) -> Tuple[str, Union[None, HttpCacheEntry], Dict[str, Any]]:
+        key = self.get_key(method, url, headers, parameters, json_body)
+        entry = self.load_entry(key)
+        request_headers = dict(headers or {})
+        if entry and entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+        return key, entry, request_headers
+
+    def complete_request(
+        self,
+        key: str,
+        entry: Union[None, HttpCacheEntry],
+        method: str,
+        response: httpx.Response,
+    ) -> httpx.Response:
+        if response.status_code == 304 and entry:
+            entry.stored_at = time.time()
+            entry.etag = response.headers.get("ETag", entry.etag)
+            entry.last_modified = response.headers.get(
+                "Last-Modified", entry.last_modified
+            )
+            self.save_entry(key, entry)
+            return self.create_response(entry, method)
+        if response.status_code != 200:
+            return response
+
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if "no-store" in cache_control or not (
+            etag or last_modified or self.ttl_in_seconds > 0
+        ):
+            if entry:
+                self.delete_entry(key)
+            return response
+        self.save_entry(
+            key,
+            HttpCacheEntry(
+                url=str(response.request.url),
+                status_code=response.status_code,
+                etag=etag,
+                last_modified=last_modified,
+                content_type=response.headers.get("Content-Type"),
+                content=response.text,
+                stored_at=time.time(),
+            ),
+        )
+        return response
+
+    def create_response(self, entry: HttpCacheEntry, method: str) -> httpx.Response:
+        headers = {"X-Cache": "HIT"}
+        if entry.content_type:
+            headers["Content-Type"] = entry.content_type
+        if entry.etag:
+            headers["ETag"] = entry.etag
+        if entry.last_modified:
+            headers["Last-Modified"] = entry.last_modified
+        return httpx.Response(
+            entry.status_code,
+            headers=headers,
+            content=entry.content.encode("utf-8"),
+            request=httpx.Request(method, entry.url),
+        )
@@ -0,0 +1,123 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Literal, Union
+
+import httpx
+
+from metabolights_utils.provider import definitions
+from metabolights_utils.provider.http_cache import HttpResponseCache
+from metabolights_utils.provider.utils import rest_api_post
+
+logger = logging.getLogger(__name__)
+
+JoinOperator = Literal["and", "or"]
+MAX_SEARCH_PAGE_SIZE = 100
+PUBLIC_SEARCH_SUB_PATH = "/public/search/studies/_search"
+
+
+class PublicSearchException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def get_public_search_page(
+    skip: int,
+    limit: int,
+    query: Union[None, str] = None,
+    body: Union[None, Dict[str, Any]] = None,
+    query_join_operator: JoinOperator = "and",
+    search_rest_api_url: Union[None, str] = None,
+    client: Union[None, httpx.Client] = None,
+    cache: Union[None, HttpResponseCache] = None,
+    timeout: Union[None, int] = None,
+) -> Dict[str, Any]:
+    """Returns content of a search result page. Raises PublicSearchException."""
+    search_rest_api_url = (
+        search_rest_api_url or definitions.default_study_search_rest_api_url
+    )
+    parameters = {
+        "limit": limit,
+        "skip": skip,
+        "query_join_operator": query_join_operator,
+    }
+    if query:
+        parameters["query"] = query.strip()
+    url = f"{search_rest_api_url.rstrip('/')}/{PUBLIC_SEARCH_SUB_PATH.lstrip('/')}"
+    response, error = rest_api_post(
+        url=url,
+        timeout=timeout,
+        headers={},
+        parameters=parameters,
+        json_body=body or {},
+        client=client,
+        cache=cache,
+    )
+    if not response or error:
+        raise PublicSearchException(f"Public search failure: {error}")
+    if str(response.get("status", "")).lower() != "success":
+        raise PublicSearchException(f"Public search failure at skip={skip}.")
+    content = response.get("content")
+    if not content or "page" not in content or "total" not in content:
+        raise PublicSearchException("Invalid public search response.")
+    return content
+
+
+def iterate_public_search_results(
+    query: Union[None, str] = None,
+    body: Union[None, Dict[str, Any]] = None,
+    query_join_operator: JoinOperator = "and",
+    skip: int = 0,
+    max_items: Union[None, int] = None,
+    page_size: int = MAX_SEARCH_PAGE_SIZE,
+    search_rest_api_url: Union[None, str] = None,
+    client: Union[None, httpx.Client] = None,
+    cache: Union[None, HttpResponseCache] = None,
+    timeout: Union[None, int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yields all matched study records page by page.
+
+    The next page is fetched in a background thread while items of the current
+    page are consumed, so at most two pages are kept in memory.
+    Raises PublicSearchException if a page can not be fetched.
+    """
+    page_size = max(1, min(page_size, MAX_SEARCH_PAGE_SIZE))
+
+    def fetch(offset: int) -> Dict[str, Any]:
+        limit = page_size
+        if max_items is not None:
+            limit = min(limit, skip + max_items - offset)
+        return get_public_search_page(
+            offset,
+            limit,
+            query=query,
+            body=body,
+            query_join_operator=query_join_operator,
+            search_rest_api_url=search_rest_api_url,
+            client=client,
+            cache=cache,
+            timeout=timeout,
+        )
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        offset = skip
+        future: Union[None, Future] = executor.submit(fetch, offset)
+        while future:
+            content = future.result()
+            page = content["page"] or []
+            if max_items is not None:
+                page = page[: skip + max_items - offset]
+            offset += len(page)
+            end = content["total"]
+            if max_items is not None:
+                end = min(end, skip + max_items)
+            future = None
+            if page and offset < end:
+                future = executor.submit(fetch, offset)
+            logger.debug("Public search page is fetched. Next offset: %s", offset)
+            yield from page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
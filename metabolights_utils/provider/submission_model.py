@@ -314,3 +314,28 @@ class FtpUploadDetails(BaseModel):
     ftp_host: str
     ftp_user: str
     ftp_password: str
+
+
+class MetadataFileState(BaseModel):
+    sha256: str = ""
+    remote_created_at: Union[None, str] = None
+    size_in_bytes: Union[None, int] = None
+
+
+class MetadataFileIndex(BaseModel):
+    """Content hashes of local metadata files when they were last synchronized.
+
+    A local file whose hash and remote creation time are not changed since
+    the last upload or download is up to date.
+    """
+
+    study_id: str = ""
+    files: Dict[str, MetadataFileState] = {}
+
+
+class StudyValidationResult(BaseModel):
+    study_id: str = ""
+    success: bool = False
+    message: str = ""
+    validation_result_file_path: str = ""
+    duration_in_seconds: float = 0
@@ -4,13 +4,15 @@ import json
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Literal, Tuple, Union
+from typing import Dict, Iterator, List, Literal, Tuple, Union
 
 import httpx
 
 from metabolights_utils.commands.submission.model import (
     FtpLoginCredentials,
+    ResponseFileDescriptor,
     RestApiCredentials,
     StudyResponse,
     SubmittedStudiesResponse,
@@ -26,6 +28,7 @@ from metabolights_utils.models.metabolights.model import (
     StudyFolderMetadata,
 )
 from metabolights_utils.provider import definitions
+from metabolights_utils.provider.ftp.connection_pool import FtpConnectionPool
 from metabolights_utils.provider.ftp.default_ftp_client import (
     DefaultFtpClient,
     LocalDirectory,
@@ -33,6 +36,10 @@ from metabolights_utils.provider.ftp.default_ftp_client import (
 from metabolights_utils.provider.ftp.folder_metadata_collector import (
     FtpFolderMetadataCollector,
 )
+from metabolights_utils.provider.ftp.model import FtpUploadItem
+from metabolights_utils.provider.ftp.progress import FtpRateLimiter, FtpTransferMonitor
+from metabolights_utils.provider.ftp.transfer import FtpTransferScheduler
+from metabolights_utils.provider.http_cache import HttpResponseCache
 from metabolights_utils.provider.local_folder_metadata_collector import (
     LocalFolderMetadataCollector,
 )
@@ -45,26 +52,52 @@ from metabolights_utils.provider.study_provider import (
 from metabolights_utils.provider.submission_model import (
     APIResponse,
     FtpUploadDetails,
+    MetadataFileIndex,
+    MetadataFileState,
     PolicyResultResponse,
     PolicySummaryResult,
+    StudyValidationResult,
     ValidationMessage,
     ValidationReport,
     ValidationResponse,
     WorkerTaskResponseContent,
     WorkerTaskStatus,
 )
+from metabolights_utils.provider.task_waiter import TaskWaiter
 from metabolights_utils.provider.utils import (
+    RETRY_HTTP_STATUS_CODES,
+    HttpRetryPolicy,
     download_file_from_rest_api,
+    get_http_client,
     is_metadata_file,
     is_metadata_filename_pattern,
     rest_api_get,
 )
 from metabolights_utils.utils.filename_utils import join_path
+from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
 
 logger = logging.getLogger(__name__)
 
 
-class MetabolightsSubmissionRepository:
+def get_remote_modified_time(descriptor: ResponseFileDescriptor) -> int:
+    """Returns creation time of a remote file as timestamp or 0 if it is invalid."""
+    try:
+        return int(
+            datetime.datetime.strptime(  # noqa: DTZ007
+                descriptor.created_at, "%Y-%m-%d %H:%M:%S"
+            ).timestamp()
+        )
+    except (TypeError, ValueError):
+        return 0
+
+
+class BaseMetabolightsSubmissionRepository:
+    """Configuration and local file helpers of submission repositories.
+
+    Sync and async repositories use the same request and response models,
+    local metadata file index and up-to-date checks.
+    """
+
     def __init__(
         self,
         local_storage_root_path: Union[None, str] = None,
@@ -73,6 +106,7 @@ class MetabolightsSubmissionRepository:
         rest_api_base_url: Union[None, str] = None,
         validation_api_base_url: Union[None, str] = None,
         local_storage_cache_path: Union[None, str] = None,
+        http_cache: Union[None, HttpResponseCache] = None,
     ) -> None:
         self.ftp_server_url = ftp_server_url
         if not self.ftp_server_url:
@@ -100,6 +134,245 @@ class MetabolightsSubmissionRepository:
         self.validation_api_base_url = validation_api_base_url
         if not self.validation_api_base_url:
             self.validation_api_base_url = definitions.default_validation_api_url
+        # Study listings are revalidated on every call, so uploads are seen at once.
+        self.http_cache = http_cache or HttpResponseCache(
+            os.path.join(self.local_storage_cache_path, "http")
+        )
+
+    def check_api_response(self, api_name, response):
+        if not response:
+            return False, f"No response for {api_name}"
+        code = response.status_code
+        text = response.text
+        if response.status_code in (200, 201):
+            return True, None
+        else:
+            return (
+                False,
+                f"Failure of {api_name} {code}: {text}",
+            )
+
+    def get_api_token(self):
+        result = None
+        if self.credentials_file_path:
+            credentials: RestApiCredentials = get_submission_rest_api_credentials(
+                credentials_file_path=self.credentials_file_path,
+                rest_api_base_url=self.rest_api_base_url,
+            )
+            result = credentials.api_token if credentials else None
+
+        if not result:
+            return (
+                None,
+                f"There is not user api token for {self.rest_api_base_url} "
+                "Rest API. Login before to use the command.",
+            )
+        return (result, None)
+
+    def get_ftp_credentials(self):
+        result = None
+        if self.credentials_file_path:
+            credentials: FtpLoginCredentials = get_submission_private_ftp_credentials(
+                credentials_file_path=self.credentials_file_path,
+                private_ftp_url=self.ftp_server_url,
+            )
+            result = credentials if credentials else None
+
+        if not result:
+            return (
+                None,
+                None,
+                f"There is not user api token for {self.rest_api_base_url} "
+                "Rest API. Login before to use the command.",
+            )
+        return (result.user_name, result.password, None)
+
+    def is_uploaded_metadata_file(
+        self,
+        file_path: Path,
+        descriptor: Union[None, ResponseFileDescriptor],
+        state: Union[None, MetadataFileState],
+    ) -> bool:
+        if not descriptor:
+            return False
+        if state and state.remote_created_at == descriptor.created_at:
+            return state.sha256 == HashUtils.sha256sum(str(file_path))
+        remote_modified_time = get_remote_modified_time(descriptor)
+        if not remote_modified_time:
+            return False
+        return remote_modified_time >= int(file_path.stat().st_mtime)
+
+    def is_downloaded_metadata_file(
+        self,
+        file_path: str,
+        descriptor: ResponseFileDescriptor,
+        state: Union[None, MetadataFileState],
+    ) -> bool:
+        if (
+            state
+            and state.remote_created_at == descriptor.created_at
+            and state.size_in_bytes == os.path.getsize(file_path)
+        ):
+            return True
+        local_modified_time = int(os.path.getmtime(file_path))
+        return get_remote_modified_time(descriptor) <= local_modified_time
+
+    def get_metadata_file_index_path(self, study_id: str) -> str:
+        return join_path(
+            self.local_storage_cache_path, study_id, "metadata_file_index.json"
+        )
+
+    def load_metadata_file_index(self, study_id: str) -> MetadataFileIndex:
+        file_path = self.get_metadata_file_index_path(study_id)
+        if os.path.exists(file_path):
+            try:
+                with open(file_path, encoding="utf-8") as f:
+                    return MetadataFileIndex.model_validate(json.load(f))
+            except Exception as ex:
+                logger.warning(
+                    "Metadata file index %s load error: %s", file_path, str(ex)
+                )
+        return MetadataFileIndex(study_id=study_id)
+
+    def save_metadata_file_index(self, index: MetadataFileIndex) -> None:
+        file_path = self.get_metadata_file_index_path(index.study_id)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as fw:
+            fw.write(index.model_dump_json(indent=4))
+
+    def select_metadata_files_to_upload(
+        self,
+        study_folder: Path,
+        metadata_files: List[str],
+        remote_files: Dict[str, ResponseFileDescriptor],
+        index: MetadataFileIndex,
+        override_remote_files: bool = False,
+    ) -> List[str]:
+        if override_remote_files:
+            return metadata_files
+        return [
+            x
+            for x in metadata_files
+            if not self.is_uploaded_metadata_file(
+                study_folder / Path(x), remote_files.get(x), index.files.get(x)
+            )
+        ]
+
+    def set_metadata_file_states(
+        self,
+        index: MetadataFileIndex,
+        study_folder: Path,
+        file_names: List[str],
+        remote_files: Dict[str, ResponseFileDescriptor],
+    ) -> None:
+        for file_name in file_names:
+            if file_name not in remote_files:
+                index.files.pop(file_name, None)
+                continue
+            file_path = study_folder / Path(file_name)
+            index.files[file_name] = MetadataFileState(
+                sha256=HashUtils.sha256sum(str(file_path)),
+                remote_created_at=remote_files[file_name].created_at,
+                size_in_bytes=file_path.stat().st_size,
+            )
+
+    def select_metadata_files_to_download(
+        self,
+        response: LocalDirectory,
+        study_id: str,
+        study_path: str,
+        requested_files: List[str],
+        descriptors: Dict[str, ResponseFileDescriptor],
+        index: MetadataFileIndex,
+        override_local_files: bool = False,
+    ) -> List[str]:
+        """Returns files to download and sets the planned action of each file."""
+        new_requested_files = []
+        for filename in requested_files:
+            file_path = os.path.join(study_path, filename)
+            key = f"{study_id}/{filename}"
+            if not os.path.exists(file_path):
+                new_requested_files.append(filename)
+                response.actions[key] = "DOWNLOADED"
+            elif override_local_files:
+                new_requested_files.append(filename)
+                response.actions[key] = "OVERRIDDEN"
+            elif self.is_downloaded_metadata_file(
+                file_path, descriptors[filename], index.files.get(filename)
+            ):
+                response.actions[key] = "SKIPPED"
+                response.local_files.append(key)
+            else:
+                new_requested_files.append(filename)
+                response.actions[key] = "DOWNLOADED"
+        return new_requested_files
+
+    def complete_metadata_file_downloads(
+        self,
+        response: LocalDirectory,
+        study_id: str,
+        study_path: str,
+        results: Dict[str, Tuple[bool, Union[None, str]]],
+        descriptors: Dict[str, ResponseFileDescriptor],
+        index: MetadataFileIndex,
+        delete_unlisted_metadata_files: bool = False,
+    ) -> None:
+        """Updates response and metadata file index with download results."""
+        errors: List[str] = []
+        for filename, (success, error) in results.items():
+            key = f"{study_id}/{filename}"
+            file_path = os.path.join(study_path, filename)
+            if not success or not os.path.exists(file_path):
+                response.actions[key] = "FAILED"
+                errors.append(f"{filename}: {error}")
+                continue
+            response.local_files.append(key)
+            index.files[filename] = MetadataFileState(
+                sha256=HashUtils.sha256sum(file_path),
+                remote_created_at=descriptors[filename].created_at,
+                size_in_bytes=os.path.getsize(file_path),
+            )
+        if results:
+            self.save_metadata_file_index(index)
+
+        if delete_unlisted_metadata_files and os.path.exists(study_path):
+            for filename in os.listdir(study_path):
+                if filename not in descriptors:
+                    file_path = os.path.join(study_path, filename)
+                    if is_metadata_file(file_path):
+                        response.actions[f"{study_id}/{filename}"] = "DELETED"
+                        os.remove(file_path)
+        if errors:
+            response.code = 500
+            response.message = "Download failures:\n" + "\n".join(errors)
+        else:
+            response.success = True
+            response.code = 200
+            response.message = "Ok"
+
+
+class MetabolightsSubmissionRepository(BaseMetabolightsSubmissionRepository):
+    def __init__(
+        self,
+        local_storage_root_path: Union[None, str] = None,
+        credentials_file_path: Union[None, str] = None,
+        ftp_server_url: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+        validation_api_base_url: Union[None, str] = None,
+        local_storage_cache_path: Union[None, str] = None,
+        http_client: Union[None, httpx.Client] = None,
+        http_cache: Union[None, HttpResponseCache] = None,
+    ) -> None:
+        super().__init__(
+            local_storage_root_path=local_storage_root_path,
+            credentials_file_path=credentials_file_path,
+            ftp_server_url=ftp_server_url,
+            rest_api_base_url=rest_api_base_url,
+            validation_api_base_url=validation_api_base_url,
+            local_storage_cache_path=local_storage_cache_path,
+            http_cache=http_cache,
+        )
+        self.http_client = http_client or get_http_client()
 
     def load_study_model(
         self,
@@ -155,7 +428,7 @@ class MetabolightsSubmissionRepository:
         try:
             result = self.download_submission_metadata_files(
                 study_id=study_id,
-                local_path=local_path,
+                metadata_files_path=local_path,
                 metadata_files=None,
                 override_local_files=override_local_files,
                 delete_unlisted_metadata_files=True,
@@ -211,7 +484,16 @@ class MetabolightsSubmissionRepository:
         override_remote_files: bool = False,
         rest_api_base_url: Union[None, str] = None,
         remove_unreferenced_metadata_files: bool = False,
+        max_workers: Union[None, int] = None,
+        max_retries: Union[None, int] = None,
     ) -> Tuple[bool, str]:
+        """Uploads new and updated metadata files in parallel.
+
+        A local file is up to date if its content hash is not changed since
+        it was last uploaded or downloaded and the remote file is not changed since.
+        Otherwise the local file is uploaded if it is newer than the remote file.
+        Each failed upload is retried and all failures are reported together.
+        """
         if not metadata_files_path:
             local_path = self.local_storage_root_path
             local_path = join_path(local_path)
@@ -223,6 +505,10 @@ class MetabolightsSubmissionRepository:
 
         if not rest_api_base_url:
             rest_api_base_url = self.rest_api_base_url
+        if not user_api_token:
+            user_api_token, error = self.get_api_token()
+            if not user_api_token:
+                return False, error
 
         response, errors = self.list_isa_metadata_files(
             study_id=study_id,
@@ -231,46 +517,27 @@ class MetabolightsSubmissionRepository:
         )
         if not response:
             return False, "Errors while listing metadata files."
-
-        modified_time_dict = {}
-        new_requested_files = []
-        for descriptor in response.study:
-            _time = descriptor.created_at
-            try:
-                modified = datetime.datetime.strptime(  # noqa: DTZ007
-                    _time, "%Y-%m-%d %H:%M:%S"
-                ).timestamp()
-            except ValueError:
-                modified = 0
-            remote_modified_time = int(modified)
-            modified_time_dict[descriptor.file] = remote_modified_time
+        remote_files = {x.file: x for x in response.study}
 
         if not study_folder.exists():
             return False, f"Study path does not exist: {study_path}"
         if not metadata_files or override_remote_files:
             files = os.listdir(study_path)
             metadata_files = [x for x in files if is_metadata_filename_pattern(x)]
+        metadata_files = [Path(x).name for x in metadata_files]
 
         will_be_deleted_files = []
-        current_files = {descriptor.file for descriptor in response.study}
         if remove_unreferenced_metadata_files:
-            will_be_deleted_files = list(current_files - set(metadata_files))
-
-        if override_remote_files:
-            new_requested_files = metadata_files
-        else:
-            for file_name in metadata_files:
-                relative_path = file_name.replace(f"{local_path}/", "", 1)
-                remote_modified_time = None
-                if relative_path in modified_time_dict:
-                    remote_modified_time = modified_time_dict[relative_path]
-                file_path = study_folder / Path(file_name)
-                if remote_modified_time:
-                    local_modified_time = int(file_path.stat().st_mtime)
-                    if remote_modified_time < local_modified_time:
-                        new_requested_files.append(relative_path)
-                else:
-                    new_requested_files.append(relative_path)
+            will_be_deleted_files = list(set(remote_files) - set(metadata_files))
+
+        index = self.load_metadata_file_index(study_id)
+        new_requested_files = self.select_metadata_files_to_upload(
+            study_folder,
+            metadata_files,
+            remote_files,
+            index,
+            override_remote_files=override_remote_files,
+        )
         if not new_requested_files:
             return (
                 False,
@@ -284,24 +551,27 @@ class MetabolightsSubmissionRepository:
         sub_path = f"/studies/{study_id}/drag-drop-upload"
         file_paths = [study_folder / Path(x) for x in new_requested_files]
         url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
-        errors = []
-        for file_path in file_paths:
-            try:
-                with open(file_path, "rb") as fh:
-                    files = [("file", (file_path.name, fh))]
-                    response = httpx.post(
-                        url=url,
-                        timeout=timeout,
-                        headers=headers,
-                        params={},
-                        files=files,
-                    )
-                    if response.status_code not in (200, 201):
-                        errors.append(
-                            f"{file_path.name}: {response.status_code} {response.text}"
-                        )
-            except Exception as ex:
-                errors.append(f"{file_path.name}: {ex}")
+        retry_policy = HttpRetryPolicy(max_retries=max_retries)
+        max_workers = max_workers or definitions.default_http_max_workers
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(file_paths))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda x: self.upload_metadata_file(
+                        url, x, headers, timeout=timeout, retry_policy=retry_policy
+                    ),
+                    file_paths,
+                )
+            )
+        errors = [x for x in results if x]
+        uploaded_files = [
+            x.name for x, error in zip(file_paths, results, strict=True) if not error
+        ]
+        if uploaded_files:
+            self.update_metadata_file_index(
+                index, study_folder, uploaded_files, user_api_token, rest_api_base_url
+            )
 
         if errors:
             return False, "Upload failures:\n" + "\n".join(errors)
@@ -312,7 +582,7 @@ class MetabolightsSubmissionRepository:
                 "files": [{"name": file_name} for file_name in will_be_deleted_files]
             }
             url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -320,12 +590,82 @@ class MetabolightsSubmissionRepository:
                 json=file_delete_payload,
             )
             if response.status_code not in (200, 201):
-                errors.append(
-                    f"Failed to delete files: {response.status_code} {response.text}"
+                return (
+                    False,
+                    f"Failed to delete files: {response.status_code} {response.text}",
                 )
+            for file_name in will_be_deleted_files:
+                index.files.pop(file_name, None)
+            self.save_metadata_file_index(index)
 
         return True, "Success"
 
+    def upload_metadata_file(
+        self,
+        url: str,
+        file_path: Path,
+        headers: Dict[str, str],
+        timeout: Union[None, int] = None,
+        retry_policy: Union[None, HttpRetryPolicy] = None,
+    ) -> Union[None, str]:
+        """Uploads a metadata file and returns the error message if it fails.
+
+        An upload replaces the remote file, so it is sent again
+        after transport errors and retryable response status codes.
+        """
+        retry_policy = retry_policy or HttpRetryPolicy()
+        attempt = 0
+        while True:
+            attempt += 1
+            response = None
+            try:
+                with open(file_path, "rb") as fh:
+                    files = [("file", (file_path.name, fh))]
+                    response = self.http_client.post(
+                        url=url,
+                        timeout=timeout,
+                        headers=headers,
+                        params={},
+                        files=files,
+                    )
+                if response.status_code in (200, 201):
+                    return None
+                error = f"{file_path.name}: {response.status_code} {response.text}"
+                retryable = response.status_code in RETRY_HTTP_STATUS_CODES
+            except httpx.TransportError as ex:
+                error = f"{file_path.name}: {ex}"
+                retryable = True
+            except Exception as ex:
+                return f"{file_path.name}: {ex}"
+            if not retryable or attempt > retry_policy.max_retries:
+                return error
+            wait_time = retry_policy.get_wait_time(attempt, response)
+            logger.warning(
+                "Upload error %s. Retrying in %.2f seconds...", error, wait_time
+            )
+            time.sleep(wait_time)
+
+    def update_metadata_file_index(
+        self,
+        index: MetadataFileIndex,
+        study_folder: Path,
+        file_names: List[str],
+        user_api_token: Union[None, str] = None,
+        rest_api_base_url: Union[None, str] = None,
+    ) -> None:
+        """Saves content hashes of files with their current remote creation time."""
+        response, error = self.list_isa_metadata_files(
+            study_id=index.study_id,
+            user_api_token=user_api_token,
+            rest_api_base_url=rest_api_base_url,
+        )
+        if not response:
+            logger.warning("Metadata file index is not updated: %s", error)
+            return
+        remote_files = {x.file: x for x in response.study}
+        self.set_metadata_file_states(index, study_folder, file_names, remote_files)
+        self.save_metadata_file_index(index)
+
     def upload_data_files(
         self,
         study_id,
@@ -334,7 +674,19 @@ class MetabolightsSubmissionRepository:
         ftp_server_url: Union[str, None] = None,
         ftp_username: Union[str, None] = None,
         ftp_password: Union[str, None] = None,
+        max_connections: int = 4,
+        blocksize: int = 8192,
+        skip_unchanged_files: bool = True,
+        resume: bool = True,
+        rate_limiter: Union[None, FtpRateLimiter] = None,
+        monitor: Union[None, FtpTransferMonitor] = None,
     ) -> Tuple[bool, str]:
+        """Uploads data files in study folder to private FTP folder in parallel.
+
+        Relative paths of the files in study folder are kept on FTP folder.
+        Files that are not changed since their last upload are skipped and
+        interrupted uploads are resumed.
+        """
         if not data_files_path:
             local_path = self.local_storage_root_path
             data_files_path = join_path(local_path, study_id)
@@ -345,13 +697,23 @@ class MetabolightsSubmissionRepository:
         if not study_folder.exists():
             return False, f"Study path does not exist: {study_path}"
 
-        files = study_folder.rglob("*")
-
-        input_files = [
-            str(x) for x in files if not is_metadata_filename_pattern(Path(x).name)
-        ]
+        remote_folder_directory = (
+            remote_folder_directory.strip("/") if remote_folder_directory else ""
+        )
+        items = []
+        for file in study_folder.rglob("*"):
+            if not file.is_file() or is_metadata_filename_pattern(file.name):
+                continue
+            relative_path = file.relative_to(study_folder).as_posix()
+            remote_path = f"{remote_folder_directory}/{relative_path}".strip("/")
+            items.append(
+                FtpUploadItem(
+                    local_file_path=str(file),
+                    relative_path=remote_path,
+                    size_in_bytes=file.stat().st_size,
+                )
+            )
 
-        # username, password, error = self.get_ftp_credentials()
         ftp_client = DefaultFtpClient(
             local_storage_root_path=data_files_path,
             ftp_server_url=ftp_server_url,
@@ -360,28 +722,30 @@ class MetabolightsSubmissionRepository:
             password=ftp_password,
         )
         try:
-            status, message = ftp_client.upload_files(
-                remote_folder_directory, input_files
-            )
-            if not status:
-                return False, message
-            return True, "Uploaded Files: " + ", ".join(input_files)
+            with FtpConnectionPool(ftp_client, max_connections=max_connections) as pool:
+                scheduler = FtpTransferScheduler(
+                    pool, rate_limiter=rate_limiter, monitor=monitor
+                )
+                report = scheduler.upload_files(
+                    items,
+                    blocksize=blocksize,
+                    skip_unchanged_files=skip_unchanged_files,
+                    resume=resume,
+                )
+            errors = [
+                f"FTP upload error for {x.relative_path}: {x.message}"
+                for x in report.results
+                if x.action == "ERROR"
+            ]
+            if errors:
+                return False, "; ".join(errors)
+            uploaded_files = [
+                x.relative_path for x in report.results if x.action == "UPLOADED"
+            ]
+            return True, "Uploaded Files: " + ", ".join(uploaded_files)
         except Exception as ex:
             return False, str(ex)
 
-    def check_api_response(self, api_name, response):
-        if not response:
-            return False, f"No response for {api_name}"
-        code = response.status_code
-        text = response.text
-        if response.status_code in (200, 201):
-            return True, None
-        else:
-            return (
-                False,
-                f"Failure of {api_name} {code}: {text}",
-            )
-
     def get_ftp_upload_details(
         self,
         study_id,
@@ -404,7 +768,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.get(
+            response = self.http_client.get(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -427,7 +791,9 @@ class MetabolightsSubmissionRepository:
         pool_period: int = 5,
         retry: int = 20,
         timeout: int = 10,
+        task_waiter: Union[None, TaskWaiter] = None,
     ):
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
         if not validation_file_path:
             validation_file_path = str(
                 Path(self.local_storage_cache_path),
@@ -450,7 +816,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{self.rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -472,65 +838,58 @@ class MetabolightsSubmissionRepository:
             return None, f"Validation task start failure: {str(ex)}."
 
         api_name = "validation task status check"
-        try:
-            task_success = False
-            for _ in range(retry + 1):
-                time.sleep(pool_period)
-                try:
-                    response = httpx.get(
-                        url=url,
-                        timeout=timeout,
-                        headers=headers,
-                        params=parameters,
-                    )
-                except TimeoutError:
-                    continue
-                success, error = self.check_api_response(api_name, response)
-                if not success:
-                    continue
-                data = json.loads(response.text)
-                task_status_response = ValidationResponse.model_validate(
-                    data, from_attributes=True
+
+        def poll_task_status() -> Tuple[bool, Union[None, str]]:
+            try:
+                response = self.http_client.get(
+                    url=url,
+                    timeout=timeout,
+                    headers=headers,
+                    params=parameters,
                 )
+            except httpx.TransportError:
+                return False, None
+            success, _ = self.check_api_response(api_name, response)
+            if not success:
+                return False, None
+            data = json.loads(response.text)
+            task = ValidationResponse.model_validate(data, from_attributes=True).task
+            if task.task_id and task.last_status:
+                return "SUCCESS" in task.last_status.upper(), task.last_status
+            return False, None
 
-                task = task_status_response.task
-                status = task.last_status
-                if task.task_id and task.last_status:
-                    if "SUCCESS" in status.upper():
-                        task_success = True
-                        break
+        try:
+            task_success, status = task_waiter.wait(poll_task_status)
             if not task_success:
                 return (None, f"Failure of {api_name} for {study_id}.")
         except Exception as ex:
             return None, f"{api_name} failure: {str(ex)}."
 
         api_name = "get validation report"
+        report_sub_path = f"/studies/{study_id}/validation-report"
+        report_url = (
+            f"{self.rest_api_base_url.rstrip('/')}/{report_sub_path.lstrip('/')}"
+        )
+
+        def poll_report() -> Tuple[bool, Union[None, ValidationReport]]:
+            try:
+                response = self.http_client.get(
+                    url=report_url,
+                    timeout=timeout,
+                    headers=headers,
+                    params=parameters,
+                )
+            except httpx.TransportError:
+                return False, None
+            success, _ = self.check_api_response(api_name, response)
+            if not success:
+                return False, None
+            data = json.loads(response.text)
+            report = ValidationReport.model_validate(data, from_attributes=True)
+            return bool(report.validation.status), report
+
         try:
-            api_success = False
-            report_sub_path = f"/studies/{study_id}/validation-report"
-            report_url = (
-                f"{self.rest_api_base_url.rstrip('/')}/{report_sub_path.lstrip('/')}"
-            )
-            for _ in range(retry + 1):
-                try:
-                    response = httpx.get(
-                        url=report_url,
-                        timeout=timeout,
-                        headers=headers,
-                        params=parameters,
-                    )
-                except TimeoutError:
-                    time.sleep(pool_period)
-                    continue
-                success, error = self.check_api_response(api_name, response)
-                if not success:
-                    time.sleep(pool_period)
-                    continue
-                data = json.loads(response.text)
-                report = ValidationReport.model_validate(data, from_attributes=True)
-                if report.validation.status:
-                    api_success = True
-                    break
+            api_success, report = task_waiter.wait(poll_report)
             if not api_success:
                 return (None, f"Failure of {api_name} for {study_id}.")
         except Exception as ex:
@@ -565,7 +924,9 @@ class MetabolightsSubmissionRepository:
         validation_api_base_url: Union[None, str] = None,
         rest_api_base_url: Union[None, str] = None,
         user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
     ):
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
         sub_path = "/study-model/validation"
         auth_sub_path = "/auth/login-with-token"
         provider = MetabolightsStudyProvider(
@@ -597,7 +958,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{rest_api_base_url.rstrip('/')}/{auth_sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 json={"token": api_header},
@@ -633,7 +994,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{validation_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -657,33 +1018,31 @@ class MetabolightsSubmissionRepository:
 
         headers["task_id"] = task_id
         api_name = "validation task v2 status check"
-        try:
-            task_success = False
-            for _ in range(retry + 1):
-                time.sleep(pool_period)
-                try:
-                    response = httpx.get(
-                        url=url,
-                        timeout=timeout,
-                        headers=headers,
-                        params=parameters,
-                    )
-                except TimeoutError:
-                    continue
-                success, error = self.check_api_response(api_name, response)
-                if not success:
-                    continue
-                data = json.loads(response.text)
-                task_status_response = APIResponse[PolicyResultResponse].model_validate(
-                    data, from_attributes=True
+
+        def poll_task_status() -> Tuple[bool, Union[None, APIResponse]]:
+            try:
+                response = self.http_client.get(
+                    url=url,
+                    timeout=timeout,
+                    headers=headers,
+                    params=parameters,
                 )
+            except httpx.TransportError:
+                return False, None
+            success, _ = self.check_api_response(api_name, response)
+            if not success:
+                return False, None
+            data = json.loads(response.text)
+            task_status_response = APIResponse[PolicyResultResponse].model_validate(
+                data, from_attributes=True
+            )
+            task = task_status_response.content
+            if task.task_id and task.task_status:
+                return "SUCCESS" in task.task_status.upper(), task_status_response
+            return False, None
 
-                task = task_status_response.content
-                status = task.task_status
-                if task.task_id and status:
-                    if "SUCCESS" in status.upper():
-                        task_success = True
-                        break
+        try:
+            task_success, task_status_response = task_waiter.wait(poll_task_status)
             if not task_success:
                 return None, f"Failure of {api_name}."
         except Exception as ex:
@@ -705,7 +1064,9 @@ class MetabolightsSubmissionRepository:
         validation_api_base_url: Union[None, str] = None,
         rest_api_base_url: Union[None, str] = None,
         user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
     ):
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
         sub_path = f"/submissions/v2/validations/{study_id}"
         auth_sub_path = "/auth/login-with-token"
 
@@ -721,7 +1082,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{rest_api_base_url.rstrip('/')}/{auth_sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 json={"token": api_header},
@@ -755,7 +1116,7 @@ class MetabolightsSubmissionRepository:
         try:
             url = f"{validation_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
             parameters = {}
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -783,47 +1144,39 @@ class MetabolightsSubmissionRepository:
         headers["task-id"] = task_id
         api_name = "validation task v2 status check"
         task_check_url = f"{url.rstrip('/')}/{task_id.strip('/')}"
+
+        def poll_task_status() -> Tuple[bool, Union[None, APIResponse]]:
+            try:
+                response = self.http_client.get(
+                    url=task_check_url,
+                    timeout=timeout,
+                    headers=headers,
+                    params=parameters,
+                )
+            except httpx.TransportError:
+                return False, None
+            success, _ = self.check_api_response(api_name, response)
+            if not success:
+                return False, None
+            data = json.loads(response.text)
+            task_status_response = APIResponse[
+                WorkerTaskResponseContent[PolicySummaryResult]
+            ].model_validate(data, by_alias=True)
+            content = task_status_response.content
+            task = content.task if content else None
+            return bool(task and task.ready), task_status_response
+
         try:
-            task_success = False
-            for _ in range(retry + 1):
-                time.sleep(pool_period)
-                try:
-                    response = httpx.get(
-                        url=task_check_url,
-                        timeout=timeout,
-                        headers=headers,
-                        params=parameters,
+            task_success, task_status_response = task_waiter.wait(poll_task_status)
+            if task_success:
+                if not task_status_response.content.task.is_successful:
+                    logger.error(
+                        "%s: %s - %s", api_name, "Task is not successful", task_id
                     )
-                except TimeoutError:
-                    continue
-                success, error = self.check_api_response(api_name, response)
-                if not success:
-                    continue
-                data = json.loads(response.text)
-                task_status_response = APIResponse[
-                    WorkerTaskResponseContent[PolicySummaryResult]
-                ].model_validate(data, by_alias=True)
-
-                task = (
-                    task_status_response.content.task
-                    if task_status_response.content
-                    else None
+                    return None, f"Task {task_id} is not successful."
+                logger.info(
+                    "%s: %s - %s", api_name, "Task completed successfully", task_id
                 )
-                if task and task.ready:
-                    if task.is_successful:
-                        task_success = True
-                        logger.info(
-                            "%s: %s - %s",
-                            api_name,
-                            "Task completed successfully",
-                            task_id,
-                        )
-                        break
-                    else:
-                        logger.error(
-                            "%s: %s - %s", api_name, "Task is not successful", task_id
-                        )
-                        return None, f"Task {task_id} is not successful."
             if (
                 not task_success
                 or not task_status_response.content
@@ -851,6 +1204,83 @@ class MetabolightsSubmissionRepository:
             logger.error("%s: %s", api_name, ex)
             return None, f"{api_name} failure: {str(ex)}."
 
+    def validate_studies(
+        self,
+        validation_result_file_paths: Dict[str, str],
+        max_workers: Union[None, int] = None,
+        pool_period: int = 5,
+        retry: int = 20,
+        timeout: int = 30,
+        user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> Dict[str, Tuple[bool, str]]:
+        """Validates studies concurrently and saves their validation results.
+
+        validation_result_file_paths maps study ids to their result file paths.
+        Returns success flag and message of each study. Message is the task id
+        of a successful validation, otherwise the failure reason.
+        """
+        results = self.iterate_study_validations(
+            validation_result_file_paths,
+            max_workers=max_workers,
+            pool_period=pool_period,
+            retry=retry,
+            timeout=timeout,
+            user_api_token=user_api_token,
+            task_waiter=task_waiter,
+        )
+        return {x.study_id: (x.success, x.message) for x in results}
+
+    def iterate_study_validations(
+        self,
+        validation_result_file_paths: Dict[str, str],
+        max_workers: Union[None, int] = None,
+        pool_period: int = 5,
+        retry: int = 20,
+        timeout: int = 30,
+        user_api_token: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
+    ) -> Iterator[StudyValidationResult]:
+        """Validates studies concurrently and yields results as they finish.
+
+        Validation tasks of at most max_workers studies are started
+        and waited at the same time.
+        """
+        max_workers = max_workers or definitions.default_http_max_workers
+        study_ids = list(validation_result_file_paths)
+        if not study_ids:
+            return
+
+        def validate(study_id: str) -> StudyValidationResult:
+            start = time.perf_counter()
+            file_path = validation_result_file_paths[study_id]
+            try:
+                success, message = self.validate_study(
+                    study_id,
+                    validation_result_file_path=file_path,
+                    pool_period=pool_period,
+                    retry=retry,
+                    timeout=timeout,
+                    user_api_token=user_api_token,
+                    task_waiter=task_waiter,
+                )
+            except Exception as ex:
+                success, message = False, f"Validation failure: {str(ex)}."
+            return StudyValidationResult(
+                study_id=study_id,
+                success=bool(success),
+                message=message or "",
+                validation_result_file_path=file_path,
+                duration_in_seconds=time.perf_counter() - start,
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(study_ids))
+        ) as executor:
+            futures = [executor.submit(validate, x) for x in study_ids]
+            for future in as_completed(futures):
+                yield future.result()
+
     def sync_private_ftp_metadata_files(
         self,
         study_id: str,
@@ -896,7 +1326,9 @@ class MetabolightsSubmissionRepository:
         timeout: int = 10,
         user_api_token: Union[None, str] = None,
         rest_api_base_url: Union[None, str] = None,
+        task_waiter: Union[None, TaskWaiter] = None,
     ) -> Tuple[bool, Tuple[None | str]]:
+        task_waiter = task_waiter or TaskWaiter.from_poll_period(pool_period, retry)
         sub_path = f"/studies/{study_id}/study-folders/rsync-task"
         if not user_api_token:
             user_api_token, error = self.get_api_token()
@@ -916,7 +1348,7 @@ class MetabolightsSubmissionRepository:
             rest_api_base_url = self.rest_api_base_url
         url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
         parameters = {}
-        response = httpx.post(
+        response = self.http_client.post(
             url=url,
             timeout=timeout,
             headers=headers,
@@ -931,23 +1363,24 @@ class MetabolightsSubmissionRepository:
             #     task_id = data["task"]["task_id"]
 
             if task_id:
-                for _ in range(retry + 1):
-                    time.sleep(pool_period)
-                    response = httpx.get(
+
+                def poll_task_status() -> Tuple[bool, Union[None, str]]:
+                    response = self.http_client.get(
                         url=url,
                         timeout=timeout,
                         headers=headers,
                         params=parameters,
                     )
                     if response:
-                        data = json.loads(response.text)
-                        if "status" in data:
-                            status = data["status"]
-                            if "SUCCESS" in status:
-                                return True, status
-                            elif "FAIL" in status:
-                                return False, status
-                return False, "No result"
+                        status = json.loads(response.text).get("status")
+                        if status and ("SUCCESS" in status or "FAIL" in status):
+                            return True, status
+                    return False, None
+
+                done, status = task_waiter.wait(poll_task_status)
+                if not done:
+                    return False, "No result"
+                return "SUCCESS" in status, status
             else:
                 return False, "Response does not have a task id"
         else:
@@ -984,7 +1417,7 @@ class MetabolightsSubmissionRepository:
         url = f"{self.rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
         data = study_creation_request.model_dump(by_alias=True)
         try:
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url, timeout=timeout, headers=headers, params={}, json=data
             )
             if response and response.status_code in (200, 201):
@@ -1027,7 +1460,7 @@ class MetabolightsSubmissionRepository:
                 {"name": "column type", "value": column_type.lower()}
             )
         try:
-            response = httpx.post(
+            response = self.http_client.post(
                 url=url, timeout=timeout, headers=headers, params={}, json=body
             )
             if response and response.status_code in (200, 201):
@@ -1061,7 +1494,7 @@ class MetabolightsSubmissionRepository:
         sub_path = f"/studies/{study_id}/assays/{assay_filename}"
         url = f"{self.rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
         try:
-            response = httpx.delete(
+            response = self.http_client.delete(
                 url=url,
                 timeout=timeout,
                 headers=headers,
@@ -1087,7 +1520,15 @@ class MetabolightsSubmissionRepository:
         metadata_files: Union[List[str], None] = None,
         override_local_files: bool = False,
         delete_unlisted_metadata_files: bool = True,
+        max_workers: Union[None, int] = None,
     ) -> LocalDirectory:
+        """Downloads new and updated metadata files in parallel.
+
+        A local file is skipped if the remote file is not changed since it was
+        downloaded or uploaded and the local file has the same size since then.
+        Other local files are skipped if they are not older than remote files,
+        so local updates are not overridden.
+        """
         api_header, error = self.get_api_token()
         headers = {}
         if api_header:
@@ -1107,115 +1548,72 @@ class MetabolightsSubmissionRepository:
 
         study_id = study_id.upper().strip("/")
 
-        listed_files = []
+        result, error = self.list_isa_metadata_files(study_id)
+        if not result:
+            return LocalDirectory(
+                code=404, message="There is no metadata file to download."
+            )
+        descriptors = {x.file: x for x in result.study}
         requested_files = metadata_files
-        if not metadata_files or delete_unlisted_metadata_files:
-            result, error = self.list_isa_metadata_files(study_id)
-            if result:
-                file_names = [x.file for x in result.study]
-                descriptors = {x.file: x for x in result.study}
-                listed_files = set(file_names)
-                if not metadata_files:
-                    requested_files = file_names
-            else:
-                return LocalDirectory(
-                    code=404, message="There is no metadata file to download."
-                )
-
-        if requested_files != metadata_files:
-            filtered_files = [
-                x for x in requested_files if is_metadata_filename_pattern(x)
-            ]
-            requested_files = filtered_files
-        response.actions = {f"{study_id}/{x}": "SKIPPED" for x in requested_files}
-
-        new_requested_files = []
-        for filename in requested_files:
-            file_path = os.path.join(local_path, study_id, filename)
-            key = f"{study_id}/{filename}"
-            if os.path.exists(file_path):
-                if override_local_files:
-                    response.actions[key] = "OVERRIDDEN"
-                else:
-                    local_modified_time = int(os.path.getmtime(file_path))
-                    _time = descriptors[filename].created_at
-                    try:
-                        modified = datetime.datetime.strptime(  # noqa: DTZ007
-                            _time, "%Y-%m-%d %H:%M:%S"
-                        ).timestamp()
-                    except ValueError:
-                        modified = 0
-                    remote_modified_time = int(modified)
-                    if remote_modified_time > local_modified_time:
-                        new_requested_files.append(filename)
-                        response.actions[key] = "DOWNLOADED"
-                    else:
-                        response.actions[key] = "SKIPPED"
-            else:
-                new_requested_files.append(filename)
-                response.actions[key] = "DOWNLOADED"
-        requested_files = new_requested_files
-
-        if requested_files and not os.path.exists(local_path):
-            os.makedirs(local_path, exist_ok=True)
+        if not metadata_files:
+            requested_files = [x.file for x in result.study]
+        requested_files = [
+            x
+            for x in requested_files
+            if is_metadata_filename_pattern(x) and x in descriptors
+        ]
 
-        messages: List[GenericMessage] = []
-        current_file = None
+        study_path = os.path.join(local_path, study_id)
+        index = self.load_metadata_file_index(study_id)
+        new_requested_files = self.select_metadata_files_to_download(
+            response,
+            study_id,
+            study_path,
+            requested_files,
+            descriptors,
+            index,
+            override_local_files=override_local_files,
+        )
         try:
             sub_path = f"/studies/{study_id}/download"
-
-            if not metadata_files:
-                parameters = {"file": "metadata"}
-            else:
-                parameters["file"] = [",".join(metadata_files)]
-
-            for filename in requested_files:
-                new_file_path = os.path.join(local_path, study_id, filename)
-                current_file = filename
-                url = self.rest_api_base_url.strip("/") + "/" + sub_path.strip("/")
-                try:
-                    _time = descriptors[filename].created_at
-                    try:
-                        modified = datetime.datetime.strptime(  # noqa: DTZ007
-                            _time, "%Y-%m-%d %H:%M:%S"
-                        ).timestamp()
-                    except ValueError:
-                        modified = 0
-                    remote_modified_time = int(modified)
-                except Exception:
-                    remote_modified_time = None
-
-                success = download_file_from_rest_api(
-                    url,
-                    new_file_path,
-                    timeout=60,
-                    headers=headers,
-                    parameters=parameters,
-                    modification_time=remote_modified_time,
-                    is_zip_response=True,
-                )
-                if not success:
-                    response.actions[filename] = "FAILED"
-            if delete_unlisted_metadata_files:
-                study_path = os.path.join(local_path, study_id)
-                if os.path.exists(study_path):
-                    for filename in os.listdir(study_path):
-                        if filename not in listed_files:
-                            file_path = os.path.join(study_path, filename)
-                            if is_metadata_file(file_path):
-                                response.actions[f"{study_id}/{filename}"] = "DELETED"
-                                os.remove(file_path)
-            response.success = True
-            response.code = 200
-            response.message = "Ok"
-
-        except Exception as ex:
-            messages.append(
-                ErrorMessage(
-                    short=f"Download data file {current_file or ''} failure",
-                    detail=f"Error message: {str(ex)}",
-                )
+            url = self.rest_api_base_url.strip("/") + "/" + sub_path.strip("/")
+            results = []
+            if new_requested_files:
+                os.makedirs(study_path, exist_ok=True)
+                max_workers = max_workers or definitions.default_http_max_workers
+                with ThreadPoolExecutor(
+                    max_workers=min(max_workers, len(new_requested_files))
+                ) as executor:
+                    results = list(
+                        executor.map(
+                            lambda x: download_file_from_rest_api(
+                                url,
+                                os.path.join(study_path, x),
+                                timeout=60,
+                                headers=headers,
+                                parameters={"file": x},
+                                modification_time=get_remote_modified_time(
+                                    descriptors[x]
+                                ),
+                                is_zip_response=True,
+                                client=self.http_client,
+                            ),
+                            new_requested_files,
+                        )
+                    )
+            self.complete_metadata_file_downloads(
+                response,
+                study_id,
+                study_path,
+                dict(zip(new_requested_files, results, strict=True)),
+                descriptors,
+                index,
+                delete_unlisted_metadata_files=delete_unlisted_metadata_files,
             )
+        except Exception as ex:
+            logger.error("Metadata files download error %s: %s", study_id, str(ex))
+            response.code = 500
+            response.message = str(ex)
 
         return response
 
@@ -1250,56 +1648,22 @@ class MetabolightsSubmissionRepository:
 
         sub_path = "/studies/user"
         url = f"{self.rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
-        response = httpx.get(
-            url=url,
+        data, error = rest_api_get(
+            url,
             timeout=timeout,
             headers=headers,
-            params=parameters,
+            parameters=parameters,
+            client=self.http_client,
+            cache=self.http_cache,
         )
-        if response and response.status_code in (200, 201):
-            data = json.loads(response.text)
+        if data:
             studies_data = SubmittedStudiesResponse.model_validate(data)
             studies = studies_data.data.copy()
             studies.sort(key=lambda x: x.updated)
 
             return studies_data, None
         else:
-            return None, response.status_code if response else None
-
-    def get_api_token(self):
-        result = None
-        if self.credentials_file_path:
-            credentials: RestApiCredentials = get_submission_rest_api_credentials(
-                credentials_file_path=self.credentials_file_path,
-                rest_api_base_url=self.rest_api_base_url,
-            )
-            result = credentials.api_token if credentials else None
-
-        if not result:
-            return (
-                None,
-                f"There is not user api token for {self.rest_api_base_url} "
-                "Rest API. Login before to use the command.",
-            )
-        return (result, None)
-
-    def get_ftp_credentials(self):
-        result = None
-        if self.credentials_file_path:
-            credentials: FtpLoginCredentials = get_submission_private_ftp_credentials(
-                credentials_file_path=self.credentials_file_path,
-                private_ftp_url=self.ftp_server_url,
-            )
-            result = credentials if credentials else None
-
-        if not result:
-            return (
-                None,
-                None,
-                f"There is not user api token for {self.rest_api_base_url} "
-                "Rest API. Login before to use the command.",
-            )
-        return (result.user_name, result.password, None)
+            return None, error
 
     def list_study_directory(
         self,
@@ -1332,7 +1696,12 @@ class MetabolightsSubmissionRepository:
             rest_api_base_url = self.rest_api_base_url
         url = f"{rest_api_base_url.rstrip('/')}/{sub_path.lstrip('/')}"
         data, error = rest_api_get(
-            url, timeout=timeout, parameters=parameters, headers=headers
+            url,
+            timeout=timeout,
+            parameters=parameters,
+            headers=headers,
+            client=self.http_client,
+            cache=self.http_cache,
         )
         if data:
             studies_response = StudyResponse.model_validate(data)
@@ -1355,6 +1724,10 @@ class MetabolightsSubmissionRepository:
         study_id: str,
         folder_index_file_path: Union[str, None] = None,
         rebuild_folder_index_file: bool = False,
+        refresh_folder_index_file: bool = False,
+        max_folder_age_in_seconds: Union[
+            None, float
+        ] = definitions.default_ftp_folder_max_age_in_seconds,
     ) -> Tuple[Union[None, StudyFolderMetadata], List[GenericMessage]]:
         if not study_id:
             return None, [
@@ -1368,6 +1741,8 @@ class MetabolightsSubmissionRepository:
             study_id=study_id,
             folder_index_file_path=folder_index_file_path,
             rebuild_folder_index_file=rebuild_folder_index_file,
+            refresh_folder_index_file=refresh_folder_index_file,
+            max_folder_age_in_seconds=max_folder_age_in_seconds,
         )
 
         metadata, messages = collector.get_folder_metadata(study_path=None)
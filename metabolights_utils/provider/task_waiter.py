@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterable, List, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TaskWaiter:
+    """Polls status of a remote task until it is done or the deadline passes.
+
+    Poll intervals start with the initial interval and grow exponentially up to
+    the maximum interval, so short tasks are detected early and long tasks are
+    not polled too often. Each interval has random jitter, so waiters started
+    together do not poll the server at the same time.
+
+    A poll function returns a (done, result) tuple. Waiters do not open
+    connections, so poll functions should use a shared HTTP client.
+    """
+
+    def __init__(
+        self,
+        initial_interval_in_seconds: float = 1,
+        max_interval_in_seconds: float = 30,
+        deadline_in_seconds: Union[None, float] = 600,
+        backoff_factor: float = 2,
+    ) -> None:
+        self.initial_interval_in_seconds = initial_interval_in_seconds
+        self.max_interval_in_seconds = max(
+            max_interval_in_seconds, initial_interval_in_seconds
+        )
+        self.deadline_in_seconds = deadline_in_seconds
+        self.backoff_factor = backoff_factor
+
+    @classmethod
+    def from_poll_period(cls, pool_period: float, retry: int) -> "TaskWaiter":
+        """Creates a waiter with the total wait time of retry fixed poll periods."""
+        return cls(
+            initial_interval_in_seconds=min(1, pool_period),
+            max_interval_in_seconds=pool_period,
+            deadline_in_seconds=pool_period * (retry + 1),
+        )
+
+    def get_interval(self, attempt: int) -> float:
+        interval = self.initial_interval_in_seconds * (
+            self.backoff_factor ** (attempt - 1)
+        )
+        interval = min(interval, self.max_interval_in_seconds)
+        return random.uniform(interval / 2, interval)
+
+    def get_next_interval(self, attempt: int, start: float) -> Union[None, float]:
+        """Returns wait time before the next poll or None if the deadline passed."""
+        interval = self.get_interval(attempt)
+        if self.deadline_in_seconds is None:
+            return interval
+        remaining = self.deadline_in_seconds - (time.monotonic() - start)
+        if remaining <= 0:
+            return None
+        return min(interval, remaining)
+
+    def wait(self, poll: Callable[[], Tuple[bool, T]]) -> Tuple[bool, Union[None, T]]:
+        """Waits until the task is done and returns the last poll result."""
+        start = time.monotonic()
+        attempt = 0
+        result = None
+        while True:
+            attempt += 1
+            interval = self.get_next_interval(attempt, start)
+            if interval is None:
+                logger.debug(
+                    "Task is not done in %s seconds.", self.deadline_in_seconds
+                )
+                return False, result
+            time.sleep(interval)
+            done, result = poll()
+            if done:
+                return True, result
+
+    async def wait_async(
+        self, poll: Callable[[], Awaitable[Tuple[bool, T]]]
+    ) -> Tuple[bool, Union[None, T]]:
+        """Waits until the task is done without blocking the event loop."""
+        start = time.monotonic()
+        attempt = 0
+        result = None
+        while True:
+            attempt += 1
+            interval = self.get_next_interval(attempt, start)
+            if interval is None:
+                logger.debug(
+                    "Task is not done in %s seconds.", self.deadline_in_seconds
+                )
+                return False, result
+            await asyncio.sleep(interval)
+            done, result = await poll()
+            if done:
+                return True, result
+
+    async def wait_all(
+        self,
+        polls: Iterable[Callable[[], Awaitable[Tuple[bool, Any]]]],
+        max_concurrency: Union[None, int] = None,
+    ) -> List[Tuple[bool, Any]]:
+        """Waits for many tasks concurrently and returns results in poll order.
+
+        At most max_concurrency tasks are polled at the same time.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def wait_task(poll: Callable[[], Awaitable[Tuple[bool, Any]]]):
+            if not semaphore:
+                return await self.wait_async(poll)
+            async with semaphore:
+                return await self.wait_async(poll)
+
+        return list(await asyncio.gather(*[wait_task(x) for x in polls]))
@@ -1,8 +1,15 @@
-import io
+import asyncio
+import copy
+import email.utils
+import importlib.util
 import json
 import logging
 import os
+import random
 import re
+import tempfile
+import threading
+import time
 import zipfile
 from pathlib import Path
 from typing import Any, Dict, List, Set, Tuple, Union
@@ -12,6 +19,8 @@ import httpx
 from metabolights_utils.models.isa.assay_file import AssayFile
 from metabolights_utils.models.isa.common import AssayTechnique
 from metabolights_utils.models.metabolights.model import MetabolightsStudyModel
+from metabolights_utils.provider import definitions
+from metabolights_utils.provider.http_cache import HttpResponseCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +43,351 @@ def is_metadata_filename_pattern(filename: str):
     return False
 
 
+# Requests with these methods can be sent again without side effects.
+IDEMPOTENT_HTTP_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+RETRY_HTTP_STATUS_CODES = (429, 502, 503, 504)
+# The request was not sent to the server if one of these errors is raised.
+CONNECTION_HTTP_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+MAX_RETRY_AFTER_IN_SECONDS = 60
+
+
+class HttpRetryPolicy:
+    """Decides whether a request is retried and how long to wait before it.
+
+    Connection errors are retried for all requests. Read errors and
+    429, 502, 503 and 504 responses are retried only for idempotent methods
+    whose request content can be sent again (e.g. not streamed uploads).
+    Wait time grows exponentially with jitter, or it is the Retry-After value.
+    """
+
+    def __init__(
+        self,
+        max_retries: Union[None, int] = None,
+        backoff_factor: Union[None, float] = None,
+        max_backoff_in_seconds: float = 30,
+    ) -> None:
+        if max_retries is None:
+            max_retries = definitions.default_http_max_retries
+        if backoff_factor is None:
+            backoff_factor = definitions.default_http_backoff_factor
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff_in_seconds = max_backoff_in_seconds
+
+    def is_retryable_error(self, request: httpx.Request, ex: Exception) -> bool:
+        if isinstance(ex, CONNECTION_HTTP_ERRORS):
+            return True
+        return self.is_replayable(request) and isinstance(ex, httpx.TransportError)
+
+    def is_retryable_response(
+        self, request: httpx.Request, response: httpx.Response
+    ) -> bool:
+        return (
+            self.is_replayable(request)
+            and response.status_code in RETRY_HTTP_STATUS_CODES
+        )
+
+    def is_replayable(self, request: httpx.Request) -> bool:
+        return request.method in IDEMPOTENT_HTTP_METHODS and isinstance(
+            request.stream, httpx.ByteStream
+        )
+
+    def get_wait_time(
+        self, attempt: int, response: Union[None, httpx.Response] = None
+    ) -> float:
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after:
+            wait_time = get_retry_after_seconds(retry_after)
+            if wait_time is not None:
+                return min(wait_time, MAX_RETRY_AFTER_IN_SECONDS)
+        wait_time = self.backoff_factor * (2 ** (attempt - 1))
+        wait_time = min(wait_time, self.max_backoff_in_seconds)
+        return random.uniform(wait_time / 2, wait_time)
+
+
+def get_retry_after_seconds(value: str) -> Union[None, float]:
+    """Returns wait time of Retry-After header in seconds or HTTP date format."""
+    if value.strip().isdigit():
+        return float(value.strip())
+    try:
+        retry_time = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_time.timestamp() - time.time())
+
+
+class _ReleasingByteStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, release) -> None:
+        self.stream = stream
+        self.release = release
+        self.released = False
+
+    def __iter__(self):
+        yield from self.stream
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            if not self.released:
+                self.released = True
+                self.release()
+
+
+class _AsyncReleasingByteStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release) -> None:
+        self.stream = stream
+        self.release = release
+        self.released = False
+
+    async def __aiter__(self):
+        async for data in self.stream:
+            yield data
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            if not self.released:
+                self.released = True
+                self.release()
+
+
+class RetryTransport(httpx.HTTPTransport):
+    """HTTP transport with retries and a connection limit per host.
+
+    A host slot is released when the response is closed,
+    so streamed responses keep their slot until they are read.
+    """
+
+    def __init__(
+        self,
+        retry_policy: Union[None, HttpRetryPolicy] = None,
+        max_connections_per_host: Union[None, int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.retry_policy = retry_policy or HttpRetryPolicy()
+        self.max_connections_per_host = (
+            max_connections_per_host
+            or definitions.default_http_max_connections_per_host
+        )
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            slots = self._get_host_slots(request.url.host)
+            slots.acquire()
+            try:
+                response = super().handle_request(request)
+            except httpx.TransportError as ex:
+                slots.release()
+                if attempt > self.retry_policy.max_retries:
+                    raise
+                if not self.retry_policy.is_retryable_error(request, ex):
+                    raise
+                wait_time = self.retry_policy.get_wait_time(attempt)
+                logger.warning(
+                    "%s %s error: %s. Retrying in %.2f seconds...",
+                    request.method,
+                    request.url,
+                    str(ex),
+                    wait_time,
+                )
+                time.sleep(wait_time)
+                continue
+            if response.is_closed:
+                # Response content is already read.
+                slots.release()
+            else:
+                response.stream = _ReleasingByteStream(response.stream, slots.release)
+            if attempt > self.retry_policy.max_retries or (
+                not self.retry_policy.is_retryable_response(request, response)
+            ):
+                return response
+            wait_time = self.retry_policy.get_wait_time(attempt, response)
+            response.close()
+            logger.warning(
+                "%s %s response status %s. Retrying in %.2f seconds...",
+                request.method,
+                request.url,
+                response.status_code,
+                wait_time,
+            )
+            time.sleep(wait_time)
+
+    def _get_host_slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(
+                    self.max_connections_per_host
+                )
+            return self._host_slots[host]
+
+
+class AsyncRetryTransport(httpx.AsyncHTTPTransport):
+    """Async HTTP transport with retries and a connection limit per host."""
+
+    def __init__(
+        self,
+        retry_policy: Union[None, HttpRetryPolicy] = None,
+        max_connections_per_host: Union[None, int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.retry_policy = retry_policy or HttpRetryPolicy()
+        self.max_connections_per_host = (
+            max_connections_per_host
+            or definitions.default_http_max_connections_per_host
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            slots = self._get_host_slots(request.url.host)
+            await slots.acquire()
+            try:
+                response = await super().handle_async_request(request)
+            except httpx.TransportError as ex:
+                slots.release()
+                if attempt > self.retry_policy.max_retries:
+                    raise
+                if not self.retry_policy.is_retryable_error(request, ex):
+                    raise
+                wait_time = self.retry_policy.get_wait_time(attempt)
+                logger.warning(
+                    "%s %s error: %s. Retrying in %.2f seconds...",
+                    request.method,
+                    request.url,
+                    str(ex),
+                    wait_time,
+                )
+                await asyncio.sleep(wait_time)
+                continue
+            if response.is_closed:
+                # Response content is already read.
+                slots.release()
+            else:
+                response.stream = _AsyncReleasingByteStream(
+                    response.stream, slots.release
+                )
+            if attempt > self.retry_policy.max_retries or (
+                not self.retry_policy.is_retryable_response(request, response)
+            ):
+                return response
+            wait_time = self.retry_policy.get_wait_time(attempt, response)
+            await response.aclose()
+            logger.warning(
+                "%s %s response status %s. Retrying in %.2f seconds...",
+                request.method,
+                request.url,
+                response.status_code,
+                wait_time,
+            )
+            await asyncio.sleep(wait_time)
+
+    def _get_host_slots(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_slots[host]
+
+
+def is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_transport_options(
+    max_connections: Union[None, int] = None,
+    max_connections_per_host: Union[None, int] = None,
+    max_retries: Union[None, int] = None,
+    backoff_factor: Union[None, float] = None,
+    http2: Union[None, bool] = None,
+) -> Dict[str, Any]:
+    max_connections = max_connections or definitions.default_http_max_connections
+    return {
+        "retry_policy": HttpRetryPolicy(
+            max_retries=max_retries, backoff_factor=backoff_factor
+        ),
+        "max_connections_per_host": max_connections_per_host,
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+        "http2": is_http2_available() if http2 is None else http2,
+    }
+
+
+def create_http_client(
+    max_connections: Union[None, int] = None,
+    max_connections_per_host: Union[None, int] = None,
+    max_retries: Union[None, int] = None,
+    backoff_factor: Union[None, float] = None,
+    http2: Union[None, bool] = None,
+    **kwargs,
+) -> httpx.Client:
+    """Creates an HTTP client that keeps connections alive and retries failed requests.
+
+    HTTP/2 is used if the h2 package is installed and http2 is not False.
+    Other keyword arguments are passed to httpx.Client.
+    """
+    transport = RetryTransport(
+        **get_http_transport_options(
+            max_connections=max_connections,
+            max_connections_per_host=max_connections_per_host,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            http2=http2,
+        )
+    )
+    return httpx.Client(transport=transport, **kwargs)
+
+
+def create_async_http_client(
+    max_connections: Union[None, int] = None,
+    max_connections_per_host: Union[None, int] = None,
+    max_retries: Union[None, int] = None,
+    backoff_factor: Union[None, float] = None,
+    http2: Union[None, bool] = None,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """Creates an async HTTP client with the options of create_http_client."""
+    transport = AsyncRetryTransport(
+        **get_http_transport_options(
+            max_connections=max_connections,
+            max_connections_per_host=max_connections_per_host,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            http2=http2,
+        )
+    )
+    return httpx.AsyncClient(transport=transport, **kwargs)
+
+
+_http_client: Union[None, httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Returns the HTTP client shared in the process. It is created on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = create_http_client()
+        return _http_client
+
+
+def set_http_client(client: Union[None, httpx.Client]) -> None:
+    """Replaces the shared HTTP client, e.g. with a client that has custom options."""
+    global _http_client
+    with _http_client_lock:
+        _http_client = client
+
+
 def download_file_from_rest_api(
     url: str,
     local_file_path: str,
@@ -42,42 +396,96 @@ def download_file_from_rest_api(
     parameters: Union[None, Dict[str, Any]] = None,
     modification_time: Union[None, int, float] = None,
     is_zip_response: bool = False,
+    client: Union[None, httpx.Client] = None,
+    chunk_size: int = 1024 * 1024,
 ) -> Tuple[bool, str]:
+    """Streams response content to a temporary file in the target folder.
+
+    The temporary file is renamed to the local file path after the last chunk,
+    so the local file is never partially written. Files in zip responses are
+    extracted one by one from the temporary file into the target folder.
+    """
+    client = client or get_http_client()
+    temp_file_path = None
     try:
-        directory = os.path.dirname(local_file_path)
-        Path(local_file_path).parent.mkdir(parents=True, exist_ok=True)
-        data_bytes = io.BytesIO()
-
-        with httpx.stream(
-            "GET",
-            url,
-            timeout=timeout,
-            headers=headers,
-            params=parameters,
-        ) as response:
-            response.raise_for_status()
-
-            for data in response.iter_bytes():
-                data_bytes.write(data)
-
-            if is_zip_response:
-                with zipfile.ZipFile(data_bytes) as zip_file:
-                    zip_file.extractall(directory)
-            else:
-                with open(local_file_path, "wb") as f:
-                    f.write(data_bytes.read())
-
-            if modification_time:
-                if is_zip_response:
-                    for file in os.listdir(directory):
-                        file_path = os.path.join(directory, file)
-                        os.utime(file_path, (modification_time, modification_time))
-                else:
-                    os.utime(local_file_path, (modification_time, modification_time))
-            return True, None
+        file_descriptor, temp_file_path = create_download_temp_file(local_file_path)
+        with os.fdopen(file_descriptor, "wb") as f:
+            with client.stream(
+                "GET",
+                url,
+                timeout=timeout,
+                headers=headers,
+                params=parameters,
+            ) as response:
+                response.raise_for_status()
+                for data in response.iter_bytes(chunk_size=chunk_size):
+                    f.write(data)
+        complete_download(
+            temp_file_path,
+            local_file_path,
+            modification_time=modification_time,
+            is_zip_response=is_zip_response,
+        )
+        return True, None
     except Exception as ex:
         logger.exception(str(ex))
         return False, str(ex)
+    finally:
+        remove_download_temp_file(temp_file_path)
+
+
+def create_download_temp_file(local_file_path: str) -> Tuple[int, str]:
+    """Creates a temporary file in the folder of the local file path.
+
+    Returns file descriptor and path of the temporary file.
+    """
+    Path(local_file_path).parent.mkdir(parents=True, exist_ok=True)
+    return tempfile.mkstemp(
+        dir=os.path.dirname(local_file_path) or None, prefix=".", suffix=".part"
+    )
+
+
+def complete_download(
+    temp_file_path: str,
+    local_file_path: str,
+    modification_time: Union[None, int, float] = None,
+    is_zip_response: bool = False,
+) -> List[str]:
+    """Renames or extracts a downloaded temporary file. Returns local file paths."""
+    if is_zip_response:
+        file_paths = extract_zip_file(temp_file_path, os.path.dirname(local_file_path))
+    else:
+        os.replace(temp_file_path, local_file_path)
+        file_paths = [local_file_path]
+    if modification_time:
+        for file_path in file_paths:
+            os.utime(file_path, (modification_time, modification_time))
+    return file_paths
+
+
+def remove_download_temp_file(temp_file_path: Union[None, str]) -> None:
+    if temp_file_path and os.path.exists(temp_file_path):
+        os.remove(temp_file_path)
+
+
+def extract_zip_file(zip_file_path: str, target_path: str) -> List[str]:
+    """Extracts files in a zip file one by one and returns the extracted file paths.
+
+    Each file is written to a temporary file and renamed after extraction.
+    """
+    file_paths = []
+    with zipfile.ZipFile(zip_file_path) as zip_file:
+        for member in zip_file.infolist():
+            if member.is_dir():
+                continue
+            # Extract to a temporary name. The name is checked against path traversal.
+            temp_member = copy.copy(member)
+            temp_member.filename = f"{member.filename}.part"
+            temp_file_path = zip_file.extract(temp_member, target_path or None)
+            file_path = temp_file_path[: -len(".part")]
+            os.replace(temp_file_path, file_path)
+            file_paths.append(file_path)
+    return file_paths
 
 
 def rest_api_get(
@@ -85,14 +493,27 @@ def rest_api_get(
     timeout: Union[None, int] = None,
     headers: Union[None, Dict[str, Any]] = None,
     parameters: Union[None, Dict[str, Any]] = None,
+    client: Union[None, httpx.Client] = None,
+    cache: Union[None, HttpResponseCache] = None,
 ):
+    client = client or get_http_client()
     try:
-        response = httpx.get(
-            url=url,
-            timeout=timeout,
-            headers=headers,
-            params=parameters,
-        )
+        if cache:
+            response = cache.send(
+                client,
+                "GET",
+                url,
+                timeout=timeout,
+                headers=headers,
+                parameters=parameters,
+            )
+        else:
+            response = client.get(
+                url=url,
+                timeout=timeout,
+                headers=headers,
+                params=parameters,
+            )
         if response and response.status_code in (200, 201):
             data = json.loads(response.text)
             return data, None
@@ -107,11 +528,112 @@ def rest_api_post(
     headers: Union[None, Dict[str, Any]] = None,
     parameters: Union[None, Dict[str, Any]] = None,
     json_body: Union[None, Dict[str, Any]] = None,
+    client: Union[None, httpx.Client] = None,
+    cache: Union[None, HttpResponseCache] = None,
 ):
+    client = client or get_http_client()
+    try:
+        if cache:
+            response = cache.send(
+                client,
+                "POST",
+                url,
+                timeout=timeout,
+                headers=headers,
+                parameters=parameters,
+                json_body=json_body,
+            )
+        else:
+            response = client.post(
+                url=url,
+                timeout=timeout,
+                headers=headers,
+                params=parameters,
+                json=json_body,
+            )
+        if response and response.status_code in (200, 201):
+            data = json.loads(response.text)
+            return data, None
+        return None, response.text
+    except Exception as ex:
+        return None, str(ex)
+
+
+async def async_download_file_from_rest_api(
+    url: str,
+    local_file_path: str,
+    client: httpx.AsyncClient,
+    timeout: Union[None, int] = None,
+    headers: Union[None, Dict[str, Any]] = None,
+    parameters: Union[None, Dict[str, Any]] = None,
+    modification_time: Union[None, int, float] = None,
+    is_zip_response: bool = False,
+    chunk_size: int = 1024 * 1024,
+) -> Tuple[bool, str]:
+    """Async version of download_file_from_rest_api.
+
+    File system operations, including writes of received chunks and zip
+    extraction, run in worker threads, so the event loop is not blocked.
+    """
+    temp_file_path = None
     try:
-        response = httpx.post(
-            url=url, timeout=timeout, headers=headers, params=parameters, json=json_body
+        file_descriptor, temp_file_path = await asyncio.to_thread(
+            create_download_temp_file, local_file_path
+        )
+        f = os.fdopen(file_descriptor, "wb")
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                timeout=timeout,
+                headers=headers,
+                params=parameters,
+            ) as response:
+                response.raise_for_status()
+                async for data in response.aiter_bytes(chunk_size=chunk_size):
+                    await asyncio.to_thread(f.write, data)
+        finally:
+            await asyncio.to_thread(f.close)
+        await asyncio.to_thread(
+            complete_download,
+            temp_file_path,
+            local_file_path,
+            modification_time=modification_time,
+            is_zip_response=is_zip_response,
         )
+        return True, None
+    except Exception as ex:
+        logger.exception(str(ex))
+        return False, str(ex)
+    finally:
+        await asyncio.to_thread(remove_download_temp_file, temp_file_path)
+
+
+async def async_rest_api_get(
+    url: str,
+    client: httpx.AsyncClient,
+    timeout: Union[None, int] = None,
+    headers: Union[None, Dict[str, Any]] = None,
+    parameters: Union[None, Dict[str, Any]] = None,
+    cache: Union[None, HttpResponseCache] = None,
+):
+    try:
+        if cache:
+            response = await cache.send_async(
+                client,
+                "GET",
+                url,
+                timeout=timeout,
+                headers=headers,
+                parameters=parameters,
+            )
+        else:
+            response = await client.get(
+                url=url,
+                timeout=timeout,
+                headers=headers,
+                params=parameters,
+            )
         if response and response.status_code in (200, 201):
             data = json.loads(response.text)
             return data, None
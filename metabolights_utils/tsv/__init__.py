@@ -1,3 +1,19 @@
-from metabolights_utils.tsv import actions, filter, model, sort, tsv_file_updater
+from metabolights_utils.tsv import (
+    actions,
+    filter,
+    journal,
+    model,
+    sort,
+    tsv_file_updater,
+    tsv_update_service,
+)
 
-__all__ = ["actions", "filter", "model", "sort", "tsv_file_updater"]
+__all__ = [
+    "actions",
+    "filter",
+    "journal",
+    "model",
+    "sort",
+    "tsv_file_updater",
+    "tsv_update_service",
+]
@@ -2,6 +2,9 @@ from metabolights_utils.tsv.actions import (
     add_column,
     add_row,
     base,
+    bulk_add_row,
+    bulk_update_cell,
+    bulk_update_column,
     copy_column,
     copy_row,
     delete_column,
@@ -18,6 +21,9 @@ __all__ = [
     "add_column",
     "add_row",
     "base",
+    "bulk_add_row",
+    "bulk_update_cell",
+    "bulk_update_column",
     "copy_column",
     "copy_row",
     "delete_column",
@@ -34,8 +34,8 @@ class AddRowsTsvAction(BaseTsvAction):
 
         row_data: Dict[int, TsvRowData] = action.row_data if action.row_data else {}
 
-        row_indices = target_row_indices.copy()
-        row_indices.sort()
+        # sorted new row indices are consumed as a cursor while streaming
+        row_indices = sorted(target_row_indices, reverse=True)
 
         if not action.id:
             uuid_value = str(uuid.uuid4().hex)
@@ -47,46 +47,34 @@ class AddRowsTsvAction(BaseTsvAction):
                 header_names = header_line.strip("\n").split("\t")
                 empty_row = [""] * len(header_names)
 
+                def write_new_rows(row_index: int) -> int:
+                    while row_indices and row_indices[-1] == row_index:
+                        row_indices.pop()
+                        input_row = row_data.get(row_index)
+                        if not input_row:
+                            self.write_row(target, empty_row)
+                        else:
+                            new_row = self.get_updated_row(empty_row, input_row)
+                            self.write_row(target, new_row)
+                        row_index += 1
+                    return row_index
+
                 with target_file_path.open("w", encoding=write_encoding) as target:
                     self.write_row(target, header_names)
-                    row_index = -1
+                    row_index = 0
                     for line in source:
-                        row_index += 1
-                        if row_index in row_indices:
-                            while row_index in row_indices:
-                                input_row = (
-                                    row_data[row_index]
-                                    if row_index in row_data
-                                    else None
-                                )
-                                if not input_row:
-                                    self.write_row(target, empty_row)
-                                else:
-                                    new_row = self.get_updated_row(empty_row, input_row)
-                                    self.write_row(target, new_row)
-                                row_indices.remove(row_index)
-                                row_index += 1
+                        if row_indices:
+                            row_index = write_new_rows(row_index)
                         target.write(line)
-
-                    if len(row_indices):
                         row_index += 1
-                        while row_index in row_indices:
-                            input_row = (
-                                row_data[row_index] if row_index in row_data else None
-                            )
-                            if not input_row:
-                                self.write_row(target, empty_row)
-                            else:
-                                new_row = self.get_updated_row(empty_row, input_row)
-                                self.write_row(target, new_row)
-                            row_indices.remove(row_index)
-                            row_index += 1
+                    write_new_rows(row_index)
 
-                        if len(row_indices):
-                            result.message = (
-                                f"Invalid row indices {', '.join(row_indices)}"
-                            )
-                            return result
+                    if len(row_indices):
+                        invalid_indices = [str(x) for x in reversed(row_indices)]
+                        result.message = (
+                            f"Invalid row indices {', '.join(invalid_indices)}"
+                        )
+                        return result
             result.success = True
         except Exception as exc:
             result.message = f"{str(exc)}"
@@ -2,7 +2,7 @@ import pathlib
 import shutil
 from abc import ABC, abstractmethod
 from io import IOBase
-from typing import List
+from typing import Dict, List
 
 from metabolights_utils.tsv import model as actions
 
@@ -33,14 +33,33 @@ class BaseTsvAction(ABC):
                 file.unlink()
 
     def get_updated_row(self, empty_row, input_row: actions.TsvRowData):
-        column_indices = range(len(empty_row))
-        data_values = input_row.values
+        new_row = list(empty_row)
+        column_count = len(new_row)
+        for column_index, value in input_row.values.items():
+            if 0 <= column_index < column_count:
+                new_row[column_index] = value
+        return new_row
 
-        def merge_method(x):
-            return data_values[x] if data_values and x in data_values else empty_row[x]
-
-        map_result = map(merge_method, column_indices)
-        return list(map_result)
+    def get_column_indices(
+        self, header_names: List[str], column_names: List[str]
+    ) -> Dict[str, int]:
+        header_indices: Dict[str, int] = {}
+        duplicates = set()
+        for idx, header in enumerate(header_names):
+            if header in header_indices:
+                duplicates.add(header)
+            header_indices[header] = idx
+        not_found = [x for x in column_names if x not in header_indices]
+        if not_found:
+            raise TsvActionException(
+                message=f"Columns are not found: {', '.join(not_found)}"
+            )
+        ambiguous = [x for x in column_names if x in duplicates]
+        if ambiguous:
+            raise TsvActionException(
+                message=f"Column headers are not unique: {', '.join(ambiguous)}"
+            )
+        return {x: header_indices[x] for x in column_names}
 
     def write_row(self, file_buffer: IOBase, row: List[str]):
         new_row_string = "\t".join(row) + "\n"
@@ -0,0 +1,99 @@
+import pathlib
+import uuid
+from typing import Dict, List
+
+from metabolights_utils.tsv import model as actions
+from metabolights_utils.tsv.actions.base import BaseTsvAction, TsvActionException
+
+
+class BulkAddRowsTsvAction(BaseTsvAction):
+    def apply_action(
+        self,
+        source_file_path: pathlib.Path,
+        target_file_path: pathlib.Path,
+        action: actions.TsvBulkAddRowsAction,
+        read_encoding: str = "utf-8",
+        write_encoding: str = "utf-8",
+    ) -> actions.TsvActionResult:
+        result: actions.TsvActionResult = actions.TsvActionResult(action=action)
+        if action.action_type != actions.TsvActionType.BULK_ADD_ROW:
+            result.message = "Action name is not valid"
+            return result
+
+        action: actions.TsvBulkAddRowsAction = action
+        new_row_indices: List[int] = action.new_row_indices
+        if not new_row_indices:
+            result.message = "There is not row index"
+            return result
+        if (
+            len(set(new_row_indices)) != len(new_row_indices)
+            or min(new_row_indices) < 0
+        ):
+            result.message = "New row indices should be unique and positive"
+            return result
+
+        columns: Dict[str, List[str]] = action.columns if action.columns else {}
+        invalid_columns = [
+            x for x in columns if len(columns[x]) != len(new_row_indices)
+        ]
+        if invalid_columns:
+            result.message = (
+                "Column values and new row indices should have the same length: "
+                + f"{', '.join(invalid_columns)}"
+            )
+            return result
+
+        # sorted (new row index, input position) pairs are consumed as a cursor
+        targets = sorted(
+            zip(new_row_indices, range(len(new_row_indices))), reverse=True
+        )
+
+        if not action.id:
+            uuid_value = str(uuid.uuid4().hex)
+            action.id = uuid_value
+
+        try:
+            with source_file_path.open("r", encoding=read_encoding) as source:
+                header_line = source.readline()
+                header_names = header_line.strip("\n").split("\t")
+                column_indices = self.get_column_indices(
+                    header_names, list(columns.keys())
+                )
+                updates = [(column_indices[x], columns[x]) for x in columns]
+                empty_row = [""] * len(header_names)
+
+                def write_new_rows(row_index: int) -> int:
+                    while targets and targets[-1][0] == row_index:
+                        position = targets.pop()[1]
+                        new_row = empty_row.copy()
+                        for column_idx, values in updates:
+                            new_row[column_idx] = values[position]
+                        self.write_row(target, new_row)
+                        row_index += 1
+                    return row_index
+
+                with target_file_path.open("w", encoding=write_encoding) as target:
+                    target.write(header_line)
+                    row_index = 0
+                    line = header_line
+                    for line in source:
+                        if targets:
+                            row_index = write_new_rows(row_index)
+                        target.write(line)
+                        row_index += 1
+                    if targets and not line.endswith("\n"):
+                        target.write("\n")
+                    write_new_rows(row_index)
+
+                    if targets:
+                        raise TsvActionException(
+                            message="Invalid row indices: "
+                            + f"{', '.join([str(x[0]) for x in reversed(targets)])}"
+                        )
+            result.success = True
+        except TsvActionException as exc:
+            result.message = exc.message
+        except Exception as exc:
+            result.message = f"{str(exc)}"
+
+        return result
@@ -0,0 +1,87 @@
+import pathlib
+import uuid
+from typing import Dict, List, Tuple
+
+from metabolights_utils.tsv import model as actions
+from metabolights_utils.tsv.actions.base import BaseTsvAction, TsvActionException
+
+
+class BulkUpdateCellsTsvAction(BaseTsvAction):
+    def apply_action(
+        self,
+        source_file_path: pathlib.Path,
+        target_file_path: pathlib.Path,
+        action: actions.TsvBulkUpdateCellsAction,
+        read_encoding: str = "utf-8",
+        write_encoding: str = "utf-8",
+    ) -> actions.TsvActionResult:
+        result: actions.TsvActionResult = actions.TsvActionResult(action=action)
+        if action.action_type != actions.TsvActionType.BULK_UPDATE_CELL_DATA:
+            result.message = "Action name is not valid"
+            return result
+
+        action: actions.TsvBulkUpdateCellsAction = action
+        row_indices = action.row_indices
+        column_indices = action.column_indices
+        values = action.values
+        if not values:
+            result.message = "There is no cell"
+            return result
+        if len(row_indices) != len(values) or len(column_indices) != len(values):
+            result.message = (
+                "Row indices, column indices and values should have the same length"
+            )
+            return result
+        if min(row_indices) < 0:
+            result.message = "Row indices should be positive"
+            return result
+
+        row_data: Dict[int, List[Tuple[int, str]]] = {}
+        for row_idx, col_idx, value in zip(row_indices, column_indices, values):
+            if row_idx not in row_data:
+                row_data[row_idx] = []
+            row_data[row_idx].append((col_idx, value))
+
+        if not action.id:
+            uuid_value = str(uuid.uuid4().hex)
+            action.id = uuid_value
+
+        try:
+            with source_file_path.open("r", encoding=read_encoding) as source:
+                header_line = source.readline()
+                header_names = header_line.strip("\n").split("\t")
+                if min(column_indices) < 0 or max(column_indices) >= len(header_names):
+                    invalid_column_indices = {
+                        x for x in column_indices if x < 0 or x >= len(header_names)
+                    }
+                    raise TsvActionException(
+                        message="Invalid column indices: "
+                        + f"{', '.join([str(x) for x in sorted(invalid_column_indices)])}"
+                    )
+
+                with target_file_path.open("w", encoding=write_encoding) as target:
+                    target.write(header_line)
+                    row_index = -1
+                    for line in source:
+                        row_index += 1
+                        updates = row_data.pop(row_index, None)
+                        if not updates:
+                            target.write(line)
+                            continue
+                        row = line.strip("\n").split("\t")
+                        for column_idx, value in updates:
+                            row[column_idx] = value
+                        self.write_row(target, row)
+
+                    if row_data:
+                        raise TsvActionException(
+                            message="Invalid row indices: "
+                            + f"{', '.join([str(x) for x in sorted(row_data)])}"
+                        )
+            result.success = True
+        except TsvActionException as exc:
+            result.message = exc.message
+        except Exception as exc:
+            result.message = f"{str(exc)}"
+
+        return result
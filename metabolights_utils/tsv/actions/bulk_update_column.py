@@ -0,0 +1,81 @@
+import pathlib
+import uuid
+from typing import Dict, List
+
+from metabolights_utils.tsv import model as actions
+from metabolights_utils.tsv.actions.base import BaseTsvAction, TsvActionException
+
+
+class BulkUpdateColumnsTsvAction(BaseTsvAction):
+    def apply_action(
+        self,
+        source_file_path: pathlib.Path,
+        target_file_path: pathlib.Path,
+        action: actions.TsvBulkUpdateColumnsAction,
+        read_encoding: str = "utf-8",
+        write_encoding: str = "utf-8",
+    ) -> actions.TsvActionResult:
+        result: actions.TsvActionResult = actions.TsvActionResult(action=action)
+        if action.action_type != actions.TsvActionType.BULK_UPDATE_COLUMN_DATA:
+            result.message = "Action name is not valid"
+            return result
+
+        action: actions.TsvBulkUpdateColumnsAction = action
+        columns: Dict[str, List[str]] = action.columns if action.columns else {}
+        if not columns:
+            result.message = "There is no column data"
+            return result
+
+        value_counts = {len(x) for x in columns.values()}
+        if len(value_counts) != 1:
+            result.message = "All columns should have the same number of values"
+            return result
+        value_count = value_counts.pop()
+        row_indices = action.row_indices or list(range(value_count))
+        if len(row_indices) != value_count:
+            result.message = "Row indices and column values should have the same length"
+            return result
+        if len(set(row_indices)) != len(row_indices) or min(row_indices) < 0:
+            result.message = "Row indices should be unique and positive"
+            return result
+        row_positions: Dict[int, int] = {x: idx for idx, x in enumerate(row_indices)}
+
+        if not action.id:
+            uuid_value = str(uuid.uuid4().hex)
+            action.id = uuid_value
+
+        try:
+            with source_file_path.open("r", encoding=read_encoding) as source:
+                header_line = source.readline()
+                header_names = header_line.strip("\n").split("\t")
+                column_indices = self.get_column_indices(
+                    header_names, list(columns.keys())
+                )
+                updates = [(column_indices[x], columns[x]) for x in columns]
+
+                with target_file_path.open("w", encoding=write_encoding) as target:
+                    target.write(header_line)
+                    row_index = -1
+                    for line in source:
+                        row_index += 1
+                        position = row_positions.pop(row_index, None)
+                        if position is None:
+                            target.write(line)
+                            continue
+                        row = line.strip("\n").split("\t")
+                        for column_idx, values in updates:
+                            row[column_idx] = values[position]
+                        self.write_row(target, row)
+
+                    if row_positions:
+                        raise TsvActionException(
+                            message="Invalid row indices: "
+                            + f"{', '.join([str(x) for x in sorted(row_positions)])}"
+                        )
+            result.success = True
+        except TsvActionException as exc:
+            result.message = exc.message
+        except Exception as exc:
+            result.message = f"{str(exc)}"
+
+        return result
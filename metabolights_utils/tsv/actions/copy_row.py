@@ -29,12 +29,11 @@ class CopyRowTsvAction(BaseTsvAction):
 
         source_index = action.source_row_index
 
-        if not source_index or source_index < 0:
+        if source_index is None or source_index < 0:
             result.message = "There is not row index"
             return result
 
-        row_indices = target_row_indices.copy()
-        row_indices.sort()
+        row_indices = set(target_row_indices)
 
         if not action.id:
             uuid_value = str(uuid.uuid4().hex)
@@ -50,7 +49,7 @@ class CopyRowTsvAction(BaseTsvAction):
                     copied_row = line.strip("\n").split("\t")
                     break
                 row_index += 1
-        if not copied_row:
+        if copied_row is None:
             result.message = "Row will be copied is not found"
             return result
 
@@ -69,15 +68,16 @@ class CopyRowTsvAction(BaseTsvAction):
                                 new_row = line.strip("\n").split("\t")
                                 for index in selected_column_indices:
                                     new_row[index] = copied_row[index]
-                                    self.write_row(target, new_row)
-                            row_indices.remove(row_index)
+                                self.write_row(target, new_row)
+                            row_indices.discard(row_index)
                         else:
                             target.write(line)
                         row_index += 1
 
                     if len(row_indices):
+                        invalid_indices = [str(x) for x in sorted(row_indices)]
                         result.message = (
-                            f"Invalid target row indices {', '.join(row_indices)}"
+                            f"Invalid target row indices {', '.join(invalid_indices)}"
                         )
                         return result
             result.success = True
@@ -27,8 +27,7 @@ class DeleteRowsTsvAction(BaseTsvAction):
             result.message = "There is not row index"
             return result
 
-        row_indices = target_row_indices.copy()
-        row_indices.sort()
+        row_indices = set(target_row_indices)
 
         if not action.id:
             uuid_value = str(uuid.uuid4().hex)
@@ -45,13 +44,16 @@ class DeleteRowsTsvAction(BaseTsvAction):
                     for line in source:
                         row_index += 1
                         if row_index in row_indices:
-                            row_indices.remove(row_index)
+                            row_indices.discard(row_index)
                             continue
                         else:
                             target.write(line)
 
                     if len(row_indices):
-                        result.message = f"Invalid row indices {', '.join(row_indices)}"
+                        invalid_indices = [str(x) for x in sorted(row_indices)]
+                        result.message = (
+                            f"Invalid row indices {', '.join(invalid_indices)}"
+                        )
                         return result
             result.success = True
         except Exception as exc:
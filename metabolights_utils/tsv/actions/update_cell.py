@@ -53,9 +53,7 @@ class UpdateCellsTsvAction(BaseTsvAction):
                     x for x in column_indices if x < 0 or x > len(header_names)
                 ]
                 if invalid_column_indices:
-                    result.message = (
-                        f"Invalid column indices: {', '.join(invalid_column_indices)}"
-                    )
+                    result.message = f"Invalid column indices: {', '.join([str(x) for x in invalid_column_indices])}"
                     return result
 
                 with target_file_path.open("w", encoding=write_encoding) as target:
@@ -73,9 +71,7 @@ class UpdateCellsTsvAction(BaseTsvAction):
                         self.write_row(target, row)
                         row_index += 1
                     if row_indices:
-                        result.message = (
-                            f"Invalid row indices: {', '.join(row_indices)}"
-                        )
+                        result.message = f"Invalid row indices: {', '.join([str(x) for x in sorted(row_indices)])}"
                         return result
             result.success = True
         except Exception as exc:
@@ -27,8 +27,7 @@ class UpdateRowsTsvAction(BaseTsvAction):
             result.message = "There is not row data"
             return result
 
-        row_indices = list(row_data.keys())
-        row_indices.sort()
+        row_indices = set(row_data.keys())
 
         if not action.id:
             uuid_value = str(uuid.uuid4().hex)
@@ -49,12 +48,12 @@ class UpdateRowsTsvAction(BaseTsvAction):
                             input_row = row_data[row_index]
                             new_row = self.get_updated_row(empty_row, input_row)
                             self.write_row(target, new_row)
-                            row_indices.remove(row_index)
+                            row_indices.discard(row_index)
                         else:
                             target.write(line)
 
                     if len(row_indices):
-                        result.message = f"Invalid row indices {', '.join([str(x) for x in row_indices])}"
+                        result.message = f"Invalid row indices {', '.join([str(x) for x in sorted(row_indices)])}"
                         return result
             result.success = True
         except Exception as exc:
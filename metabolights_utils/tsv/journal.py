@@ -0,0 +1,268 @@
+import datetime
+import difflib
+import hashlib
+import itertools
+import pathlib
+import uuid
+from typing import Iterable, List, Tuple, Union
+
+from metabolights_utils.tsv.model import TsvAction, TsvDeltaHunk, TsvJournalEntry
+from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
+
+
+class TsvJournalException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+
+class TsvDeltaJournal:
+    """Stores applied tsv actions and their inverse row and cell deltas.
+
+    Each file has a JSON Lines journal file on the journal root path. Journal
+    file names contain a hash of the resolved file path, so files with the same
+    name in different folders (e.g. i_Investigation.txt of different studies)
+    have different journals.
+    Previous versions of a file are reconstructed by applying inverse deltas
+    of the journal entries to the current file content, from latest to oldest.
+    """
+
+    def __init__(self, journal_root_path: Union[str, pathlib.Path]) -> None:
+        self.journal_root_path = pathlib.Path(journal_root_path)
+
+    def get_journal_file_path(
+        self, file_path: Union[str, pathlib.Path]
+    ) -> pathlib.Path:
+        file = pathlib.Path(file_path).resolve()
+        path_hash = hashlib.sha256(str(file).encode("utf-8")).hexdigest()[:16]
+        return self.journal_root_path / pathlib.Path(
+            f"{file.name}.{path_hash}.journal.jsonl"
+        )
+
+    def add_entry(
+        self,
+        previous_file_path: Union[str, pathlib.Path],
+        updated_file_path: Union[str, pathlib.Path],
+        actions: List[TsvAction],
+        previous_sha256_hash: str,
+        sha256_hash: str,
+        file_name: Union[None, str] = None,
+        encoding: str = "utf-8",
+    ) -> TsvJournalEntry:
+        previous_file = pathlib.Path(previous_file_path)
+        entry = TsvJournalEntry(
+            id=str(uuid.uuid4().hex),
+            created_at=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            file_name=file_name or previous_file.name,
+            previous_sha256_hash=previous_sha256_hash,
+            sha256_hash=sha256_hash,
+            actions=[x.model_dump(by_alias=True, mode="json") for x in actions],
+            hunks=self.get_inverse_deltas(
+                previous_file, pathlib.Path(updated_file_path), encoding=encoding
+            ),
+        )
+        journal_file_path = self.get_journal_file_path(previous_file)
+        journal_file_path.parent.mkdir(parents=True, exist_ok=True)
+        with journal_file_path.open("a", encoding="utf-8") as journal:
+            journal.write(entry.model_dump_json(by_alias=True) + "\n")
+        return entry
+
+    def get_entries(self, file_path: Union[str, pathlib.Path]) -> List[TsvJournalEntry]:
+        journal_file_path = self.get_journal_file_path(file_path)
+        if not journal_file_path.exists():
+            return []
+        with journal_file_path.open("r", encoding="utf-8") as journal:
+            return [
+                TsvJournalEntry.model_validate_json(x) for x in journal if x.strip()
+            ]
+
+    def reconstruct(
+        self,
+        file_path: Union[str, pathlib.Path],
+        sha256_hash: str,
+        target_path: Union[str, pathlib.Path],
+        encoding: str = "utf-8",
+    ) -> TsvJournalEntry:
+        """Writes the version of the file with the given SHA256 hash value to target path.
+
+        Args:
+            file_path (Union[str, pathlib.Path]): Current file path.
+            sha256_hash (str): SHA256 hash value of the requested version.
+            target_path (Union[str, pathlib.Path]): Output file path.
+            encoding (str, optional): File encoding. Defaults to "utf-8".
+
+        Raises:
+            TsvJournalException: the journal does not match the current file,
+            the requested version is not in the journal or the reconstructed
+            content does not have the requested SHA256 hash value.
+
+        Returns:
+            TsvJournalEntry: The journal entry that created the next version
+            of the requested one.
+        """
+        file = pathlib.Path(file_path)
+        entries = self.get_entries(file)
+        current_sha256 = HashUtils.sha256sum(file, convert_to_linux_line_ending=True)
+        if not entries or entries[-1].sha256_hash != current_sha256:
+            raise TsvJournalException(
+                message=f"Journal of '{file.name}' does not match the current file."
+            )
+        if sha256_hash not in {x.previous_sha256_hash for x in entries}:
+            raise TsvJournalException(
+                message=f"Version {sha256_hash} is not in the journal of '{file.name}'."
+            )
+        with file.open("r", encoding=encoding) as f:
+            lines = f.readlines()
+        for entry in reversed(entries):
+            self.apply_inverse_deltas(lines, entry.hunks)
+            if entry.previous_sha256_hash == sha256_hash:
+                self._write_version(lines, sha256_hash, target_path, encoding)
+                return entry
+
+    def _write_version(
+        self,
+        lines: List[str],
+        sha256_hash: str,
+        target_path: Union[str, pathlib.Path],
+        encoding: str,
+    ) -> None:
+        target = pathlib.Path(target_path)
+        temp_file = target.parent / pathlib.Path(f".{target.name}_{uuid.uuid4().hex}")
+        try:
+            with temp_file.open("w", encoding=encoding, newline="") as f:
+                f.writelines(lines)
+            reconstructed_sha256 = HashUtils.sha256sum(
+                temp_file, convert_to_linux_line_ending=True
+            )
+            if reconstructed_sha256 != sha256_hash:
+                raise TsvJournalException(
+                    message=f"Reconstructed version of '{target.name}' has SHA256 "
+                    f"{reconstructed_sha256}, expected {sha256_hash}."
+                )
+            temp_file.replace(target)
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+
+    def undo(
+        self, file_path: Union[str, pathlib.Path], encoding: str = "utf-8"
+    ) -> TsvJournalEntry:
+        """Restores the previous version of the file and removes the last entry."""
+        file = pathlib.Path(file_path)
+        entries = self.get_entries(file)
+        if not entries:
+            raise TsvJournalException(message=f"Journal of '{file.name}' is empty.")
+        last_entry = entries[-1]
+        temp_file = file.parent / pathlib.Path(f".{file.name}_{last_entry.id}_undo")
+        try:
+            self.reconstruct(
+                file, last_entry.previous_sha256_hash, temp_file, encoding=encoding
+            )
+            temp_file.replace(file)
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+        journal_file_path = self.get_journal_file_path(file)
+        with journal_file_path.open("w", encoding="utf-8") as journal:
+            for entry in entries[:-1]:
+                journal.write(entry.model_dump_json(by_alias=True) + "\n")
+        return last_entry
+
+    def get_inverse_deltas(
+        self,
+        previous_file_path: pathlib.Path,
+        updated_file_path: pathlib.Path,
+        encoding: str = "utf-8",
+    ) -> List[TsvDeltaHunk]:
+        hunks: List[TsvDeltaHunk] = []
+        with previous_file_path.open("r", encoding=encoding) as previous:
+            with updated_file_path.open("r", encoding=encoding) as updated:
+                pairs = itertools.zip_longest(previous, updated)
+                for line_index, (previous_line, updated_line) in enumerate(pairs):
+                    if previous_line is None or updated_line is None:
+                        break
+                    if previous_line != updated_line:
+                        self._add_changed_lines(
+                            hunks, line_index, [previous_line], [updated_line]
+                        )
+                else:
+                    return hunks
+
+        # Rows are added or deleted. Find changed blocks on the whole content.
+        hunks = []
+        with previous_file_path.open("r", encoding=encoding) as previous:
+            previous_lines = previous.readlines()
+        with updated_file_path.open("r", encoding=encoding) as updated:
+            updated_lines = updated.readlines()
+        matcher = difflib.SequenceMatcher(None, previous_lines, updated_lines)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            if tag == "replace" and i2 - i1 == j2 - j1:
+                self._add_changed_lines(
+                    hunks, j1, previous_lines[i1:i2], updated_lines[j1:j2]
+                )
+            else:
+                hunks.append(
+                    TsvDeltaHunk(start=j1, end=j2, lines=previous_lines[i1:i2])
+                )
+        return hunks
+
+    def apply_inverse_deltas(self, lines: List[str], hunks: List[TsvDeltaHunk]):
+        for hunk in sorted(hunks, key=lambda x: x.start, reverse=True):
+            if not hunk.cells:
+                lines[hunk.start : hunk.end] = hunk.lines
+                continue
+            for line_index, cells in hunk.cells.items():
+                line = lines[line_index]
+                line_ending = line[len(line.rstrip("\n")) :]
+                row = line.rstrip("\n").split("\t")
+                for column_index, value in cells.items():
+                    row[column_index] = value
+                lines[line_index] = "\t".join(row) + line_ending
+
+    def _add_changed_lines(
+        self,
+        hunks: List[TsvDeltaHunk],
+        start: int,
+        previous_lines: Iterable[str],
+        updated_lines: Iterable[str],
+    ):
+        for offset, (previous_line, updated_line) in enumerate(
+            zip(previous_lines, updated_lines)
+        ):
+            line_index = start + offset
+            cells = self._get_changed_cells(previous_line, updated_line)
+            last = hunks[-1] if hunks else None
+            if last and last.end == line_index and bool(last.cells) == bool(cells):
+                last.end += 1
+                if cells:
+                    last.cells[line_index] = cells
+                else:
+                    last.lines.append(previous_line)
+            elif cells:
+                hunks.append(
+                    TsvDeltaHunk(
+                        start=line_index, end=line_index + 1, cells={line_index: cells}
+                    )
+                )
+            else:
+                hunks.append(
+                    TsvDeltaHunk(
+                        start=line_index, end=line_index + 1, lines=[previous_line]
+                    )
+                )
+
+    def _get_changed_cells(self, previous_line: str, updated_line: str):
+        previous_row, previous_ending = self._split_line(previous_line)
+        updated_row, updated_ending = self._split_line(updated_line)
+        if previous_ending != updated_ending or len(previous_row) != len(updated_row):
+            return {}
+        return {
+            idx: value
+            for idx, (value, updated_value) in enumerate(zip(previous_row, updated_row))
+            if value != updated_value
+        }
+
+    def _split_line(self, line: str) -> Tuple[List[str], str]:
+        content = line.rstrip("\n")
+        return content.split("\t"), line[len(content) :]
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Union
 
 from pydantic import Field
 from typing_extensions import Annotated
@@ -41,6 +41,9 @@ class TsvActionType(str, Enum):
     COPY_COLUMN = "copy-column"
     UPDATE_COLUMN_HEADER = "update-column-name"
     UPDATE_CELL_DATA = "update-cell-data"
+    BULK_ADD_ROW = "bulk-add-row"
+    BULK_UPDATE_COLUMN_DATA = "bulk-update-column-data"
+    BULK_UPDATE_CELL_DATA = "bulk-update-cell-data"
 
 
 class TsvAction(CamelCaseModel):
@@ -195,6 +198,50 @@ class TsvUpdateColumnHeaderAction(TsvAction):
     ] = {}
 
 
+class TsvBulkAddRowsAction(TsvAction):
+    action_type: TsvActionType = TsvActionType.BULK_ADD_ROW
+    new_row_indices: Annotated[
+        List[int], Field(description="Position (index) of new rows.")
+    ] = []
+    columns: Annotated[
+        Dict[str, List[str]],
+        Field(
+            description="Column header names and cell values of the new rows. "
+            "Values are in the same order as new row indices. "
+            "Cells of missing columns will be filled with empty string.",
+        ),
+    ] = {}
+
+
+class TsvBulkUpdateColumnsAction(TsvAction):
+    action_type: TsvActionType = TsvActionType.BULK_UPDATE_COLUMN_DATA
+    row_indices: Annotated[
+        List[int],
+        Field(
+            description="Row indices of the updated values. "
+            "Set empty list to update rows starting from the first row.",
+        ),
+    ] = []
+    columns: Annotated[
+        Dict[str, List[str]],
+        Field(
+            description="Column header names and updated cell values. "
+            "Values are in the same order as row indices.",
+        ),
+    ] = {}
+
+
+class TsvBulkUpdateCellsAction(TsvAction):
+    action_type: TsvActionType = TsvActionType.BULK_UPDATE_CELL_DATA
+    row_indices: Annotated[
+        List[int], Field(description="Row indices of the updated cells.")
+    ] = []
+    column_indices: Annotated[
+        List[int], Field(description="Column indices of the updated cells.")
+    ] = []
+    values: Annotated[List[str], Field(description="Updated cell values.")] = []
+
+
 class TsvActionResult(CamelCaseModel):
     action: Annotated[TsvAction, Field(description="Applied action details.")] = (
         TsvAction()
@@ -217,3 +264,46 @@ class TsvActionReport(CamelCaseModel):
     updated_file_sha256_hash: Annotated[
         str, Field(description="Last SHA256 hash value of the updated file.")
     ] = ""
+
+
+class TsvDeltaHunk(CamelCaseModel):
+    start: Annotated[
+        int,
+        Field(description="First line index (header is 0) in the updated file."),
+    ] = 0
+    end: Annotated[
+        int, Field(description="Last line index (exclusive) in the updated file.")
+    ] = 0
+    lines: Annotated[
+        List[str],
+        Field(
+            description="Previous lines that replace the updated lines between "
+            "start and end. It is used if there is no cell data.",
+        ),
+    ] = []
+    cells: Annotated[
+        Dict[int, Dict[int, str]],
+        Field(
+            description="Line indices, column indices and previous cell values. "
+            "Only changed cells are stored if column count of a line is not changed.",
+        ),
+    ] = {}
+
+
+class TsvJournalEntry(CamelCaseModel):
+    id: Annotated[str, Field(description="Id of the journal entry.")] = ""
+    created_at: Annotated[
+        str, Field(description="Creation time of the journal entry.")
+    ] = ""
+    file_name: Annotated[str, Field(description="Name of the updated file.")] = ""
+    previous_sha256_hash: Annotated[
+        str, Field(description="SHA256 hash value of the file before update.")
+    ] = ""
+    sha256_hash: Annotated[
+        str, Field(description="SHA256 hash value of the file after update.")
+    ] = ""
+    actions: Annotated[List[Dict[str, Any]], Field(description="Applied actions.")] = []
+    hunks: Annotated[
+        List[TsvDeltaHunk],
+        Field(description="Inverse deltas to restore the previous file content."),
+    ] = []
@@ -1,4 +1,5 @@
 import datetime
+import os
 import pathlib
 import shutil
 import uuid
@@ -7,6 +8,11 @@ from typing import Dict, List, Union
 from metabolights_utils.tsv.actions.add_column import AddColumnsTsvAction
 from metabolights_utils.tsv.actions.add_row import AddRowsTsvAction
 from metabolights_utils.tsv.actions.base import BaseTsvAction, TsvActionException
+from metabolights_utils.tsv.actions.bulk_add_row import BulkAddRowsTsvAction
+from metabolights_utils.tsv.actions.bulk_update_cell import BulkUpdateCellsTsvAction
+from metabolights_utils.tsv.actions.bulk_update_column import (
+    BulkUpdateColumnsTsvAction,
+)
 from metabolights_utils.tsv.actions.copy_column import CopyColumnTsvAction
 from metabolights_utils.tsv.actions.copy_row import CopyRowTsvAction
 from metabolights_utils.tsv.actions.delete_column import DeleteColumnsTsvAction
@@ -19,6 +25,7 @@ from metabolights_utils.tsv.actions.update_column_header import (
     UpdateColumnHeadersTsvAction,
 )
 from metabolights_utils.tsv.actions.update_row import UpdateRowsTsvAction
+from metabolights_utils.tsv.journal import TsvDeltaJournal
 from metabolights_utils.tsv.model import (
     TsvAction,
     TsvActionReport,
@@ -26,6 +33,7 @@ from metabolights_utils.tsv.model import (
     TsvActionType,
 )
 from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
+from metabolights_utils.utils.lock_utils import FileLock, FileLockException
 
 TSV_FILE_ACTIONS: Dict[TsvActionType, BaseTsvAction] = {}
 TSV_FILE_ACTIONS[TsvActionType.ADD_ROW] = AddRowsTsvAction()
@@ -40,6 +48,9 @@ TSV_FILE_ACTIONS[TsvActionType.UPDATE_COLUMN_DATA] = UpdateColumnsTsvAction()
 TSV_FILE_ACTIONS[TsvActionType.MOVE_COLUMN] = MoveColumnTsvAction()
 TSV_FILE_ACTIONS[TsvActionType.UPDATE_COLUMN_HEADER] = UpdateColumnHeadersTsvAction()
 TSV_FILE_ACTIONS[TsvActionType.UPDATE_CELL_DATA] = UpdateCellsTsvAction()
+TSV_FILE_ACTIONS[TsvActionType.BULK_ADD_ROW] = BulkAddRowsTsvAction()
+TSV_FILE_ACTIONS[TsvActionType.BULK_UPDATE_COLUMN_DATA] = BulkUpdateColumnsTsvAction()
+TSV_FILE_ACTIONS[TsvActionType.BULK_UPDATE_CELL_DATA] = BulkUpdateCellsTsvAction()
 
 
 class TsvFileUpdater:
@@ -51,6 +62,8 @@ class TsvFileUpdater:
         read_encoding: str = "utf-8",
         write_encoding: str = "utf-8",
         temp_path: str = "/tmp/mtb-utils-temp",
+        journal: Union[None, TsvDeltaJournal] = None,
+        lock_timeout: Union[None, float] = 60,
     ) -> TsvActionReport:
         report: TsvActionReport = TsvActionReport()
         if not file_path:
@@ -74,6 +87,47 @@ class TsvFileUpdater:
                 f"File '{str(file)}' does not exist or it is not a regular file."
             )
             return report
+        for action in actions:
+            if action.action_type not in TSV_FILE_ACTIONS:
+                report.message = f"Unsupported action: {action.action_type}."
+                return report
+
+        temp_root_path = (
+            pathlib.Path(temp_path.rstrip("/"))
+            if temp_path
+            else pathlib.Path("/tmp/mtb-utils-temp")
+        )
+        # Hash check and file replacement are in the same critical section.
+        file_lock = FileLock(
+            file, lock_folder_path=temp_root_path / "locks", timeout=lock_timeout
+        )
+        try:
+            with file_lock:
+                return self._apply_actions(
+                    file=file,
+                    file_sha256_hash=file_sha256_hash,
+                    actions=actions,
+                    read_encoding=read_encoding,
+                    write_encoding=write_encoding,
+                    temp_root_path=temp_root_path,
+                    journal=journal,
+                    report=report,
+                )
+        except FileLockException as exc:
+            report.message = exc.message
+            return report
+
+    def _apply_actions(
+        self,
+        file: pathlib.Path,
+        file_sha256_hash: str,
+        actions: List[TsvAction],
+        read_encoding: str,
+        write_encoding: str,
+        temp_root_path: pathlib.Path,
+        journal: Union[None, TsvDeltaJournal],
+        report: TsvActionReport,
+    ) -> TsvActionReport:
         sha256 = HashUtils.sha256sum(file, convert_to_linux_line_ending=True)
 
         if sha256 != file_sha256_hash:
@@ -81,17 +135,11 @@ class TsvFileUpdater:
             return report
 
         task_id = str(uuid.uuid4().hex)
-        temp_root_path = (
-            pathlib.Path(temp_path.rstrip("/"))
-            if temp_path
-            else pathlib.Path("/tmp/mtb-utils-temp")
-        )
         timestamp = str(int(datetime.datetime.now(datetime.timezone.utc).timestamp()))
         temp_folder = temp_root_path / pathlib.Path(
             f"isa_table_actions/{timestamp}/{task_id}"
         )
         temp_folder.mkdir(parents=True, exist_ok=True)
-        file_copy_path = temp_folder / pathlib.Path(f"{file.name}_{task_id}")
         temp_source_file_path = temp_folder / pathlib.Path(
             f".{file.name}_{task_id}_temp_1"
         )
@@ -99,15 +147,11 @@ class TsvFileUpdater:
             f".{file.name}_{task_id}_temp_2"
         )
 
-        source_path = file_copy_path
+        # The original file is read in place and replaced only after success.
+        source_path = file
         target_path = temp_target_file_path
         last_file = None
         try:
-            for action in actions:
-                if action.action_type not in TSV_FILE_ACTIONS:
-                    report.message = "Unsupported action: action.action_type."
-                    return report
-            shutil.move(file, file_copy_path)
             for action in actions:
                 helper = TSV_FILE_ACTIONS[action.action_type]
                 result: TsvActionResult = helper.apply_action(
@@ -130,6 +174,15 @@ class TsvFileUpdater:
                     raise TsvActionException(message=result.message)
             new_sha256 = HashUtils.sha256sum(last_file)
             report.updated_file_sha256_hash = new_sha256
+            if journal:
+                journal.add_entry(
+                    file,
+                    last_file,
+                    actions,
+                    previous_sha256_hash=sha256,
+                    sha256_hash=new_sha256,
+                    encoding=write_encoding,
+                )
             report.success = True
         except TsvActionException as exc:
             report.message = exc.message
@@ -137,8 +190,9 @@ class TsvFileUpdater:
             report.message = str(exc)
         finally:
             if report.success and last_file:
-                shutil.move(last_file, file)
-            else:
-                shutil.move(file_copy_path, file)
+                # move to the same folder first to replace the file atomically
+                replacement = file.parent / pathlib.Path(f".{file.name}_{task_id}")
+                shutil.move(last_file, replacement)
+                os.replace(replacement, file)
             shutil.rmtree(temp_folder)
         return report
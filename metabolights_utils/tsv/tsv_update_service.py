@@ -0,0 +1,190 @@
+import logging
+import pathlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Union
+
+from metabolights_utils.tsv.journal import TsvDeltaJournal
+from metabolights_utils.tsv.model import TsvAction, TsvActionReport, TsvActionType
+from metabolights_utils.tsv.tsv_file_updater import TsvFileUpdater
+
+logger = logging.getLogger(__name__)
+
+# Actions that do not add, delete or move rows and columns. Batches with only
+# these actions keep the row and column indices of each other.
+MERGEABLE_ACTION_TYPES = {
+    TsvActionType.NO_ACTION,
+    TsvActionType.UPDATE_ROW_DATA,
+    TsvActionType.UPDATE_COLUMN_DATA,
+    TsvActionType.UPDATE_COLUMN_HEADER,
+    TsvActionType.UPDATE_CELL_DATA,
+    TsvActionType.BULK_UPDATE_COLUMN_DATA,
+    TsvActionType.BULK_UPDATE_CELL_DATA,
+}
+
+
+class _TsvActionBatch:
+    def __init__(
+        self,
+        file_sha256_hash: str,
+        actions: List[TsvAction],
+        read_encoding: str,
+        write_encoding: str,
+    ) -> None:
+        self.file_sha256_hash = file_sha256_hash
+        self.actions = actions
+        self.read_encoding = read_encoding
+        self.write_encoding = write_encoding
+        self.future: Future = Future()
+
+    def is_mergeable(self) -> bool:
+        return all(x.action_type in MERGEABLE_ACTION_TYPES for x in self.actions)
+
+
+class TsvFileUpdateService:
+    """Applies tsv action batches with one writer per file.
+
+    Batches submitted for the same file are queued. While a file is updated,
+    new batches are collected and the consecutive batches prepared for the same
+    file version (same SHA256 hash and encodings) are applied in one rewrite,
+    in submission order, if they only update data of existing rows and columns.
+    A batch that adds, deletes or moves rows or columns is applied alone,
+    so the first batch for a file version wins and the next batches for that
+    version get the SHA256 mismatch result of TsvFileUpdater. Batches are never
+    moved to a newer file version. If a merged rewrite fails, each batch is
+    applied separately against its own file version.
+
+    Each rewrite uses TsvFileUpdater, so updates are also serialised
+    across processes with the file lock on the temp path.
+    """
+
+    def __init__(
+        self,
+        updater: Union[None, TsvFileUpdater] = None,
+        max_workers: int = 4,
+        temp_path: str = "/tmp/mtb-utils-temp",
+        lock_timeout: Union[None, float] = 60,
+        journal: Union[None, TsvDeltaJournal] = None,
+    ) -> None:
+        self.updater = updater or TsvFileUpdater()
+        self.temp_path = temp_path
+        self.lock_timeout = lock_timeout
+        self.journal = journal
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._queues: Dict[str, List[_TsvActionBatch]] = {}
+        self._queue_lock = threading.Lock()
+
+    def submit(
+        self,
+        file_path: Union[str, pathlib.Path],
+        file_sha256_hash: str,
+        actions: List[TsvAction],
+        read_encoding: str = "utf-8",
+        write_encoding: str = "utf-8",
+    ) -> "Future[TsvActionReport]":
+        key = str(pathlib.Path(file_path).resolve())
+        batch = _TsvActionBatch(
+            file_sha256_hash, list(actions), read_encoding, write_encoding
+        )
+        with self._queue_lock:
+            if key in self._queues:
+                self._queues[key].append(batch)
+            else:
+                self._queues[key] = [batch]
+                self._executor.submit(self._process_queue, key)
+        return batch.future
+
+    def apply_actions(
+        self,
+        file_path: Union[str, pathlib.Path],
+        file_sha256_hash: str,
+        actions: List[TsvAction],
+        read_encoding: str = "utf-8",
+        write_encoding: str = "utf-8",
+    ) -> TsvActionReport:
+        return self.submit(
+            file_path,
+            file_sha256_hash,
+            actions,
+            read_encoding=read_encoding,
+            write_encoding=write_encoding,
+        ).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> "TsvFileUpdateService":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def _process_queue(self, key: str) -> None:
+        while True:
+            with self._queue_lock:
+                batches = self._queues[key]
+                if not batches:
+                    del self._queues[key]
+                    return
+                self._queues[key] = []
+            groups: List[List[_TsvActionBatch]] = []
+            for batch in batches:
+                last = groups[-1][0] if groups else None
+                if (
+                    last
+                    and last.file_sha256_hash == batch.file_sha256_hash
+                    and last.read_encoding == batch.read_encoding
+                    and last.write_encoding == batch.write_encoding
+                    and last.is_mergeable()
+                    and batch.is_mergeable()
+                ):
+                    groups[-1].append(batch)
+                else:
+                    groups.append([batch])
+            for group in groups:
+                try:
+                    self._apply_group(key, group)
+                except Exception as exc:
+                    logger.exception("Tsv update failed for %s", key)
+                    for batch in group:
+                        if not batch.future.done():
+                            batch.future.set_exception(exc)
+
+    def _apply_group(self, key: str, group: List[_TsvActionBatch]) -> None:
+        """Applies batches prepared for the same file version."""
+        if len(group) > 1:
+            logger.debug("%s action batches are merged for %s", len(group), key)
+            report = self._apply(key, group[0], [x for b in group for x in b.actions])
+            if report.success:
+                start = 0
+                for batch in group:
+                    end = start + len(batch.actions)
+                    batch.future.set_result(
+                        TsvActionReport(
+                            results=report.results[start:end],
+                            success=True,
+                            message=report.message,
+                            updated_file_sha256_hash=report.updated_file_sha256_hash,
+                        )
+                    )
+                    start = end
+                return
+        for batch in group:
+            batch.future.set_result(self._apply(key, batch, batch.actions))
+
+    def _apply(
+        self,
+        key: str,
+        batch: _TsvActionBatch,
+        actions: List[TsvAction],
+    ) -> TsvActionReport:
+        return self.updater.apply_actions(
+            file_path=key,
+            file_sha256_hash=batch.file_sha256_hash,
+            actions=actions,
+            read_encoding=batch.read_encoding,
+            write_encoding=batch.write_encoding,
+            temp_path=self.temp_path,
+            journal=self.journal,
+            lock_timeout=self.lock_timeout,
+        )
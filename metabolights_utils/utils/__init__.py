@@ -2,6 +2,7 @@ from metabolights_utils.utils import (
     audit_utils,
     filename_utils,
     hash_utils,
+    lock_utils,
     search_utils,
 )
 
@@ -9,5 +10,6 @@ __all__ = [
     "audit_utils",
     "filename_utils",
     "hash_utils",
+    "lock_utils",
     "search_utils",
 ]
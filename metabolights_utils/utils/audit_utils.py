@@ -1,5 +1,6 @@
 import datetime
 import logging
+import os
 import shutil
 from pathlib import Path
 from typing import Union
@@ -18,6 +19,7 @@ class MetabolightsAuditUtils:
         folder_suffix: Union[None, str] = "BACKUP",
         folder_prefix: Union[None, str] = None,
         timestamp_format: str = "%Y-%m-%d_%H-%M-%S",
+        link_unchanged_files: bool = False,
     ) -> Union[None, str]:
         if not timestamp_format or not src_root_path or not target_root_path:
             logger.error("Invalid input parameter.")
@@ -27,14 +29,44 @@ class MetabolightsAuditUtils:
         folder_name = f"{folder_prefix}_{folder_name}" if folder_prefix else folder_name
         logger.info("Audit folder name: %s", folder_name)
         target_folder_path = join_path(target_root_path, folder_name)
+        previous_folder_path = None
+        if link_unchanged_files:
+            previous_folder_path = MetabolightsAuditUtils.find_last_audit_folder(
+                target_root_path,
+                folder_suffix=folder_suffix,
+                folder_prefix=folder_prefix,
+            )
         return MetabolightsAuditUtils.copy_isa_metadata_files(
             src_folder_path=src_root_path,
             target_folder_path=target_folder_path,
+            previous_folder_path=previous_folder_path,
         )
 
+    @staticmethod
+    def find_last_audit_folder(
+        target_root_path: str,
+        folder_suffix: Union[None, str] = "BACKUP",
+        folder_prefix: Union[None, str] = None,
+    ) -> Union[None, str]:
+        root = Path(target_root_path)
+        if not root.is_dir():
+            return None
+        folders = [
+            x.name
+            for x in root.iterdir()
+            if x.is_dir()
+            and (not folder_suffix or x.name.endswith(f"_{folder_suffix}"))
+            and (not folder_prefix or x.name.startswith(f"{folder_prefix}_"))
+        ]
+        if not folders:
+            return None
+        return join_path(target_root_path, max(folders))
+
     @staticmethod
     def copy_isa_metadata_files(
-        src_folder_path: str, target_folder_path: str
+        src_folder_path: str,
+        target_folder_path: str,
+        previous_folder_path: Union[None, str] = None,
     ) -> Union[None, str]:
         source = Path(src_folder_path)
         target = Path(target_folder_path)
@@ -52,6 +84,10 @@ class MetabolightsAuditUtils:
             for file in metadata_files_list:
                 basename = Path(file).name
                 target_file = join_path(target_folder_path, basename)
+                if previous_folder_path and MetabolightsAuditUtils.link_unchanged_file(
+                    file, join_path(previous_folder_path, basename), target_file
+                ):
+                    continue
                 shutil.copy2(file, target_file, follow_symlinks=False)
             logger.info(
                 "Metadata files are copied from %s to %s",
@@ -61,3 +97,25 @@ class MetabolightsAuditUtils:
             return target_folder_path
         logger.warning("There is no metadata file on %s", src_folder_path)
         return None
+
+    @staticmethod
+    def link_unchanged_file(
+        src_file_path: str, previous_file_path: str, target_file_path: str
+    ) -> bool:
+        """Creates a hard link to the previous audit copy if the file is unchanged."""
+        previous_file = Path(previous_file_path)
+        if not previous_file.is_file() or previous_file.is_symlink():
+            return False
+        src_stat = Path(src_file_path).stat()
+        previous_stat = previous_file.stat()
+        if (
+            src_stat.st_size != previous_stat.st_size
+            or src_stat.st_mtime_ns != previous_stat.st_mtime_ns
+        ):
+            return False
+        try:
+            os.link(previous_file, target_file_path)
+        except OSError as ex:
+            logger.debug("Hard link is not created for %s: %s", target_file_path, ex)
+            return False
+        return True
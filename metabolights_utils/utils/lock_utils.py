@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class FileLockException(Exception):
+    def __init__(self, message: str = "") -> None:
+        self.message = message
+
+
+class FileLock:
+    """Advisory exclusive lock for a file path.
+
+    The lock is held on a separate lock file, so the locked file can be
+    replaced while the lock is active. All processes that update the same
+    file should use the same lock folder.
+    """
+
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        lock_folder_path: Union[str, Path],
+        timeout: Union[None, float] = 60,
+        poll_interval: float = 0.05,
+    ) -> None:
+        real_path = str(Path(file_path).resolve())
+        lock_name = hashlib.sha256(real_path.encode("utf-8")).hexdigest()
+        self.file_path = real_path
+        self.lock_file_path = Path(lock_folder_path) / Path(f"{lock_name}.lock")
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self) -> None:
+        self.lock_file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_file_path, os.O_RDWR | os.O_CREAT, 0o644)
+        start = time.monotonic()
+        while True:
+            try:
+                self._lock(fd)
+                self._fd = fd
+                logger.debug("Lock is acquired for %s", self.file_path)
+                return
+            except OSError:
+                if self.timeout is not None and (
+                    time.monotonic() - start >= self.timeout
+                ):
+                    os.close(fd)
+                    raise FileLockException(
+                        message=f"Timeout while waiting lock for {self.file_path}"
+                    )
+                time.sleep(self.poll_interval)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            self._unlock(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+            logger.debug("Lock is released for %s", self.file_path)
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def _lock(self, fd: int) -> None:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(self, fd: int) -> None:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:  # pragma: no cover
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
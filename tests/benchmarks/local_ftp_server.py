@@ -0,0 +1,170 @@
+import errno
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from pydantic import BaseModel
+from pyftpdlib.authorizers import DummyAuthorizer
+from pyftpdlib.filesystems import AbstractedFS
+from pyftpdlib.handlers import FTPHandler
+from pyftpdlib.servers import ThreadedFTPServer
+
+FTP_USERNAME = "user"
+FTP_PASSWORD = "pass"
+FTP_ROOT_DIRECTORY = "/pub/databases/metabolights/studies/public"
+
+
+class StudyTreeShape(BaseModel):
+    """Shape of a synthetic study folder.
+
+    Each folder in FILES has folders_per_level sub folders until folder_depth
+    and files_per_folder small files. Large files are sparse files in FILES.
+    """
+
+    folder_depth: int = 2
+    folders_per_level: int = 2
+    files_per_folder: int = 10
+    small_file_size_in_bytes: int = 1024
+    large_files: int = 0
+    large_file_size_in_bytes: int = 64 * 1024 * 1024
+
+
+class StudyTreeSummary(BaseModel):
+    folders: int = 0
+    files: int = 0
+    total_bytes: int = 0
+
+
+class ThreadSafeFilesystem(AbstractedFS):
+    """Changes FTP folder without changing the working directory of the process."""
+
+    def chdir(self, path):
+        if not os.path.isdir(path):
+            raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        if not os.access(path, os.X_OK):
+            raise OSError(errno.EACCES, os.strerror(errno.EACCES), path)
+        self.cwd = self.fs2ftp(path)
+
+
+class LatencyFtpHandler(FTPHandler):
+    latency_in_seconds: float = 0
+    commands: Counter = Counter()
+    logins: Counter = Counter()
+    lock = threading.Lock()
+
+    def on_login(self, username):
+        with self.lock:
+            self.logins[username] += 1
+
+    def pre_process_command(self, line, cmd, arg):
+        with self.lock:
+            self.commands[cmd] += 1
+        # Each connection has a server thread, so the delay is per connection.
+        if self.latency_in_seconds > 0:
+            time.sleep(self.latency_in_seconds)
+        return super().pre_process_command(line, cmd, arg)
+
+
+class LocalFtpServer:
+    """Serves a local folder with an in-process FTP server on a free port.
+
+    Anonymous users have read access. FTP_USERNAME has write access.
+    Each command is delayed latency_in_seconds to simulate a remote server.
+    """
+
+    def __init__(self, root_path: str, latency_in_seconds: float = 0) -> None:
+        self.root_path = root_path
+        authorizer = DummyAuthorizer()
+        authorizer.add_anonymous(root_path, perm="elr")
+        authorizer.add_user(FTP_USERNAME, FTP_PASSWORD, root_path, perm="elradfmwMT")
+        self.handler = type(
+            "LocalFtpHandler",
+            (LatencyFtpHandler,),
+            {
+                "authorizer": authorizer,
+                "latency_in_seconds": latency_in_seconds,
+                "commands": Counter(),
+                "logins": Counter(),
+                "lock": threading.Lock(),
+                "timeout": 60,
+                "abstracted_fs": ThreadSafeFilesystem,
+            },
+        )
+        self.server = ThreadedFTPServer(("127.0.0.1", 0), self.handler)
+        self.server.max_cons = 256
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"timeout": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"127.0.0.1:{self.server.address[1]}"
+
+    @property
+    def commands(self) -> Counter:
+        return self.handler.commands
+
+    @property
+    def logins(self) -> int:
+        return sum(self.handler.logins.values())
+
+    def set_latency(self, latency_in_seconds: float) -> None:
+        self.handler.latency_in_seconds = latency_in_seconds
+
+    def reset_counters(self) -> None:
+        with self.handler.lock:
+            self.handler.commands.clear()
+            self.handler.logins.clear()
+
+    def start(self) -> "LocalFtpServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.close_all()
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalFtpServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+
+def create_study_tree(
+    root_path: str, study_id: str, shape: StudyTreeShape
+) -> StudyTreeSummary:
+    """Creates a study folder with ISA metadata files and data files in FILES."""
+    summary = StudyTreeSummary()
+    study_path = Path(root_path) / Path(FTP_ROOT_DIRECTORY.strip("/")) / study_id
+    study_path.mkdir(parents=True, exist_ok=True)
+    for filename in (
+        "i_Investigation.txt",
+        f"s_{study_id}.txt",
+        f"a_{study_id}_assay.txt",
+        f"m_{study_id}_maf.tsv",
+    ):
+        (study_path / filename).write_text("Sample Name\n")
+
+    folders = [(study_path / "FILES", 0)]
+    while folders:
+        folder, depth = folders.pop()
+        folder.mkdir(exist_ok=True)
+        summary.folders += 1
+        for index in range(shape.files_per_folder):
+            data = os.urandom(shape.small_file_size_in_bytes)
+            (folder / f"data_{index:04d}.txt").write_bytes(data)
+            summary.files += 1
+            summary.total_bytes += shape.small_file_size_in_bytes
+        if depth < shape.folder_depth:
+            for index in range(shape.folders_per_level):
+                folders.append((folder / f"folder_{depth + 1}_{index}", depth + 1))
+
+    for index in range(shape.large_files):
+        with (study_path / "FILES" / f"large_{index}.raw").open("wb") as f:
+            f.truncate(shape.large_file_size_in_bytes)
+        summary.files += 1
+        summary.total_bytes += shape.large_file_size_in_bytes
+    return summary
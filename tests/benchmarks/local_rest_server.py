@@ -0,0 +1,290 @@
+import datetime
+import email.parser
+import email.policy
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import BaseModel
+
+from metabolights_utils.commands.submission.model import (
+    LoginCredentials,
+    RestApiCredentials,
+)
+
+API_TOKEN = "benchmark-token"
+JWT_TOKEN = "benchmark-jwt"
+
+
+class RestServerConfig(BaseModel):
+    """Latency and payload sizes of the local MetaboLights REST API server.
+
+    Each request is delayed latency_in_seconds to simulate a remote server.
+    Validation tasks are ready after validation_polls_until_ready status checks.
+    """
+
+    latency_in_seconds: float = 0
+    search_total: int = 1000
+    search_record_size_in_bytes: int = 1024
+    metadata_file_size_in_bytes: int = 4096
+    validation_polls_until_ready: int = 3
+
+
+class LocalRestRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "LocalRestHttpServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.state.count("connection")
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def dispatch(self, method: str):
+        state = self.server.state
+        url = urlsplit(self.path)
+        parameters = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if state.config.latency_in_seconds > 0:
+            time.sleep(state.config.latency_in_seconds)
+        for route_method, pattern, name in ROUTES:
+            match = re.fullmatch(pattern, url.path)
+            if route_method == method and match:
+                state.count(name)
+                handler = getattr(state, name)
+                status, headers, content = handler(
+                    *match.groups(), parameters=parameters, body=body, request=self
+                )
+                return self.send(status, headers, content)
+        self.send(404, {}, b"not found")
+
+    def send(self, status: int, headers: Dict[str, str], content: bytes):
+        etag = headers.get("ETag")
+        if status == 200 and etag and self.headers.get("If-None-Match") == etag:
+            self.server.state.count("not_modified")
+            status, content = 304, b""
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def json_response(data: Any, etag: bool = False) -> Tuple[int, Dict[str, str], bytes]:
+    content = json.dumps(data).encode()
+    headers = {"Content-Type": "application/json"}
+    if etag:
+        headers["ETag"] = f'"{hashlib.sha256(content).hexdigest()}"'
+    return 200, headers, content
+
+
+class LocalRestServerState:
+    """Study files, validation tasks and request counters of the server."""
+
+    def __init__(self, config: RestServerConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.files: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
+        self.validation_polls: Counter = Counter()
+        self.upload_count = 0
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.requests[name] += 1
+
+    def add_metadata_files(self, study_id: str, count: int) -> List[str]:
+        size = self.config.metadata_file_size_in_bytes
+        names = ["i_Investigation.txt"] + [
+            f"m_{study_id}_{x:03d}_maf.tsv" for x in range(count - 1)
+        ]
+        with self.lock:
+            files = self.files.setdefault(study_id, {})
+            for name in names:
+                files[name] = (name.encode().ljust(size, b"."), "2020-01-01 00:00:00")
+        return names
+
+    def list_files(self, study_id: str, **kwargs):
+        with self.lock:
+            files = dict(self.files.get(study_id, {}))
+        study = [
+            {"file": name, "createdAt": created_at, "directory": False}
+            for name, (_, created_at) in sorted(files.items())
+        ]
+        return json_response({"study": study, "uploadPath": study_id}, etag=True)
+
+    def list_studies(self, **kwargs):
+        with self.lock:
+            study_ids = sorted(self.files)
+        data = [
+            {"accession": x, "status": "Provisional", "updated": "2020-01-01"}
+            for x in study_ids
+        ]
+        return json_response({"data": data}, etag=True)
+
+    def upload_file(self, study_id: str, body: bytes, request, **kwargs):
+        content_type = request.headers["Content-Type"]
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        with self.lock:
+            files = self.files.setdefault(study_id, {})
+            for part in message.iter_parts():
+                self.upload_count += 1
+                created_at = datetime.datetime.fromtimestamp(
+                    2000000000 + self.upload_count
+                ).strftime("%Y-%m-%d %H:%M:%S")
+                files[part.get_filename()] = (
+                    part.get_payload(decode=True),
+                    created_at,
+                )
+        return json_response({})
+
+    def download_file(self, study_id: str, parameters: Dict[str, str], **kwargs):
+        filename = parameters.get("file", "")
+        with self.lock:
+            item = self.files.get(study_id, {}).get(filename)
+        if not item:
+            return 404, {}, b"not found"
+        content = io.BytesIO()
+        with zipfile.ZipFile(content, "w") as zip_file:
+            zip_file.writestr(filename, item[0])
+        return 200, {"Content-Type": "application/zip"}, content.getvalue()
+
+    def login(self, **kwargs):
+        status, headers, content = json_response({})
+        headers["jwt"] = JWT_TOKEN
+        return status, headers, content
+
+    def start_validation(self, study_id: str, **kwargs):
+        task = {"taskId": f"task-{study_id}", "ready": False}
+        return json_response({"status": "success", "content": {"task": task}})
+
+    def get_validation_status(self, study_id: str, task_id: str, **kwargs):
+        with self.lock:
+            self.validation_polls[study_id] += 1
+            polls = self.validation_polls[study_id]
+        task = {"taskId": task_id, "ready": False}
+        if polls >= self.config.validation_polls_until_ready:
+            task.update(ready=True, isSuccessful=True)
+        content = {"task": task, "taskResult": {"violations": [], "summary": []}}
+        return json_response({"status": "success", "content": content})
+
+    def search(self, parameters: Dict[str, str], **kwargs):
+        skip = int(parameters.get("skip", 0))
+        limit = int(parameters.get("limit", 10))
+        total = self.config.search_total
+        description = "x" * self.config.search_record_size_in_bytes
+        page = [
+            {"studyId": f"MTBLS{x}", "title": f"Study {x}", "description": description}
+            for x in range(skip, min(skip + limit, total))
+        ]
+        content = {"page": page, "total": total, "pageSize": len(page)}
+        return json_response({"status": "success", "content": content}, etag=True)
+
+
+ROUTES = [
+    ("GET", r"/ws/studies/([^/]+)/files/tree", "list_files"),
+    ("GET", r"/ws/studies/user", "list_studies"),
+    ("POST", r"/ws/studies/([^/]+)/drag-drop-upload", "upload_file"),
+    ("GET", r"/ws/studies/([^/]+)/download", "download_file"),
+    ("POST", r"/ws/auth/login-with-token", "login"),
+    ("POST", r"/ws3/submissions/v2/validations/([^/]+)", "start_validation"),
+    (
+        "GET",
+        r"/ws3/submissions/v2/validations/([^/]+)/([^/]+)",
+        "get_validation_status",
+    ),
+    ("POST", r"/ws3/public/search/studies/_search", "search"),
+]
+
+
+class LocalRestHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+    state: LocalRestServerState
+
+
+class LocalRestServer:
+    """Serves the MetaboLights REST API endpoints used by the library on a free port.
+
+    Submission endpoints are under /ws and validation and search endpoints are
+    under /ws3, as on the public servers. Files and tasks are kept in memory.
+    """
+
+    def __init__(self, config: Union[None, RestServerConfig] = None) -> None:
+        self.state = LocalRestServerState(config or RestServerConfig())
+        self.server = LocalRestHttpServer(("127.0.0.1", 0), LocalRestRequestHandler)
+        self.server.state = self.state
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def rest_api_base_url(self) -> str:
+        return f"{self.url}/ws"
+
+    @property
+    def validation_api_base_url(self) -> str:
+        return f"{self.url}/ws3"
+
+    @property
+    def requests(self) -> Counter:
+        return self.state.requests
+
+    def set_latency(self, latency_in_seconds: float) -> None:
+        self.state.config.latency_in_seconds = latency_in_seconds
+
+    def reset_counters(self) -> None:
+        with self.state.lock:
+            self.state.requests.clear()
+            self.state.validation_polls.clear()
+
+    def create_credentials_file(self, file_path: str) -> str:
+        """Creates a credentials file with the API token of the server."""
+        credentials = LoginCredentials(
+            rest_api_credentials={
+                self.rest_api_base_url: RestApiCredentials(api_token=API_TOKEN)
+            }
+        )
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(file_path).write_text(credentials.model_dump_json(by_alias=True))
+        return file_path
+
+    def start(self) -> "LocalRestServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "LocalRestServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
@@ -0,0 +1,216 @@
+import logging
+import time
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import pytest
+
+pytest.importorskip("pyftpdlib")
+
+from metabolights_utils.provider.ftp.default_ftp_client import (  # noqa: E402
+    DefaultFtpClient,
+)
+from metabolights_utils.provider.ftp.folder_metadata_collector import (  # noqa: E402
+    FtpFolderMetadataCollector,
+)
+from metabolights_utils.provider.ftp_repository import (  # noqa: E402
+    MetabolightsFtpRepository,
+)
+from tests.benchmarks.local_ftp_server import (  # noqa: E402
+    FTP_ROOT_DIRECTORY,
+    LocalFtpServer,
+    StudyTreeShape,
+    StudyTreeSummary,
+    create_study_tree,
+)
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+STUDY_ID = "MTBLS1000001"
+SHAPE = StudyTreeShape(
+    folder_depth=3,
+    folders_per_level=2,
+    files_per_folder=10,
+    small_file_size_in_bytes=4096,
+    large_files=2,
+    large_file_size_in_bytes=32 * 1024 * 1024,
+)
+LARGE_FILES = {f"{STUDY_ID}/FILES/large_{x}.raw" for x in range(SHAPE.large_files)}
+# Delay of each FTP command. Parallel transfers should hide it.
+LATENCY_IN_SECONDS = 0.005
+MAX_CONNECTIONS = 4
+
+
+@pytest.fixture(scope="module")
+def ftp_server(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Iterator[Tuple[LocalFtpServer, StudyTreeSummary]]:
+    root_path = str(tmp_path_factory.mktemp("ftp_server"))
+    summary = create_study_tree(root_path, STUDY_ID, SHAPE)
+    with LocalFtpServer(root_path) as server:
+        yield server, summary
+
+
+@pytest.fixture(scope="function")
+def slow_ftp_server(
+    ftp_server: Tuple[LocalFtpServer, StudyTreeSummary],
+) -> Iterator[Tuple[LocalFtpServer, StudyTreeSummary]]:
+    server, summary = ftp_server
+    server.set_latency(LATENCY_IN_SECONDS)
+    try:
+        yield server, summary
+    finally:
+        server.set_latency(0)
+
+
+def get_repository(server: LocalFtpServer, tmp_path: Path) -> MetabolightsFtpRepository:
+    return MetabolightsFtpRepository(
+        local_storage_root_path=str(tmp_path / Path("local")),
+        ftp_server_url=server.url,
+        remote_repository_root_directory=FTP_ROOT_DIRECTORY,
+        local_storage_cache_path=str(tmp_path / Path("cache")),
+    )
+
+
+def record_rate(record_property, name: str, count: float, duration: float) -> float:
+    rate = count / duration if duration > 0 else 0
+    logger.info("%s: %.2f in %.3f seconds", name, rate, duration)
+    record_property(name, round(rate, 2))
+    return rate
+
+
+def test_list_directory_benchmark_01(ftp_server, tmp_path: Path, record_property):
+    server, _ = ftp_server
+    server.reset_counters()
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url=server.url,
+        remote_repository_root_directory=FTP_ROOT_DIRECTORY,
+    )
+    listings = 200
+    start = time.perf_counter()
+    with client.session():
+        results = [client.list_directory(f"{STUDY_ID}/FILES") for _ in range(listings)]
+    duration = time.perf_counter() - start
+
+    record_rate(record_property, "listings_per_second", listings, duration)
+    assert all(x.success for x in results)
+    assert len(results[-1].descriptors) == SHAPE.files_per_folder + 2 + 2
+    # One connection is reused for all listings
+    assert server.logins == 1
+
+
+def test_folder_metadata_collector_benchmark_01(
+    slow_ftp_server, tmp_path: Path, record_property
+):
+    server, summary = slow_ftp_server
+    durations = {}
+    file_lists = {}
+    for max_connections in (1, MAX_CONNECTIONS):
+        client = DefaultFtpClient(
+            local_storage_root_path=str(tmp_path),
+            ftp_server_url=server.url,
+            remote_repository_root_directory=FTP_ROOT_DIRECTORY,
+        )
+        collector = FtpFolderMetadataCollector(
+            client,
+            STUDY_ID,
+            str(tmp_path / Path(f"index_{max_connections}.json")),
+            rebuild_folder_index_file=True,
+            max_connections=max_connections,
+        )
+        start = time.perf_counter()
+        metadata, _ = collector.get_folder_metadata(STUDY_ID)
+        durations[max_connections] = time.perf_counter() - start
+        file_lists[max_connections] = sorted(metadata.files)
+        record_rate(
+            record_property,
+            f"folder_listings_per_second_{max_connections}_connections",
+            summary.folders + 1,
+            durations[max_connections],
+        )
+
+    assert file_lists[1] == file_lists[MAX_CONNECTIONS]
+    assert len(file_lists[1]) == summary.files + 4
+    assert durations[MAX_CONNECTIONS] < durations[1]
+
+
+def test_download_small_files_benchmark_01(
+    slow_ftp_server, tmp_path: Path, record_property
+):
+    server, summary = slow_ftp_server
+    expected_files = summary.files - SHAPE.large_files
+    durations = {}
+    for max_connections in (1, MAX_CONNECTIONS):
+        server.reset_counters()
+        repository = get_repository(server, tmp_path / Path(str(max_connections)))
+        start = time.perf_counter()
+        result = repository.download_study_data_files(
+            STUDY_ID,
+            local_path=repository.local_storage_root_path,
+            skip_files=LARGE_FILES,
+            max_connections=max_connections,
+        )
+        durations[max_connections] = time.perf_counter() - start
+        record_rate(
+            record_property,
+            f"files_per_second_{max_connections}_connections",
+            expected_files,
+            durations[max_connections],
+        )
+        assert result.success, result.message
+        downloaded = [x for x in result.actions.values() if x == "DOWNLOADED"]
+        assert len(downloaded) == expected_files
+        assert server.logins <= max_connections + 1
+
+    assert durations[MAX_CONNECTIONS] < durations[1]
+
+
+def test_download_large_files_benchmark_01(ftp_server, tmp_path: Path, record_property):
+    server, _ = ftp_server
+    repository = get_repository(server, tmp_path)
+    start = time.perf_counter()
+    result = repository.download_study_data_files(
+        STUDY_ID,
+        local_path=repository.local_storage_root_path,
+        selected_data_files=[x.split("/", 1)[1] for x in sorted(LARGE_FILES)],
+        max_connections=SHAPE.large_files,
+    )
+    duration = time.perf_counter() - start
+
+    total_bytes = SHAPE.large_files * SHAPE.large_file_size_in_bytes
+    record_rate(record_property, "mb_per_second", total_bytes / 1024**2, duration)
+    assert result.success, result.message
+    for file_path in LARGE_FILES:
+        local_file = Path(repository.local_storage_root_path) / Path(file_path)
+        assert local_file.stat().st_size == SHAPE.large_file_size_in_bytes
+
+
+def test_sync_study_data_files_benchmark_01(
+    slow_ftp_server, tmp_path: Path, record_property
+):
+    server, summary = slow_ftp_server
+    repository = get_repository(server, tmp_path)
+    result = repository.sync_study_data_files(
+        STUDY_ID, skip_files=LARGE_FILES, max_connections=MAX_CONNECTIONS
+    )
+    assert result.success, result.message
+
+    server.reset_counters()
+    start = time.perf_counter()
+    result = repository.sync_study_data_files(
+        STUDY_ID, skip_files=LARGE_FILES, max_connections=MAX_CONNECTIONS
+    )
+    duration = time.perf_counter() - start
+
+    record_rate(
+        record_property,
+        "checked_files_per_second",
+        summary.files - SHAPE.large_files,
+        duration,
+    )
+    assert result.success, result.message
+    assert set(result.actions.values()) == {"SKIPPED"}
+    assert not server.commands["RETR"]
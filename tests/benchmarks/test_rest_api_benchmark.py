@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List
+
+import pytest
+
+from metabolights_utils.provider.async_provider.submission_repository import (
+    AsyncMetabolightsSubmissionRepository,
+)
+from metabolights_utils.provider.public_search import iterate_public_search_results
+from metabolights_utils.provider.submission_repository import (
+    MetabolightsSubmissionRepository,
+)
+from metabolights_utils.provider.task_waiter import TaskWaiter
+from metabolights_utils.provider.utils import (
+    create_async_http_client,
+    create_http_client,
+)
+from tests.benchmarks.local_rest_server import (
+    API_TOKEN,
+    LocalRestServer,
+    RestServerConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+STUDY_ID = "MTBLS1000001"
+UPLOAD_STUDY_ID = "MTBLS1000002"
+METADATA_FILES = 16
+# Delay of each HTTP request. Concurrent requests should hide it.
+LATENCY_IN_SECONDS = 0.02
+MAX_WORKERS = 8
+
+
+@pytest.fixture(scope="module")
+def rest_server() -> Iterator[LocalRestServer]:
+    with LocalRestServer(RestServerConfig(search_total=1000)) as server:
+        server.state.add_metadata_files(STUDY_ID, METADATA_FILES)
+        yield server
+
+
+@pytest.fixture(scope="function")
+def slow_rest_server(rest_server: LocalRestServer) -> Iterator[LocalRestServer]:
+    rest_server.set_latency(LATENCY_IN_SECONDS)
+    rest_server.reset_counters()
+    try:
+        yield rest_server
+    finally:
+        rest_server.set_latency(0)
+
+
+def get_repository(
+    server: LocalRestServer, tmp_path: Path
+) -> MetabolightsSubmissionRepository:
+    return MetabolightsSubmissionRepository(
+        local_storage_root_path=str(tmp_path / Path("data")),
+        local_storage_cache_path=str(tmp_path / Path("cache")),
+        credentials_file_path=server.create_credentials_file(
+            str(tmp_path / Path("credentials") / ".login")
+        ),
+        rest_api_base_url=server.rest_api_base_url,
+        validation_api_base_url=server.validation_api_base_url,
+        http_client=create_http_client(http2=False),
+    )
+
+
+def record_latencies(record_property, name: str, latencies: List[float]) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    logger.info("%s latency p50: %.4f p95: %.4f seconds", name, p50, p95)
+    record_property(f"{name}_p50_latency_in_seconds", round(p50, 4))
+    record_property(f"{name}_p95_latency_in_seconds", round(p95, 4))
+
+
+def record_rate(record_property, name: str, count: float, duration: float) -> float:
+    rate = count / duration if duration > 0 else 0
+    logger.info("%s: %.2f in %.3f seconds", name, rate, duration)
+    record_property(name, round(rate, 2))
+    return rate
+
+
+def measure(call: Callable, latencies: List[float]):
+    start = time.perf_counter()
+    result = call()
+    latencies.append(time.perf_counter() - start)
+    return result
+
+
+def test_list_isa_metadata_files_benchmark_01(
+    rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    rest_server.reset_counters()
+    repository = get_repository(rest_server, tmp_path)
+    listings = 200
+    latencies = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(
+            executor.map(
+                lambda _: measure(
+                    lambda: repository.list_isa_metadata_files(
+                        STUDY_ID, user_api_token=API_TOKEN
+                    ),
+                    latencies,
+                ),
+                range(listings),
+            )
+        )
+    duration = time.perf_counter() - start
+
+    record_rate(record_property, "listings_per_second", listings, duration)
+    record_latencies(record_property, "listing", latencies)
+    assert all(len(x[0].study) == METADATA_FILES for x in results)
+    # Connections are reused and listings are revalidated with ETags.
+    assert rest_server.requests["connection"] <= MAX_WORKERS
+    assert rest_server.requests["not_modified"] >= listings - MAX_WORKERS
+
+
+def test_upload_metadata_files_benchmark_01(
+    slow_rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    study_path = tmp_path / Path("upload") / Path(UPLOAD_STUDY_ID)
+    study_path.mkdir(parents=True)
+    for index in range(METADATA_FILES):
+        (study_path / f"m_{UPLOAD_STUDY_ID}_upload_{index:03d}_maf.tsv").write_bytes(
+            b"." * 4096
+        )
+    durations = {}
+    for max_workers in (1, MAX_WORKERS):
+        repository = get_repository(slow_rest_server, tmp_path / str(max_workers))
+        start = time.perf_counter()
+        success, message = repository.upload_metadata_files(
+            UPLOAD_STUDY_ID,
+            str(study_path),
+            API_TOKEN,
+            override_remote_files=True,
+            max_workers=max_workers,
+        )
+        durations[max_workers] = time.perf_counter() - start
+        assert success, message
+        record_rate(
+            record_property,
+            f"uploads_per_second_{max_workers}_workers",
+            METADATA_FILES,
+            durations[max_workers],
+        )
+
+    assert slow_rest_server.requests["upload_file"] == 2 * METADATA_FILES
+    assert durations[MAX_WORKERS] < durations[1]
+
+
+def test_download_submission_metadata_files_benchmark_01(
+    slow_rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    durations = {}
+    for max_workers in (1, MAX_WORKERS):
+        repository = get_repository(slow_rest_server, tmp_path / str(max_workers))
+        start = time.perf_counter()
+        result = repository.download_submission_metadata_files(
+            STUDY_ID, max_workers=max_workers
+        )
+        durations[max_workers] = time.perf_counter() - start
+        assert result.success, result.message
+        record_rate(
+            record_property,
+            f"downloads_per_second_{max_workers}_workers",
+            len(result.actions),
+            durations[max_workers],
+        )
+
+    assert durations[MAX_WORKERS] < durations[1]
+
+
+def test_validate_studies_benchmark_01(
+    slow_rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    repository = get_repository(slow_rest_server, tmp_path)
+    study_ids = [f"MTBLS{x}" for x in range(20)]
+    file_paths = {x: str(tmp_path / x / "validation.json") for x in study_ids}
+    task_waiter = TaskWaiter(
+        initial_interval_in_seconds=0.01, max_interval_in_seconds=0.05
+    )
+    latencies = []
+
+    start = time.perf_counter()
+    for result in repository.iterate_study_validations(
+        file_paths,
+        max_workers=MAX_WORKERS,
+        user_api_token=API_TOKEN,
+        task_waiter=task_waiter,
+    ):
+        latencies.append(result.duration_in_seconds)
+        assert result.success, result.message
+    duration = time.perf_counter() - start
+
+    record_rate(record_property, "validations_per_second", len(study_ids), duration)
+    record_latencies(record_property, "validation", latencies)
+    # Each validation sends at least 5 requests one after another.
+    sequential_duration = len(study_ids) * 5 * LATENCY_IN_SECONDS
+    assert duration < sequential_duration
+
+
+def test_public_search_benchmark_01(
+    slow_rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    client = create_http_client(http2=False)
+    processing_time_per_page = LATENCY_IN_SECONDS
+    page_size = 100
+    count = 0
+
+    start = time.perf_counter()
+    for item in iterate_public_search_results(
+        page_size=page_size,
+        search_rest_api_url=slow_rest_server.validation_api_base_url,
+        client=client,
+    ):
+        count += 1
+        if count % page_size == 0:
+            time.sleep(processing_time_per_page)
+    duration = time.perf_counter() - start
+
+    record_rate(record_property, "search_records_per_second", count, duration)
+    pages = slow_rest_server.requests["search"]
+    assert count == 1000
+    assert pages == 10
+    # Next page is fetched while the current page is processed.
+    assert duration < pages * (LATENCY_IN_SECONDS + processing_time_per_page)
+
+
+def test_async_list_isa_metadata_files_benchmark_01(
+    slow_rest_server: LocalRestServer, tmp_path: Path, record_property
+):
+    listings = 64
+
+    async def list_files():
+        client = create_async_http_client(http2=False)
+        repository = AsyncMetabolightsSubmissionRepository(
+            local_storage_cache_path=str(tmp_path / Path("cache")),
+            rest_api_base_url=slow_rest_server.rest_api_base_url,
+            http_client=client,
+        )
+        async with client:
+            return await asyncio.gather(
+                *[
+                    repository.list_isa_metadata_files(
+                        STUDY_ID, user_api_token=API_TOKEN
+                    )
+                    for _ in range(listings)
+                ]
+            )
+
+    start = time.perf_counter()
+    results = asyncio.run(list_files())
+    duration = time.perf_counter() - start
+
+    record_rate(record_property, "async_listings_per_second", listings, duration)
+    assert all(len(x[0].study) == METADATA_FILES for x in results)
+    assert duration < listings * LATENCY_IN_SECONDS
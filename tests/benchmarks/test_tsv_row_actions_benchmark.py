@@ -0,0 +1,99 @@
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from metabolights_utils.tsv.model import (
+    TsvActionReport,
+    TsvAddRowsAction,
+    TsvCopyRowAction,
+    TsvDeleteRowsAction,
+    TsvRowData,
+    TsvUpdateRowsAction,
+)
+from metabolights_utils.tsv.tsv_file_updater import TsvFileUpdater
+from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
+
+logger = logging.getLogger(__name__)
+
+pytestmark = pytest.mark.benchmark
+
+ROW_COUNT = 100000
+TARGET_COUNT = 50000
+COLUMN_COUNT = 10
+# Quadratic implementations need minutes for these inputs.
+MAX_DURATION_IN_SECONDS = 20
+
+
+@pytest.fixture(scope="function")
+def large_tsv_file(tmp_path: Path) -> Path:
+    file_path = tmp_path / Path("s_benchmark.txt")
+    with file_path.open("w") as f:
+        f.write("\t".join([f"Column {x}" for x in range(COLUMN_COUNT)]) + "\n")
+        for row in range(ROW_COUNT):
+            f.write("\t".join([f"{row}-{x}" for x in range(COLUMN_COUNT)]) + "\n")
+    return file_path
+
+
+def apply_action(file_path: Path, action, temp_path: Path) -> TsvActionReport:
+    sha256 = HashUtils.sha256sum(str(file_path))
+    start = time.perf_counter()
+    report = TsvFileUpdater().apply_actions(
+        file_path=file_path,
+        file_sha256_hash=sha256,
+        actions=[action],
+        temp_path=str(temp_path),
+    )
+    duration = time.perf_counter() - start
+    logger.info("%s: %.3f seconds", action.action_type, duration)
+    assert report.success, report.message
+    assert duration < MAX_DURATION_IN_SECONDS
+    return report
+
+
+def count_rows(file_path: Path) -> int:
+    with file_path.open() as f:
+        return sum(1 for _ in f) - 1
+
+
+def test_add_rows_benchmark_01(large_tsv_file: Path, tmp_path: Path):
+    new_row_indices = list(range(0, 2 * TARGET_COUNT, 2))
+    row_data = {x: TsvRowData(values={0: f"new {x}"}) for x in new_row_indices[:100]}
+    action = TsvAddRowsAction(new_row_indices=new_row_indices, row_data=row_data)
+    apply_action(large_tsv_file, action, tmp_path / Path("temp"))
+    assert count_rows(large_tsv_file) == ROW_COUNT + TARGET_COUNT
+    with large_tsv_file.open() as f:
+        f.readline()
+        assert f.readline().startswith("new 0\t")
+        assert f.readline().startswith("0-0\t")
+
+
+def test_delete_rows_benchmark_01(large_tsv_file: Path, tmp_path: Path):
+    action = TsvDeleteRowsAction(
+        current_row_indices=list(range(ROW_COUNT - 1, 0, -2))[:TARGET_COUNT]
+    )
+    apply_action(large_tsv_file, action, tmp_path / Path("temp"))
+    assert count_rows(large_tsv_file) == ROW_COUNT - TARGET_COUNT
+
+
+def test_copy_row_benchmark_01(large_tsv_file: Path, tmp_path: Path):
+    action = TsvCopyRowAction(
+        source_row_index=0, target_row_indices=list(range(1, TARGET_COUNT + 1))
+    )
+    apply_action(large_tsv_file, action, tmp_path / Path("temp"))
+    assert count_rows(large_tsv_file) == ROW_COUNT
+    with large_tsv_file.open() as f:
+        lines = f.readlines()
+    assert lines[TARGET_COUNT] == lines[1]
+    assert lines[TARGET_COUNT + 2].startswith(f"{TARGET_COUNT + 1}-0\t")
+
+
+def test_update_rows_benchmark_01(large_tsv_file: Path, tmp_path: Path):
+    rows = {
+        x: TsvRowData(values={1: f"updated {x}"})
+        for x in range(ROW_COUNT - 1, ROW_COUNT - TARGET_COUNT - 1, -1)
+    }
+    action = TsvUpdateRowsAction(rows=rows)
+    apply_action(large_tsv_file, action, tmp_path / Path("temp"))
+    assert count_rows(large_tsv_file) == ROW_COUNT
@@ -202,3 +202,22 @@ def test_public_search_09(mocker: MockerFixture):
     )
     assert result.exit_code == 0
     assert "aggregations" in result.output
+
+
+def test_public_search_10(mocker: MockerFixture):
+    iterate = mocker.patch(
+        "metabolights_utils.commands.public.public_search.iterate_public_search_results",
+        return_value=iter([{"studyId": "MTBLS1"}, {"studyId": "MTBLS2"}]),
+    )
+    runner = CliRunner()
+    result = runner.invoke(public_search, ["diet", "--all", "--no_cache"])
+    assert result.exit_code == 0
+    lines = [json.loads(x) for x in result.output.strip().split("\n")]
+    assert lines == [{"studyId": "MTBLS1"}, {"studyId": "MTBLS2"}]
+    assert iterate.call_args.kwargs["query"] == "diet"
+    assert iterate.call_args.kwargs["page_size"] == 10
+
+    iterate.return_value = iter([{"studyId": "MTBLS1"}])
+    result = runner.invoke(public_search, ["diet", "--all", "--id", "--no_cache"])
+    assert result.exit_code == 0
+    assert result.output == "MTBLS1\n"
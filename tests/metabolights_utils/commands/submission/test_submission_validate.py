@@ -0,0 +1,59 @@
+import json
+import time
+from pathlib import Path
+
+from click.testing import CliRunner
+from pytest_mock import MockerFixture
+
+from metabolights_utils.commands.submission.submission_validate import (
+    submission_validate,
+)
+from metabolights_utils.provider.submission_repository import (
+    MetabolightsSubmissionRepository,
+)
+
+
+def mock_validate_study(
+    self,
+    study_id: str,
+    validation_result_file_path: str,
+    **kwargs,
+):
+    # Later studies are completed earlier.
+    time.sleep((3 - int(study_id[-1])) * 0.1)
+    if study_id == "MTBLS2":
+        return None, "Task task-MTBLS2 is not successful."
+    Path(validation_result_file_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(validation_result_file_path).write_text("{}")
+    return True, f"task-{study_id}"
+
+
+def test_submission_validate_01(mocker: MockerFixture, tmp_path: Path):
+    """
+    Test batch validation prints a JSON line for each study as it is completed.
+    """
+    mocker.patch.object(
+        MetabolightsSubmissionRepository, "validate_study", mock_validate_study
+    )
+    mocker.patch.object(
+        MetabolightsSubmissionRepository,
+        "get_api_token",
+        return_value=("token", None),
+    )
+    runner = CliRunner()
+    study_ids_file = tmp_path / "study_ids.txt"
+    study_ids_file.write_text("mtbls1\nMTBLS2\n\n")
+
+    result = runner.invoke(
+        submission_validate,
+        ["MTBLS3", "-f", str(study_ids_file), "-x", str(tmp_path)],
+    )
+
+    assert result.exit_code == 1
+    lines = [json.loads(x) for x in result.output.strip().split("\n")]
+    assert [x["study_id"] for x in lines] == ["MTBLS3", "MTBLS2", "MTBLS1"]
+    assert [x["success"] for x in lines] == [True, False, True]
+    assert lines[1]["message"] == "Task task-MTBLS2 is not successful."
+    assert all(x["duration_in_seconds"] > 0 for x in lines)
+    assert Path(lines[0]["validation_result_file_path"]).exists()
+    assert lines[0]["validation_result_file_path"].startswith(str(tmp_path))
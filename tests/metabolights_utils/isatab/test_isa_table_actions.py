@@ -1,12 +1,19 @@
 import os
 import shutil
+import threading
 from pathlib import Path
 from typing import Dict, List
 
+import pytest
+
+from metabolights_utils.tsv.journal import TsvDeltaJournal, TsvJournalException
 from metabolights_utils.tsv.model import (
     TsvActionReport,
     TsvAddColumnsAction,
     TsvAddRowsAction,
+    TsvBulkAddRowsAction,
+    TsvBulkUpdateCellsAction,
+    TsvBulkUpdateColumnsAction,
     TsvCellData,
     TsvColumnData,
     TsvCopyColumnAction,
@@ -22,7 +29,9 @@ from metabolights_utils.tsv.model import (
     TsvUpdateRowsAction,
 )
 from metabolights_utils.tsv.tsv_file_updater import TsvFileUpdater
+from metabolights_utils.tsv.tsv_update_service import TsvFileUpdateService
 from metabolights_utils.utils.filename_utils import join_path
+from metabolights_utils.utils.hash_utils import MetabolightsHashUtils as HashUtils
 
 
 def test_add_row_action_01():
@@ -484,3 +493,417 @@ def test_update_cells_action_01():
     )
     assert result.success
     assert result.updated_file_sha256_hash
+
+
+def test_bulk_add_rows_action_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    with open(path_original) as f:
+        original_rows = f.read().splitlines()[1:]
+    bulk_add_rows_action = TsvBulkAddRowsAction(
+        new_row_indices=[len(original_rows) + 2, 0, 3, len(original_rows) + 3],
+        columns={
+            "Source Name": ["Source X", "Source A", "Source B", "Source Y"],
+            "Protocol REF": ["", "Sample collection", "", ""],
+        },
+    )
+    result: TsvActionReport = isa_table_updater.apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[bulk_add_rows_action],
+    )
+    assert result.success
+    with open(path_target) as f:
+        rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    assert len(rows) == len(original_rows) + 4
+    assert rows[0][0] == "Source A"
+    assert rows[0][13] == "Sample collection"
+    assert rows[1][0] == "Order 0"
+    assert rows[3][0] == "Source B"
+    assert rows[-2][0] == "Source X"
+    assert rows[-1][0] == "Source Y"
+
+
+def test_bulk_add_rows_action_invalid_index_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    bulk_add_rows_action = TsvBulkAddRowsAction(
+        new_row_indices=[1, 100000], columns={"Source Name": ["A", "B"]}
+    )
+    result: TsvActionReport = isa_table_updater.apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[bulk_add_rows_action],
+    )
+    assert not result.success
+    assert "100000" in result.message
+
+
+def test_bulk_update_columns_action_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    bulk_update_columns_action = TsvBulkUpdateColumnsAction(
+        row_indices=[5, 2],
+        columns={
+            "Characteristics[Organism]": ["test 5", "test 2"],
+            "Characteristics[Organism part]": ["test 2.5", "test 2.2"],
+        },
+    )
+    result: TsvActionReport = isa_table_updater.apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[bulk_update_columns_action],
+    )
+    assert result.success
+    with open(path_target) as f:
+        rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    assert rows[2][1] == "test 2"
+    assert rows[2][4] == "test 2.2"
+    assert rows[5][1] == "test 5"
+    assert rows[5][4] == "test 2.5"
+
+
+def test_bulk_update_columns_action_ambiguous_header_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    bulk_update_columns_action = TsvBulkUpdateColumnsAction(
+        columns={"Term Source REF": ["NCBITAXON"]}
+    )
+    result: TsvActionReport = isa_table_updater.apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[bulk_update_columns_action],
+    )
+    assert not result.success
+    assert "Term Source REF" in result.message
+
+
+def test_bulk_update_cells_action_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    bulk_update_cells_action = TsvBulkUpdateCellsAction(
+        row_indices=[3, 1, 2],
+        column_indices=[10, 2, 1],
+        values=["Cell Update3", "Cell Update", "Cell Update2"],
+    )
+    result: TsvActionReport = isa_table_updater.apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[bulk_update_cells_action],
+    )
+    assert result.success
+    with open(path_target) as f:
+        rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    assert rows[1][2] == "Cell Update"
+    assert rows[2][1] == "Cell Update2"
+    assert rows[3][10] == "Cell Update3"
+
+
+def test_journal_reconstruct_and_undo_01():
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    isa_table_updater = TsvFileUpdater()
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    journal_path = Path(path_target).parent / Path("journal")
+    shutil.rmtree(journal_path, ignore_errors=True)
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    journal = TsvDeltaJournal(journal_path)
+
+    actions = [
+        [TsvBulkUpdateCellsAction(row_indices=[1], column_indices=[2], values=["X"])],
+        [
+            TsvBulkAddRowsAction(
+                new_row_indices=[0, 4], columns={"Source Name": ["A", "B"]}
+            )
+        ],
+        [TsvDeleteRowsAction(current_row_indices=[6, 7])],
+        [TsvDeleteColumnsAction(current_columns={1: "Characteristics[Organism]"})],
+    ]
+    hashes = [sha]
+    for action_list in actions:
+        result: TsvActionReport = isa_table_updater.apply_actions(
+            file_path=path_target,
+            file_sha256_hash=hashes[-1],
+            actions=action_list,
+            journal=journal,
+        )
+        assert result.success
+        hashes.append(result.updated_file_sha256_hash)
+
+    entries = journal.get_entries(path_target)
+    assert len(entries) == len(actions)
+    assert entries[0].hunks[0].cells
+
+    for version in hashes[:-1]:
+        version_path = Path(path_target).parent / Path(f"version_{version}.txt")
+        journal.reconstruct(path_target, version, version_path)
+        assert HashUtils.sha256sum(str(version_path)) == version
+
+    journal.undo(path_target)
+    assert HashUtils.sha256sum(path_target) == hashes[-2]
+    assert len(journal.get_entries(path_target)) == len(actions) - 1
+
+
+def test_journal_reconstruct_tampered_01():
+    """Reconstructed content is checked before the current file is replaced."""
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    path_target = get_update_service_test_file()
+    journal_path = Path(path_target).parent / Path("journal_tampered")
+    shutil.rmtree(journal_path, ignore_errors=True)
+    journal = TsvDeltaJournal(journal_path)
+    result = TsvFileUpdater().apply_actions(
+        file_path=path_target,
+        file_sha256_hash=sha,
+        actions=[TsvDeleteRowsAction(current_row_indices=[0, 1])],
+        journal=journal,
+    )
+    assert result.success
+    journal_file_path = journal.get_journal_file_path(path_target)
+    entry = journal.get_entries(path_target)[0]
+    entry.hunks[0].lines = list(reversed(entry.hunks[0].lines))
+    journal_file_path.write_text(entry.model_dump_json(by_alias=True) + "\n")
+    version_path = Path(path_target).parent / Path("version_tampered.txt")
+    version_path.unlink(missing_ok=True)
+
+    with pytest.raises(TsvJournalException):
+        journal.reconstruct(path_target, sha, version_path)
+    with pytest.raises(TsvJournalException):
+        journal.undo(path_target)
+
+    assert not version_path.exists()
+    assert HashUtils.sha256sum(path_target) == result.updated_file_sha256_hash
+    assert len(journal.get_entries(path_target)) == 1
+    assert sorted(x.name for x in Path(path_target).parent.glob(".*")) == []
+
+
+def test_journal_same_file_names_01():
+    """Files with the same name in different folders have separate journals."""
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    root_path = Path(join_path("test-temp/test-data/journal-same-names")).resolve()
+    shutil.rmtree(root_path, ignore_errors=True)
+    journal = TsvDeltaJournal(root_path / Path("journal"))
+    paths = []
+    for study_id in ("MTBLS1", "MTBLS2"):
+        path_target = root_path / Path(study_id) / Path("s_MTBLS66_test_01.txt")
+        path_target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(path_original, path_target)
+        paths.append(path_target)
+
+    result = TsvFileUpdater().apply_actions(
+        file_path=str(paths[0]),
+        file_sha256_hash=sha,
+        actions=[TsvDeleteRowsAction(current_row_indices=[0])],
+        journal=journal,
+    )
+
+    assert result.success
+    assert len(journal.get_entries(paths[0])) == 1
+    assert journal.get_entries(paths[1]) == []
+    assert journal.get_journal_file_path(paths[0]) != journal.get_journal_file_path(
+        paths[1]
+    )
+
+
+class GatedTsvFileUpdater(TsvFileUpdater):
+    """Blocks the first update until it is released and counts updates."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def apply_actions(self, *args, **kwargs) -> TsvActionReport:
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            self.release.wait(timeout=10)
+        return super().apply_actions(*args, **kwargs)
+
+
+def get_update_service_test_file() -> str:
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    return path_target
+
+
+def update_cell_actions(row_index: int) -> List[TsvBulkUpdateCellsAction]:
+    return [
+        TsvBulkUpdateCellsAction(
+            row_indices=[row_index], column_indices=[1], values=[f"Cell {row_index}"]
+        )
+    ]
+
+
+def test_update_service_merge_batches_01():
+    """Batches queued for the current file version are applied in one rewrite."""
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    path_target = get_update_service_test_file()
+    expected_copy = str(Path(path_target).parent / Path("s_MTBLS66_expected.txt"))
+    shutil.copy(path_target, expected_copy)
+    first_report = TsvFileUpdater().apply_actions(
+        expected_copy, sha, update_cell_actions(0)
+    )
+    updater = GatedTsvFileUpdater()
+    with TsvFileUpdateService(updater=updater, max_workers=2) as service:
+        futures = [service.submit(path_target, sha, update_cell_actions(0))]
+        assert updater.started.wait(timeout=10)
+        futures.extend(
+            service.submit(
+                path_target,
+                first_report.updated_file_sha256_hash,
+                update_cell_actions(idx),
+            )
+            for idx in range(1, 10)
+        )
+        updater.release.set()
+        reports = [x.result() for x in futures]
+    assert all(x.success for x in reports)
+    assert all(len(x.results) == 1 for x in reports)
+    assert updater.calls == 2
+    assert reports[-1].updated_file_sha256_hash == HashUtils.sha256sum(path_target)
+    with open(path_target) as f:
+        rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    assert [x[1] for x in rows[:10]] == [f"Cell {idx}" for idx in range(10)]
+
+
+def test_update_service_stale_batch_01():
+    """A batch prepared for a version replaced by an earlier batch is rejected."""
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    path_target = get_update_service_test_file()
+    updater = GatedTsvFileUpdater()
+    with TsvFileUpdateService(updater=updater) as service:
+        first = service.submit(
+            path_target, sha, [TsvDeleteRowsAction(current_row_indices=[0])]
+        )
+        assert updater.started.wait(timeout=10)
+        second = service.submit(path_target, sha, update_cell_actions(1))
+        updater.release.set()
+        first_report, second_report = first.result(), second.result()
+    assert first_report.success
+    assert not second_report.success
+    assert "does not match" in second_report.message
+    assert first_report.updated_file_sha256_hash == HashUtils.sha256sum(path_target)
+
+
+def test_update_service_merge_batches_02():
+    """Queued batches that delete rows are not merged with other batches."""
+    sha = "add85bc3770cda13450b6fd95fe1735fe6337553076ed7cd269fc8163e002fac"
+    path_target = get_update_service_test_file()
+    expected_copy = str(Path(path_target).parent / Path("s_MTBLS66_expected.txt"))
+    shutil.copy(path_target, expected_copy)
+    first_report = TsvFileUpdater().apply_actions(
+        expected_copy, sha, update_cell_actions(0)
+    )
+    with open(expected_copy) as f:
+        first_rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    new_sha = first_report.updated_file_sha256_hash
+    updater = GatedTsvFileUpdater()
+    with TsvFileUpdateService(updater=updater, max_workers=2) as service:
+        futures = [service.submit(path_target, sha, update_cell_actions(0))]
+        assert updater.started.wait(timeout=10)
+        futures.append(
+            service.submit(
+                path_target, new_sha, [TsvDeleteRowsAction(current_row_indices=[0])]
+            )
+        )
+        futures.append(service.submit(path_target, new_sha, update_cell_actions(1)))
+        updater.release.set()
+        reports = [x.result() for x in futures]
+    assert reports[0].success
+    assert reports[1].success
+    assert not reports[2].success
+    assert "does not match" in reports[2].message
+    assert updater.calls == 3
+    with open(path_target) as f:
+        rows = [x.split("\t") for x in f.read().splitlines()[1:]]
+    assert rows == first_rows[1:]
+
+
+def test_update_service_sha_mismatch_01():
+    path_original = str(
+        Path(join_path("tests/test-data/test-data-01/s_MTBLS66_test_01.txt")).resolve()
+    )
+    path_target = str(
+        Path(
+            join_path("test-temp/test-data/test-data-01/s_MTBLS66_test_01_result.txt")
+        ).resolve()
+    )
+    Path(path_target).parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(path_original, path_target)
+    with TsvFileUpdateService() as service:
+        report = service.apply_actions(
+            path_target,
+            "invalid-sha256",
+            [TsvDeleteRowsAction(current_row_indices=[1])],
+        )
+    assert not report.success
+    assert "does not match" in report.message
@@ -0,0 +1,106 @@
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+
+from metabolights_utils.provider.async_provider.submission_repository import (
+    AsyncMetabolightsSubmissionRepository,
+)
+from metabolights_utils.provider.task_waiter import TaskWaiter
+from tests.metabolights_utils.provider.test_submission_repository import (
+    BASE_URL,
+    STUDY_ID,
+    MockSubmissionApi,
+    create_metadata_files,
+)
+
+
+@pytest.fixture
+def api(mocker) -> MockSubmissionApi:
+    mocker.patch("asyncio.sleep")
+    return MockSubmissionApi()
+
+
+def get_repository(api: MockSubmissionApi, tmp_path: Path):
+    return AsyncMetabolightsSubmissionRepository(
+        local_storage_root_path=str(tmp_path / Path("data")),
+        local_storage_cache_path=str(tmp_path / Path("cache")),
+        rest_api_base_url=BASE_URL,
+        validation_api_base_url=BASE_URL,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(api.handle)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_metadata_files_01(api: MockSubmissionApi, tmp_path: Path):
+    study_path = create_metadata_files(tmp_path)
+    api.errors = {"i_Investigation.txt": [503], "m_MTBLS1000001_0_maf.tsv": [400]}
+    repository = get_repository(api, tmp_path)
+
+    success, message = await repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token", max_workers=3
+    )
+
+    assert not success
+    assert "m_MTBLS1000001_0_maf.tsv: 400" in message
+    assert api.uploads.count("i_Investigation.txt") == 2
+    assert api.files["i_Investigation.txt"] == b"investigation"
+    index = repository.load_metadata_file_index(STUDY_ID)
+    assert sorted(index.files) == sorted(api.files)
+
+    api.uploads.clear()
+    success, message = await repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token"
+    )
+    assert success, message
+    assert api.uploads == ["m_MTBLS1000001_0_maf.tsv"]
+    assert sorted(api.files) == sorted(os.listdir(study_path))
+
+
+@pytest.mark.asyncio
+async def test_download_submission_metadata_files_01(
+    api: MockSubmissionApi, tmp_path: Path, mocker
+):
+    for index in range(20):
+        filename = f"m_MTBLS1000001_{index}_maf.tsv"
+        api.files[filename] = f"maf {index}".encode()
+        api.created_at[filename] = "2020-01-01 00:00:00"
+    repository = get_repository(api, tmp_path)
+    mocker.patch.object(repository, "get_api_token", return_value=("token", None))
+
+    result = await repository.download_submission_metadata_files(
+        STUDY_ID, max_workers=8
+    )
+
+    assert result.success, result.message
+    assert sorted(api.downloads) == sorted(api.files)
+    study_path = tmp_path / Path("data") / Path(STUDY_ID)
+    assert (study_path / "m_MTBLS1000001_3_maf.tsv").read_bytes() == b"maf 3"
+    assert set(result.actions.values()) == {"DOWNLOADED"}
+
+    api.downloads.clear()
+    result = await repository.download_submission_metadata_files(STUDY_ID)
+    assert result.success, result.message
+    assert not api.downloads
+    assert set(result.actions.values()) == {"SKIPPED"}
+
+
+@pytest.mark.asyncio
+async def test_validate_studies_01(api: MockSubmissionApi, tmp_path: Path):
+    study_ids = ["MTBLS1", "MTBLS2", "MTBLS3"]
+    file_paths = {x: str(tmp_path / Path(x) / "validation.json") for x in study_ids}
+
+    async with get_repository(api, tmp_path) as repository:
+        results = await repository.validate_studies(
+            file_paths,
+            user_api_token="token",
+            task_waiter=TaskWaiter(initial_interval_in_seconds=0.01),
+        )
+
+    assert results["MTBLS1"] == (True, "task-MTBLS1")
+    assert results["MTBLS2"] == (True, "task-MTBLS2")
+    assert results["MTBLS3"] == (False, "Task task-MTBLS3 is not successful.")
+    assert api.validation_polls == {x: 3 for x in study_ids}
+    assert Path(file_paths["MTBLS1"]).exists()
+    assert not Path(file_paths["MTBLS3"]).exists()
@@ -0,0 +1,272 @@
+import datetime
+import ftplib
+import os
+from pathlib import Path
+from typing import Dict, List, Union
+
+import pytest
+
+from metabolights_utils.provider.ftp.default_ftp_client import (
+    DefaultFtpClient,
+    FtpDownloadException,
+)
+from metabolights_utils.provider.ftp.model import FtpFileDescriptor
+
+DATA = bytes(range(256)) * 100
+
+
+class MockFtp:
+    def __init__(
+        self, fail_after: Union[None, int] = None, rest_supported: bool = True
+    ):
+        self.fail_after = fail_after
+        self.rest_supported = rest_supported
+        self.offsets: List[int] = []
+        self.files: Dict[str, bytes] = {}
+        self.commands: List[str] = []
+        self.directories: List[str] = []
+
+    def cwd(self, directory: str):
+        self.directories.append(directory)
+        return "250 OK"
+
+    def retrbinary(self, cmd, callback, blocksize=8192, rest=None):
+        if rest and not self.rest_supported:
+            raise ftplib.error_perm("502 REST not implemented")
+        offset = int(rest) if rest else 0
+        self.offsets.append(offset)
+        for start in range(offset, len(DATA), 1000):
+            if self.fail_after is not None and start >= self.fail_after:
+                self.fail_after = None
+                raise EOFError("connection is closed")
+            callback(DATA[start : start + 1000])
+        return "226 Transfer complete"
+
+    def storbinary(self, cmd, fp, blocksize=8192, callback=None, rest=None):
+        self.commands.append(cmd if rest is None else f"REST {rest} {cmd}")
+        filename = cmd.split(" ", 1)[1]
+        content = self.files.get(filename, b"")[: int(rest) if rest else 0]
+        while True:
+            block = fp.read(blocksize)
+            if not block:
+                break
+            if self.fail_after is not None and len(content) >= self.fail_after:
+                self.fail_after = None
+                self.files[filename] = content
+                raise EOFError("connection is closed")
+            content += block
+            if callback:
+                callback(block)
+        self.files[filename] = content
+        return "226 Transfer complete"
+
+    def voidcmd(self, cmd):
+        return "200 OK"
+
+    def size(self, filename):
+        if filename not in self.files:
+            raise ftplib.error_perm("550 No such file")
+        return len(self.files[filename])
+
+    def rename(self, source, target):
+        self.files[target] = self.files.pop(source)
+
+    def delete(self, filename):
+        del self.files[filename]
+
+    def sendcmd(self, cmd):
+        self.commands.append(cmd)
+        return "213 Modify=20240101000000"
+
+    def close(self):
+        pass
+
+
+def get_client(
+    tmp_path: Path, ftp: MockFtp, mocker, root_directory: str = "/pub"
+) -> DefaultFtpClient:
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="ftp.test.default.client",
+        remote_repository_root_directory=root_directory,
+    )
+
+    def connect():
+        if not root_directory and client.home_directory is None:
+            client.home_directory = "/home/user"
+        client.ftp = ftp
+
+    mocker.patch.object(client, "connect", side_effect=connect)
+    return client
+
+
+def test_retrieve_file_01(tmp_path: Path, mocker):
+    ftp = MockFtp()
+    client = get_client(tmp_path, ftp, mocker)
+    target_path = tmp_path / Path("a.raw")
+    part_file_path = tmp_path / Path("a.raw.part")
+    part_file_path.write_bytes(DATA[:5000])
+
+    downloaded = client.retrieve_file("MTBLS1/a.raw", str(target_path), len(DATA))
+
+    assert ftp.offsets == [5000]
+    assert downloaded == len(DATA) - 5000
+    assert target_path.read_bytes() == DATA
+    assert not part_file_path.exists()
+
+
+def test_retrieve_file_02(tmp_path: Path, mocker):
+    ftp = MockFtp(fail_after=12000)
+    client = get_client(tmp_path, ftp, mocker)
+    target_path = tmp_path / Path("a.raw")
+
+    client.retrieve_file("MTBLS1/a.raw", str(target_path), len(DATA))
+
+    assert ftp.offsets[0] == 0
+    assert ftp.offsets[-1] == 12000
+    assert target_path.read_bytes() == DATA
+
+
+def test_retrieve_file_03(tmp_path: Path, mocker):
+    ftp = MockFtp()
+    client = get_client(tmp_path, ftp, mocker)
+    target_path = tmp_path / Path("a.raw")
+
+    with pytest.raises(FtpDownloadException):
+        client.retrieve_file("MTBLS1/a.raw", str(target_path), len(DATA) + 1)
+
+    assert not target_path.exists()
+    assert (tmp_path / Path("a.raw.part")).stat().st_size == len(DATA)
+
+
+def test_retrieve_file_04(tmp_path: Path, mocker):
+    """Login folder is the root directory if root directory is empty."""
+    ftp = MockFtp()
+    client = get_client(tmp_path, ftp, mocker, root_directory="")
+    target_path = tmp_path / Path("a.raw")
+
+    client.retrieve_file("MTBLS1/a.raw", str(target_path), len(DATA))
+
+    assert ftp.directories == ["/home/user/MTBLS1"]
+    assert target_path.read_bytes() == DATA
+
+
+def test_retrieve_file_05(tmp_path: Path, mocker):
+    """Restarted download counts only bytes of the target file."""
+    ftp = MockFtp(fail_after=12000, rest_supported=False)
+    client = get_client(tmp_path, ftp, mocker)
+    target_path = tmp_path / Path("a.raw")
+    sizes = []
+
+    downloaded = client.retrieve_file(
+        "MTBLS1/a.raw", str(target_path), len(DATA), callback=sizes.append
+    )
+
+    assert ftp.offsets == [0, 0]
+    assert downloaded == len(DATA)
+    assert -12000 in sizes
+    assert sum(sizes) == len(DATA)
+    assert target_path.read_bytes() == DATA
+
+
+def test_retrieve_file_06(tmp_path: Path, mocker):
+    """Local file errors are not retried."""
+    ftp = MockFtp()
+    client = get_client(tmp_path, ftp, mocker)
+    target_path = tmp_path / Path("a.raw")
+    (tmp_path / Path("a.raw.part")).mkdir()
+
+    with pytest.raises(IsADirectoryError):
+        client.retrieve_file("MTBLS1/a.raw", str(target_path))
+
+    assert client.connect.call_count == 1
+
+
+def test_store_file_01(tmp_path: Path, mocker):
+    ftp = MockFtp()
+    ftp.files[".temp_a.raw"] = DATA[:5000]
+    client = get_client(tmp_path, ftp, mocker)
+    local_file = tmp_path / Path("a.raw")
+    local_file.write_bytes(DATA)
+
+    uploaded = client.store_file(str(local_file), "MTBLS1/a.raw", resume=True)
+
+    assert uploaded == len(DATA) - 5000
+    assert ftp.files == {"a.raw": DATA}
+    assert ftp.commands[0] == "REST 5000 STOR .temp_a.raw"
+    assert ftp.commands[1].startswith("MFMT ")
+
+
+def test_store_file_02(tmp_path: Path, mocker):
+    ftp = MockFtp(fail_after=12000)
+    client = get_client(tmp_path, ftp, mocker)
+    local_file = tmp_path / Path("a.raw")
+    local_file.write_bytes(DATA)
+
+    client.store_file(str(local_file), "MTBLS1/a.raw", blocksize=1000, resume=True)
+
+    assert ftp.files == {"a.raw": DATA}
+    assert ftp.commands[1] == "REST 12000 STOR .temp_a.raw"
+
+
+def test_store_file_03(tmp_path: Path, mocker):
+    ftp = MockFtp()
+    client = get_client(tmp_path, ftp, mocker)
+    local_file = tmp_path / Path("a.raw")
+    local_file.write_bytes(DATA)
+    mocker.patch.object(
+        ftp, "rename", side_effect=ftplib.error_perm("553 Not permitted")
+    )
+
+    with pytest.raises(ftplib.error_perm):
+        client.store_file(str(local_file), "MTBLS1/a.raw")
+
+    assert ftp.files == {}
+
+
+def test_store_file_04(tmp_path: Path, mocker):
+    """Restarted upload counts only bytes of the stored file."""
+    ftp = MockFtp(fail_after=12000)
+    client = get_client(tmp_path, ftp, mocker)
+    local_file = tmp_path / Path("a.raw")
+    local_file.write_bytes(DATA)
+
+    uploaded = client.store_file(str(local_file), "MTBLS1/a.raw", blocksize=1000)
+
+    assert uploaded == len(DATA)
+    assert ftp.files == {"a.raw": DATA}
+
+
+def test_is_uploaded_file_01(tmp_path: Path):
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="ftp.test.default.client",
+        remote_repository_root_directory="/pub",
+    )
+    local_file = tmp_path / Path("a.raw")
+    local_file.write_bytes(DATA)
+    modified_time = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    timestamp = modified_time.replace(tzinfo=datetime.timezone.utc).timestamp()
+    os.utime(local_file, (timestamp, timestamp))
+    descriptor = FtpFileDescriptor(
+        base_name="a.raw", size_in_bytes=len(DATA), modified_time=modified_time
+    )
+
+    assert client.is_uploaded_file(str(local_file), descriptor)
+    descriptor.size_in_bytes = 10
+    assert not client.is_uploaded_file(str(local_file), descriptor)
+    descriptor.size_in_bytes = len(DATA)
+    descriptor.modified_time = modified_time - datetime.timedelta(hours=1)
+    assert not client.is_uploaded_file(str(local_file), descriptor)
+    assert not client.is_uploaded_file(str(local_file), None)
+
+
+def test_get_server_address_01(tmp_path: Path):
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="127.0.0.1:2121",
+        remote_repository_root_directory="/pub",
+    )
+    assert client.get_server_address() == ("127.0.0.1", 2121)
+    client.ftp_server_url = "ftp.test.default.client"
+    assert client.get_server_address() == ("ftp.test.default.client", 21)
@@ -0,0 +1,173 @@
+import datetime
+import json
+from typing import Dict, List
+
+from metabolights_utils.provider.ftp.folder_metadata_collector import (
+    FtpFolderMetadataCollector,
+)
+from metabolights_utils.provider.ftp.model import FtpFileDescriptor, FtpFolderContent
+
+MODIFIED_TIME = datetime.datetime(2024, 1, 2, 3, 4, 5)
+
+TREE: Dict[str, List[str]] = {
+    "MTBLS1": ["i_Investigation.txt", "s_MTBLS1.txt", "FILES/", "AUDIT_FILES/"],
+    "MTBLS1/FILES": ["a.raw/", "nmr/", "data.zip"]
+    + [f"folder_{x}/" for x in range(10)],
+    "MTBLS1/FILES/nmr": ["acqus", "fid", "pdata/", "other.txt"],
+    **{
+        f"MTBLS1/FILES/folder_{x}": [f"file_{y}.txt" for y in range(3)] + ["sub/"]
+        for x in range(10)
+    },
+    **{f"MTBLS1/FILES/folder_{x}/sub": ["file.mzML"] for x in range(10)},
+}
+
+
+class MockFtpClient:
+    def __init__(self):
+        self.ftp_server_url = "ftp.test.folder.metadata"
+        self.remote_repository_root_directory = "/pub/studies"
+        self.modified_times: Dict[str, datetime.datetime] = {}
+        self.listed_directories: List[str] = []
+
+    def clone(self):
+        return self
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def list_directory(self, directory: str) -> FtpFolderContent:
+        self.listed_directories.append(directory)
+        response = FtpFolderContent(source_directory=directory, success=True)
+        for name in TREE.get(directory, []):
+            is_directory = name.endswith("/")
+            path = f"{directory}/{name.rstrip('/')}"
+            response.descriptors.append(
+                FtpFileDescriptor(
+                    base_name=name.rstrip("/"),
+                    size_in_bytes=len(name),
+                    is_directory=is_directory,
+                    mode="644",
+                    modified_time=self.modified_times.get(path, MODIFIED_TIME),
+                )
+            )
+        return response
+
+
+def get_collector(
+    tmp_path, max_connections: int, client=None, **kwargs
+) -> FtpFolderMetadataCollector:
+    return FtpFolderMetadataCollector(
+        client=client or MockFtpClient(),
+        study_id="MTBLS1",
+        folder_index_file_path=str(tmp_path / f"index_{max_connections}.json"),
+        max_connections=max_connections,
+        max_pending_folders=2,
+        **kwargs,
+    )
+
+
+def test_crawl_folders_01(tmp_path):
+    sequential_metadata, sequential_messages = get_collector(
+        tmp_path, 1
+    ).get_folder_metadata(None)
+    concurrent_metadata, concurrent_messages = get_collector(
+        tmp_path, 4
+    ).get_folder_metadata(None)
+
+    assert sequential_metadata.model_dump_json() == (
+        concurrent_metadata.model_dump_json()
+    )
+    assert list(sequential_metadata.files) == list(concurrent_metadata.files)
+    assert sequential_messages[:-1] == concurrent_messages[:-1]
+
+
+def test_crawl_folders_02(tmp_path):
+    metadata, messages = get_collector(tmp_path, 4).get_folder_metadata(None)
+
+    assert "FILES/folder_9/sub/file.mzML" in metadata.files
+    assert "FILES/a.raw" in metadata.folders
+    assert "AUDIT_FILES" not in metadata.folders
+    assert "FILES/nmr/other.txt" not in metadata.files
+    assert "FILES/nmr/fid" in metadata.files
+    assert "type:compressed_file" in metadata.files["FILES/data.zip"].tags
+    timestamp = int(MODIFIED_TIME.replace(tzinfo=datetime.timezone.utc).timestamp())
+    assert metadata.files["FILES/data.zip"].modified_at == timestamp
+    assert "FILES/a.raw is in ignore list. SKIPPED." in messages
+
+
+def test_refresh_folder_index_01(tmp_path):
+    client = MockFtpClient()
+    metadata, _ = get_collector(tmp_path, 2, client=client).get_folder_metadata(None)
+    index = json.loads((tmp_path / "index_2.json").read_text())
+    assert len(index["folder_update_times"]) == len(metadata.folders) + 1
+
+    client.listed_directories = []
+    client.modified_times["MTBLS1/FILES/folder_3"] = datetime.datetime(2025, 1, 1)
+    refreshed, messages = get_collector(
+        tmp_path, 2, client=client, refresh_folder_index_file=True
+    ).get_folder_metadata(None)
+
+    assert client.listed_directories == [
+        "MTBLS1",
+        "MTBLS1/FILES",
+        "MTBLS1/FILES/folder_3",
+    ]
+    assert set(refreshed.files) == set(metadata.files)
+    assert set(refreshed.folders) == set(metadata.folders)
+    timestamp = int(
+        datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+    )
+    assert refreshed.folders["FILES/folder_3"].modified_at == timestamp
+    assert any("carried forward" in x.short for x in messages if not isinstance(x, str))
+
+
+def test_refresh_folder_index_02(tmp_path):
+    client = MockFtpClient()
+    get_collector(tmp_path, 1, client=client).get_folder_metadata(None)
+    index_path = tmp_path / "index_1.json"
+    index = json.loads(index_path.read_text())
+    for folder in index["folder_update_times"]:
+        index["folder_update_times"][folder] = "2020-01-01T00:00:00Z"
+    index_path.write_text(json.dumps(index))
+
+    client.listed_directories = []
+    get_collector(
+        tmp_path,
+        1,
+        client=client,
+        refresh_folder_index_file=True,
+        max_folder_age_in_seconds=None,
+        max_folder_ages_in_seconds={r"^FILES/folder_1(/|$)": 3600},
+    ).get_folder_metadata(None)
+
+    assert client.listed_directories == [
+        "MTBLS1",
+        "MTBLS1/FILES",
+        "MTBLS1/FILES/folder_1",
+        "MTBLS1/FILES/folder_1/sub",
+    ]
+
+
+def test_refresh_folder_index_03(tmp_path):
+    """Expired folders are listed again to find changes in their subfolders."""
+    client = MockFtpClient()
+    get_collector(tmp_path, 1, client=client).get_folder_metadata(None)
+    crawled_directories = set(client.listed_directories)
+    index_path = tmp_path / "index_1.json"
+    index = json.loads(index_path.read_text())
+    for folder in index["folder_update_times"]:
+        index["folder_update_times"][folder] = "2020-01-01T00:00:00Z"
+    index_path.write_text(json.dumps(index))
+
+    client.listed_directories = []
+    get_collector(
+        tmp_path, 1, client=client, refresh_folder_index_file=True
+    ).get_folder_metadata(None)
+
+    assert set(client.listed_directories) == crawled_directories
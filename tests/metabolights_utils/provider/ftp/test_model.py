@@ -0,0 +1,39 @@
+import datetime
+
+from metabolights_utils.provider.ftp.model import FtpFolderContent
+
+
+def test_parse_mlsd_line_01():
+    content = FtpFolderContent()
+    lines = [
+        "type=cdir;modify=20240101101010;UNIX.mode=0755; .",
+        "type=pdir;modify=20240101101010;UNIX.mode=0755; ..",
+        "type=file;size=1024;modify=20240102030405.123;UNIX.mode=0644; data file.raw",
+        "type=dir;size=4096;modify=20240102030405;UNIX.mode=0755; RAW_FILES",
+        "type=OS.unix=symlink;size=10;modify=20240102030405; link.raw",
+        "",
+    ]
+    for line in lines:
+        content.parse_mlsd_line(line)
+
+    assert content.files == ["data file.raw"]
+    assert content.folders == ["RAW_FILES"]
+    assert content.links == {"link.raw"}
+    assert len(content.descriptors) == 3
+    file_descriptor = content.descriptors[0]
+    assert file_descriptor.size_in_bytes == 1024
+    assert file_descriptor.mode == "644"
+    assert file_descriptor.modified_time == datetime.datetime(2024, 1, 2, 3, 4, 5)
+    assert content.descriptors[1].is_directory
+    assert content.descriptors[2].is_link
+
+
+def test_parse_mlsd_line_02():
+    content = FtpFolderContent()
+    content.parse_mlsd_line(
+        " Type=file;Size=5;Modify=invalid; /pub/studies/MTBLS1/i_Investigation.txt"
+    )
+
+    assert content.files == ["i_Investigation.txt"]
+    assert content.descriptors[0].size_in_bytes == 5
+    assert content.descriptors[0].modified_time is None
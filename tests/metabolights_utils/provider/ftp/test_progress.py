@@ -0,0 +1,134 @@
+import contextlib
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from metabolights_utils.provider.ftp import progress
+from metabolights_utils.provider.ftp.model import FtpTransferItem
+from metabolights_utils.provider.ftp.progress import (
+    FtpRateLimiter,
+    FtpTransferMonitor,
+)
+from metabolights_utils.provider.ftp.transfer import FtpTransferScheduler
+
+
+class MockPool:
+    def __init__(self, client, max_connections: int = 1):
+        self.client = client
+        self.max_connections = max_connections
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self.client
+
+
+def get_items():
+    return [
+        FtpTransferItem(relative_path="MTBLS1/FILES/a.raw", size_in_bytes=10),
+        FtpTransferItem(relative_path="MTBLS1/FILES/b.raw", size_in_bytes=20),
+        FtpTransferItem(relative_path="MTBLS1/FILES/c.raw", size_in_bytes=10),
+    ]
+
+
+def test_rate_limiter_01(mocker):
+    sleep = mocker.patch.object(progress.time, "sleep")
+    mocker.patch.object(progress.time, "monotonic", return_value=100.0)
+    limiter = FtpRateLimiter(1000, burst_size_in_bytes=100)
+
+    assert limiter.acquire(100) == 0
+    assert limiter.acquire(500) == pytest.approx(0.5)
+    assert limiter.acquire(500) == pytest.approx(1.0)
+    assert sleep.call_count == 2
+
+
+def test_rate_limiter_02(mocker):
+    sleep = mocker.patch.object(progress.time, "sleep")
+    limiter = FtpRateLimiter(0)
+
+    assert limiter.acquire(10**9) == 0
+    sleep.assert_not_called()
+
+
+def test_transfer_monitor_01():
+    events = []
+    monitor = FtpTransferMonitor(
+        callbacks=[events.append], min_event_interval_in_seconds=0
+    )
+    monitor.start(get_items())
+    monitor.start_file("MTBLS1/FILES/a.raw", 10)
+    monitor.update("MTBLS1/FILES/a.raw", 4)
+    monitor.update("MTBLS1/FILES/a.raw", 6)
+    monitor.finish_file("MTBLS1/FILES/a.raw", "DOWNLOADED")
+    monitor.finish_file("MTBLS1/FILES/b.raw", "SKIPPED", size_in_bytes=20)
+
+    assert [x.transferred_bytes for x in events[:3]] == [4, 10, 10]
+    assert events[2].action == "DOWNLOADED"
+    metrics = monitor.get_metrics()
+    assert metrics.total_files == 3
+    assert metrics.completed_files == 1
+    assert metrics.skipped_files == 1
+    assert metrics.total_bytes == 20
+    assert metrics.transferred_bytes == 10
+    assert metrics.eta_in_seconds is not None
+
+
+def test_transfer_monitor_02():
+    def callback(progress):
+        raise ValueError("callback error")
+
+    monitor = FtpTransferMonitor(callbacks=[callback], min_event_interval_in_seconds=0)
+    monitor.start([FtpTransferItem(relative_path="a.raw", size_in_bytes=10)])
+    monitor.start_file("a.raw", 10)
+    monitor.update("a.raw", 5)
+    monitor.finish_file("a.raw", "ERROR")
+
+    metrics = monitor.get_metrics()
+    assert metrics.failed_files == 1
+    assert metrics.total_bytes == 0
+    assert metrics.transferred_bytes == 0
+
+
+def test_scheduler_progress_01(tmp_path: Path):
+    def retrieve_file(relative_file_path: str, target_path: str, **kwargs) -> int:
+        for _ in range(2):
+            kwargs["callback"](5)
+        Path(target_path).write_bytes(b"x" * 10)
+        return 10
+
+    client = MagicMock()
+    client.retrieve_file.side_effect = retrieve_file
+    limiter = MagicMock()
+    monitor = FtpTransferMonitor(min_event_interval_in_seconds=0)
+    scheduler = FtpTransferScheduler(
+        MockPool(client), rate_limiter=limiter, monitor=monitor
+    )
+    report = scheduler.download_files(get_items(), str(tmp_path))
+
+    assert report.success
+    assert limiter.acquire.call_count == 6
+    metrics = monitor.get_metrics()
+    assert metrics.completed_files == 3
+    assert metrics.transferred_bytes == 30
+
+
+def test_scheduler_progress_02(tmp_path: Path):
+    """Bytes of an interrupted attempt are removed from progress."""
+
+    def retrieve_file(relative_file_path: str, target_path: str, **kwargs) -> int:
+        for size in (5, -5, 10):
+            kwargs["callback"](size)
+        Path(target_path).write_bytes(b"x" * 10)
+        return 10
+
+    client = MagicMock()
+    client.retrieve_file.side_effect = retrieve_file
+    limiter = MagicMock()
+    monitor = FtpTransferMonitor(min_event_interval_in_seconds=0)
+    scheduler = FtpTransferScheduler(
+        MockPool(client), rate_limiter=limiter, monitor=monitor
+    )
+    scheduler.download_files(get_items()[:1], str(tmp_path))
+
+    assert [x.args for x in limiter.acquire.call_args_list] == [(5,), (10,)]
+    assert monitor.get_metrics().transferred_bytes == 10
@@ -0,0 +1,111 @@
+import datetime
+import os
+from pathlib import Path
+
+from metabolights_utils.models.metabolights.model import (
+    StudyFileDescriptor,
+    StudyFolderMetadata,
+)
+from metabolights_utils.provider.ftp.model import FtpTransferItem, FtpTransferPlan
+from metabolights_utils.provider.ftp.sync import (
+    FtpSyncPlanner,
+    get_transfer_plan_from_folder_metadata,
+)
+
+MODIFIED_TIME = datetime.datetime(2024, 1, 2, 3, 4, 5)
+TIMESTAMP = MODIFIED_TIME.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def create_local_file(root: Path, relative_path: str, size: int, timestamp: float):
+    file_path = root / Path(relative_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_bytes(b"x" * size)
+    os.utime(file_path, (timestamp, timestamp))
+
+
+def get_remote_plan() -> FtpTransferPlan:
+    return FtpTransferPlan(
+        success=True,
+        folders=["MTBLS1/FILES", "MTBLS1/FILES/sub"],
+        items=[
+            FtpTransferItem(
+                relative_path=f"MTBLS1/FILES/{name}",
+                size_in_bytes=10,
+                modified_time=MODIFIED_TIME,
+            )
+            for name in ("a.raw", "b.raw", "c.raw", "sub/d.raw")
+        ],
+        folder_contents={
+            "MTBLS1/FILES": ["a.raw", "b.raw", "c.raw", "sub", "link.raw"],
+            "MTBLS1/FILES/sub": ["d.raw"],
+        },
+    )
+
+
+def test_create_plan_01(tmp_path: Path):
+    create_local_file(tmp_path, "MTBLS1/FILES/a.raw", 10, TIMESTAMP + 30)
+    create_local_file(tmp_path, "MTBLS1/FILES/b.raw", 9, TIMESTAMP)
+    create_local_file(tmp_path, "MTBLS1/FILES/c.raw", 10, TIMESTAMP - 3600)
+    create_local_file(tmp_path, "MTBLS1/FILES/c.raw.part", 1, TIMESTAMP)
+    create_local_file(tmp_path, "MTBLS1/FILES/link.raw", 1, TIMESTAMP)
+    create_local_file(tmp_path, "MTBLS1/FILES/old.raw", 1, TIMESTAMP)
+    create_local_file(tmp_path, "MTBLS1/FILES/old/x.raw", 1, TIMESTAMP)
+
+    planner = FtpSyncPlanner(str(tmp_path))
+    plan = planner.create_plan(get_remote_plan(), delete_unlisted_local_files=True)
+
+    assert plan.skipped_files == ["MTBLS1/FILES/a.raw"]
+    assert [x.relative_path for x in plan.downloads] == [
+        "MTBLS1/FILES/b.raw",
+        "MTBLS1/FILES/c.raw",
+        "MTBLS1/FILES/sub/d.raw",
+    ]
+    assert plan.created_folders == ["MTBLS1/FILES/sub"]
+    assert plan.deleted_folders == ["MTBLS1/FILES/old"]
+    assert plan.deleted_files == ["MTBLS1/FILES/old.raw"]
+
+
+def test_create_plan_02(tmp_path: Path):
+    create_local_file(tmp_path, "MTBLS1/FILES/old.raw", 1, TIMESTAMP)
+
+    planner = FtpSyncPlanner(str(tmp_path))
+    plan = planner.create_plan(get_remote_plan())
+
+    assert len(plan.downloads) == 4
+    assert not plan.deleted_files
+
+
+def test_get_transfer_plan_from_folder_metadata_01():
+    timestamp = int(TIMESTAMP)
+    metadata = StudyFolderMetadata()
+    for path, is_directory in (
+        ("FILES", True),
+        ("FILES/a.raw", False),
+        ("FILES/b.d", True),
+        ("FILES/nmr", True),
+        ("FILES/nmr/acqus", False),
+        ("i_Investigation.txt", False),
+    ):
+        descriptor = StudyFileDescriptor(
+            file_path=path,
+            base_name=os.path.basename(path),
+            parent_directory=os.path.dirname(path),
+            is_directory=is_directory,
+            size_in_bytes=10,
+            modified_at=timestamp,
+        )
+        if is_directory:
+            metadata.folders[path] = descriptor
+        else:
+            metadata.files[path] = descriptor
+
+    plan = get_transfer_plan_from_folder_metadata("MTBLS1", metadata, ["FILES"])
+
+    assert plan.folders == ["MTBLS1/FILES", "MTBLS1/FILES/b.d", "MTBLS1/FILES/nmr"]
+    assert [x.relative_path for x in plan.items] == [
+        "MTBLS1/FILES/a.raw",
+        "MTBLS1/FILES/nmr/acqus",
+    ]
+    assert plan.items[0].modified_time == MODIFIED_TIME
+    assert set(plan.folder_contents) == {"MTBLS1/FILES"}
+    assert set(plan.folder_contents["MTBLS1/FILES"]) == {"a.raw", "b.d", "nmr"}
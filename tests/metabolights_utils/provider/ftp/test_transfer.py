@@ -0,0 +1,217 @@
+import contextlib
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from metabolights_utils.provider.ftp.connection_pool import (
+    FtpConnectionPool,
+    FtpConnectionPoolException,
+)
+from metabolights_utils.provider.ftp.default_ftp_client import DefaultFtpClient
+from metabolights_utils.provider.ftp.model import (
+    FtpFileDescriptor,
+    FtpFolderContent,
+    FtpTransferItem,
+    FtpTransferOrder,
+    FtpUploadItem,
+)
+from metabolights_utils.provider.ftp.transfer import FtpTransferScheduler
+
+
+class MockPool:
+    def __init__(self, client, max_connections: int = 1):
+        self.client = client
+        self.max_connections = max_connections
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self.client
+
+
+def get_items():
+    return [
+        FtpTransferItem(relative_path="MTBLS1/FILES/b.raw", size_in_bytes=20),
+        FtpTransferItem(relative_path="MTBLS1/FILES/a.raw", size_in_bytes=10),
+        FtpTransferItem(relative_path="MTBLS1/FILES/c.raw", size_in_bytes=30),
+    ]
+
+
+def test_sort_items_01():
+    pool = MockPool(client=None)
+    items = get_items()
+    smallest = FtpTransferScheduler(pool, order=FtpTransferOrder.SMALLEST_FIRST)
+    assert [x.size_in_bytes for x in smallest.sort_items(items)] == [10, 20, 30]
+    largest = FtpTransferScheduler(pool, order=FtpTransferOrder.LARGEST_FIRST)
+    assert [x.size_in_bytes for x in largest.sort_items(items)] == [30, 20, 10]
+    listed = FtpTransferScheduler(pool, order=FtpTransferOrder.LISTED)
+    assert [x.size_in_bytes for x in listed.sort_items(items)] == [20, 10, 30]
+
+
+def test_download_files_01(tmp_path: Path):
+    downloaded = []
+
+    def retrieve_file(relative_file_path: str, target_path: str, **kwargs) -> int:
+        downloaded.append(relative_file_path)
+        Path(target_path).write_bytes(b"x" * 10)
+        return 10
+
+    client = MagicMock()
+    client.retrieve_file.side_effect = retrieve_file
+    existing_file = tmp_path / Path("MTBLS1/FILES/b.raw")
+    existing_file.parent.mkdir(parents=True)
+    existing_file.write_bytes(b"")
+
+    scheduler = FtpTransferScheduler(MockPool(client))
+    report = scheduler.download_files(get_items(), str(tmp_path))
+
+    assert report.success
+    assert downloaded == ["MTBLS1/FILES/a.raw", "MTBLS1/FILES/c.raw"]
+    actions = {x.relative_path: x.action for x in report.results}
+    assert actions["MTBLS1/FILES/b.raw"] == "SKIPPED"
+    assert actions["MTBLS1/FILES/a.raw"] == "DOWNLOADED"
+    assert report.total_bytes == 20
+
+
+def test_download_files_02(tmp_path: Path):
+    client = MagicMock()
+    client.retrieve_file.side_effect = OSError("connection error")
+
+    scheduler = FtpTransferScheduler(MockPool(client))
+    report = scheduler.download_files(get_items(), str(tmp_path))
+
+    assert not report.success
+    assert report.code == 500
+    assert {x.action for x in report.results} == {"ERROR"}
+
+
+def test_connection_pool_01(tmp_path: Path, mocker):
+    mocker.patch.object(DefaultFtpClient, "connect")
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="ftp.test.connection.pool",
+        remote_repository_root_directory="/pub",
+    )
+    pool = FtpConnectionPool(client, max_connections=2)
+    active = []
+    max_active = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(2)
+
+    def use_connection():
+        with pool.connection() as connection:
+            with lock:
+                active.append(connection)
+                max_active.append(len(active))
+            barrier.wait(timeout=5)
+            with lock:
+                active.remove(connection)
+
+    threads = [threading.Thread(target=use_connection) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with pool.connection() as connection:
+        assert connection.in_session
+    assert max(max_active) == 2
+    assert pool.connection_count == 2
+    pool.close()
+    assert not connection.in_session
+
+
+def test_connection_pool_02(tmp_path: Path, mocker):
+    """Idle connections of a pool count against the per-server limit."""
+    mocker.patch.object(DefaultFtpClient, "connect")
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="ftp.test.connection.pool.limit",
+        remote_repository_root_directory="/pub",
+    )
+    first_pool = FtpConnectionPool(
+        client, max_connections=1, max_connections_per_server=1
+    )
+    second_pool = FtpConnectionPool(
+        client, max_connections=1, max_connections_per_server=1
+    )
+    with first_pool.connection():
+        pass
+    opened = threading.Event()
+
+    def use_second_pool():
+        with second_pool.connection():
+            opened.set()
+
+    thread = threading.Thread(target=use_second_pool)
+    thread.start()
+    assert not opened.wait(timeout=0.2)
+    assert first_pool.connection_count == 1
+    first_pool.close()
+    assert opened.wait(timeout=5)
+    thread.join()
+    assert second_pool.connection_count == 1
+    second_pool.close()
+
+
+def test_connection_pool_03(tmp_path: Path, mocker):
+    """A new connection fails if other pools do not release the server."""
+    mocker.patch.object(DefaultFtpClient, "connect")
+    client = DefaultFtpClient(
+        local_storage_root_path=str(tmp_path),
+        ftp_server_url="ftp.test.connection.pool.timeout",
+        remote_repository_root_directory="/pub",
+    )
+    first_pool = FtpConnectionPool(
+        client, max_connections=1, max_connections_per_server=1
+    )
+    second_pool = FtpConnectionPool(
+        client,
+        max_connections=1,
+        max_connections_per_server=1,
+        server_slot_timeout_in_seconds=0.1,
+    )
+    with first_pool.connection():
+        pass
+
+    with pytest.raises(FtpConnectionPoolException):
+        with second_pool.connection():
+            pass
+
+    assert second_pool.connection_count == 0
+    first_pool.close()
+    with second_pool.connection():
+        pass
+    second_pool.close()
+
+
+def test_upload_files_01(tmp_path: Path):
+    uploaded = []
+    client = MagicMock()
+    client.store_file.side_effect = lambda local_file_path, relative_file_path, **x: (
+        uploaded.append(relative_file_path)
+    )
+    client.list_directory.return_value = FtpFolderContent(
+        success=True, descriptors=[FtpFileDescriptor(base_name="b.raw")]
+    )
+    client.is_uploaded_file.side_effect = lambda path, descriptor, **x: bool(descriptor)
+    items = [
+        FtpUploadItem(
+            local_file_path=str(tmp_path / Path(x.relative_path)),
+            relative_path=x.relative_path,
+            size_in_bytes=x.size_in_bytes,
+        )
+        for x in get_items()
+    ]
+
+    scheduler = FtpTransferScheduler(MockPool(client))
+    report = scheduler.upload_files(items, skip_unchanged_files=True)
+
+    assert report.success
+    client.make_directories.assert_called_once_with("MTBLS1/FILES")
+    client.list_directory.assert_called_once_with("MTBLS1/FILES")
+    assert uploaded == ["MTBLS1/FILES/a.raw", "MTBLS1/FILES/c.raw"]
+    actions = {x.relative_path: x.action for x in report.results}
+    assert actions["MTBLS1/FILES/b.raw"] == "SKIPPED"
+    assert actions["MTBLS1/FILES/c.raw"] == "UPLOADED"
+    assert report.total_bytes == 40
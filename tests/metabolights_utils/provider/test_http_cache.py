@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+from typing import List
+
+import httpx
+import pytest
+
+from metabolights_utils.provider.http_cache import HttpResponseCache
+from metabolights_utils.provider.utils import async_rest_api_get, rest_api_post
+
+SEARCH_URL = "https://www.ebi.ac.uk/metabolights/ws3/public/search/studies/_search"
+
+
+class MockSearchApi:
+    def __init__(self, etag: bool = True) -> None:
+        self.etag = etag
+        self.version = 1
+        self.requests: List[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = f'"v{self.version}"'
+        if self.etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        content = {"version": self.version, "body": json.loads(request.content)}
+        headers = {"ETag": etag} if self.etag else {}
+        return httpx.Response(200, headers=headers, json=content)
+
+
+def test_http_cache_01(tmp_path: Path):
+    api = MockSearchApi()
+    client = httpx.Client(transport=httpx.MockTransport(api.handle))
+    cache = HttpResponseCache(str(tmp_path))
+
+    data, _ = rest_api_post(SEARCH_URL, json_body={"a": 1}, client=client, cache=cache)
+    assert data == {"version": 1, "body": {"a": 1}}
+    data, _ = rest_api_post(SEARCH_URL, json_body={"a": 1}, client=client, cache=cache)
+
+    assert data == {"version": 1, "body": {"a": 1}}
+    assert len(api.requests) == 2
+    assert api.requests[1].headers["If-None-Match"] == '"v1"'
+
+    api.version = 2
+    data, _ = rest_api_post(SEARCH_URL, json_body={"a": 1}, client=client, cache=cache)
+    assert data["version"] == 2
+    data, _ = rest_api_post(SEARCH_URL, json_body={"a": 2}, client=client, cache=cache)
+    assert data["body"] == {"a": 2}
+    assert "If-None-Match" not in api.requests[-1].headers
+
+
+def test_http_cache_02(tmp_path: Path):
+    api = MockSearchApi(etag=False)
+    client = httpx.Client(transport=httpx.MockTransport(api.handle))
+    cache = HttpResponseCache(str(tmp_path), ttl_in_seconds=60)
+
+    for _ in range(3):
+        data, _ = rest_api_post(
+            SEARCH_URL, json_body={"a": 1}, client=client, cache=cache
+        )
+        assert data["body"] == {"a": 1}
+    assert len(api.requests) == 1
+
+    rest_api_post(
+        SEARCH_URL,
+        headers={"User-Token": "other"},
+        json_body={"a": 1},
+        client=client,
+        cache=cache,
+    )
+    assert len(api.requests) == 2
+
+
+def test_http_cache_03(tmp_path: Path):
+    """Responses without validators are not stored if TTL is 0."""
+    api = MockSearchApi(etag=False)
+    client = httpx.Client(transport=httpx.MockTransport(api.handle))
+    cache = HttpResponseCache(str(tmp_path))
+
+    rest_api_post(SEARCH_URL, json_body={}, client=client, cache=cache)
+    rest_api_post(SEARCH_URL, json_body={}, client=client, cache=cache)
+
+    assert len(api.requests) == 2
+    assert not list(tmp_path.rglob("*.json"))
+
+
+@pytest.mark.asyncio
+async def test_http_cache_04(tmp_path: Path):
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-Modified-Since"):
+            return httpx.Response(304)
+        last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        return httpx.Response(
+            200, headers={"Last-Modified": last_modified}, json={"study": []}
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    cache = HttpResponseCache(str(tmp_path))
+    url = "https://www.ebi.ac.uk/metabolights/ws/studies/user"
+
+    for _ in range(2):
+        data, _ = await async_rest_api_get(url, client, cache=cache)
+        assert data == {"study": []}
+    assert requests[1].headers["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
@@ -0,0 +1,78 @@
+import json
+import time
+from typing import List
+
+import httpx
+import pytest
+
+from metabolights_utils.provider.public_search import (
+    PublicSearchException,
+    iterate_public_search_results,
+)
+
+
+class MockSearchApi:
+    def __init__(self, total: int, fail_at: int = -1) -> None:
+        self.total = total
+        self.fail_at = fail_at
+        self.requests: List[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        skip = int(request.url.params["skip"])
+        limit = int(request.url.params["limit"])
+        if skip == self.fail_at:
+            return httpx.Response(500, text="server error")
+        page = [
+            {"studyId": f"MTBLS{x}"} for x in range(skip, min(skip + limit, self.total))
+        ]
+        content = {"page": page, "total": self.total, "pageSize": len(page)}
+        return httpx.Response(200, json={"status": "success", "content": content})
+
+
+def get_client(api: MockSearchApi) -> httpx.Client:
+    return httpx.Client(transport=httpx.MockTransport(api.handle))
+
+
+def test_iterate_public_search_results_01():
+    api = MockSearchApi(total=250)
+
+    items = iterate_public_search_results("diet", client=get_client(api))
+
+    assert [x["studyId"] for x in items] == [f"MTBLS{x}" for x in range(250)]
+    assert [x.url.params["skip"] for x in api.requests] == ["0", "100", "200"]
+    assert json.loads(api.requests[0].content) == {}
+    assert api.requests[0].url.params["query"] == "diet"
+
+
+def test_iterate_public_search_results_02():
+    """Next page is fetched before the current page is consumed."""
+    api = MockSearchApi(total=30)
+
+    items = iterate_public_search_results(page_size=10, client=get_client(api))
+    next(items)
+    time.sleep(0.1)
+
+    assert len(api.requests) == 2
+    items.close()
+
+
+def test_iterate_public_search_results_03():
+    api = MockSearchApi(total=250)
+
+    items = iterate_public_search_results(
+        skip=5, max_items=25, page_size=10, client=get_client(api)
+    )
+
+    assert [x["studyId"] for x in items] == [f"MTBLS{x}" for x in range(5, 30)]
+    assert [x.url.params["limit"] for x in api.requests] == ["10", "10", "5"]
+
+
+def test_iterate_public_search_results_04():
+    api = MockSearchApi(total=250, fail_at=100)
+
+    items = iterate_public_search_results(client=get_client(api))
+
+    with pytest.raises(PublicSearchException, match="server error"):
+        for _ in items:
+            pass
@@ -0,0 +1,210 @@
+import io
+import os
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from metabolights_utils.provider.submission_repository import (
+    MetabolightsSubmissionRepository,
+)
+from metabolights_utils.provider.task_waiter import TaskWaiter
+
+STUDY_ID = "MTBLS1000001"
+BASE_URL = "https://www.ebi.ac.uk/metabolights/ws"
+
+
+class MockSubmissionApi:
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        self.created_at: Dict[str, str] = {}
+        self.uploads: List[str] = []
+        self.errors: Dict[str, List[int]] = {}
+        self.upload_count = 0
+        self.downloads: List[str] = []
+        self.validation_polls: Dict[str, int] = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/files/tree"):
+            study = [
+                {"file": x, "createdAt": self.created_at[x]} for x in sorted(self.files)
+            ]
+            return httpx.Response(200, json={"study": study})
+        if request.url.path.endswith("/drag-drop-upload"):
+            request.read()
+            content_type = request.headers["Content-Type"]
+            data = request.content.split(content_type.split("boundary=")[1].encode())
+            header, content = data[1].split(b"\r\n\r\n", 1)
+            filename = header.split(b'filename="')[1].split(b'"')[0].decode()
+            self.uploads.append(filename)
+            if self.errors.get(filename):
+                return httpx.Response(self.errors[filename].pop(0), text="error")
+            self.upload_count += 1
+            self.files[filename] = content[: -len(b"\r\n--")]
+            self.created_at[filename] = f"2030-01-01 00:00:{self.upload_count:02d}"
+            return httpx.Response(200, json={})
+        if request.url.path.endswith("/download"):
+            filename = request.url.params["file"]
+            self.downloads.append(filename)
+            content = io.BytesIO()
+            with zipfile.ZipFile(content, "w") as zip_file:
+                zip_file.writestr(filename, self.files[filename])
+            return httpx.Response(200, content=content.getvalue())
+        if request.url.path.endswith("/auth/login-with-token"):
+            return httpx.Response(200, headers={"jwt": "jwt-token"}, json={})
+        if "/submissions/v2/validations/" in request.url.path:
+            return self.handle_validation(request)
+        return httpx.Response(404, text="not found")
+
+    def handle_validation(self, request: httpx.Request) -> httpx.Response:
+        study_id = request.url.path.split("/validations/")[1].split("/")[0]
+        task = {"taskId": f"task-{study_id}", "ready": False}
+        if request.method == "GET":
+            self.validation_polls[study_id] = self.validation_polls.get(study_id, 0) + 1
+            if self.validation_polls[study_id] >= 3:
+                task.update(ready=True, isSuccessful=study_id != "MTBLS3")
+        content = {"task": task, "taskResult": {"violations": [], "summary": []}}
+        return httpx.Response(200, json={"status": "success", "content": content})
+
+
+@pytest.fixture
+def api(mocker) -> MockSubmissionApi:
+    mocker.patch("time.sleep")
+    return MockSubmissionApi()
+
+
+def get_repository(api: MockSubmissionApi, tmp_path: Path):
+    return MetabolightsSubmissionRepository(
+        local_storage_root_path=str(tmp_path / Path("data")),
+        local_storage_cache_path=str(tmp_path / Path("cache")),
+        rest_api_base_url=BASE_URL,
+        http_client=httpx.Client(transport=httpx.MockTransport(api.handle)),
+    )
+
+
+def create_metadata_files(tmp_path: Path, count: int = 5) -> Path:
+    study_path = tmp_path / Path("data") / Path(STUDY_ID)
+    study_path.mkdir(parents=True)
+    (study_path / "i_Investigation.txt").write_text("investigation")
+    for index in range(count - 1):
+        (study_path / f"m_MTBLS1000001_{index}_maf.tsv").write_text(f"maf {index}")
+    return study_path
+
+
+def test_upload_metadata_files_01(api: MockSubmissionApi, tmp_path: Path):
+    study_path = create_metadata_files(tmp_path)
+    repository = get_repository(api, tmp_path)
+
+    success, message = repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token", max_workers=3
+    )
+
+    assert success, message
+    assert sorted(api.files) == sorted(os.listdir(study_path))
+    assert api.files["i_Investigation.txt"] == b"investigation"
+    index = repository.load_metadata_file_index(STUDY_ID)
+    assert sorted(index.files) == sorted(api.files)
+
+    api.uploads.clear()
+    success, message = repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token"
+    )
+    assert not success
+    assert "up-to-date" in message
+    assert not api.uploads
+
+
+def test_upload_metadata_files_02(api: MockSubmissionApi, tmp_path: Path):
+    """Changed content is uploaded even if local file is older than remote file."""
+    study_path = create_metadata_files(tmp_path)
+    repository = get_repository(api, tmp_path)
+    repository.upload_metadata_files(STUDY_ID, str(study_path), "token")
+    api.uploads.clear()
+
+    file_path = study_path / "m_MTBLS1000001_0_maf.tsv"
+    file_path.write_text("updated maf")
+    os.utime(file_path, (1000000000, 1000000000))
+    success, message = repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token"
+    )
+
+    assert success, message
+    assert api.uploads == ["m_MTBLS1000001_0_maf.tsv"]
+    assert api.files["m_MTBLS1000001_0_maf.tsv"] == b"updated maf"
+
+
+def test_upload_metadata_files_03(api: MockSubmissionApi, tmp_path: Path):
+    study_path = create_metadata_files(tmp_path)
+    api.errors = {
+        "i_Investigation.txt": [503, 502],
+        "m_MTBLS1000001_0_maf.tsv": [400],
+        "m_MTBLS1000001_1_maf.tsv": [503, 503, 503, 503],
+    }
+    repository = get_repository(api, tmp_path)
+
+    success, message = repository.upload_metadata_files(
+        STUDY_ID, str(study_path), "token", max_retries=3
+    )
+
+    assert not success
+    assert "i_Investigation.txt" in api.files
+    assert "m_MTBLS1000001_0_maf.tsv: 400" in message
+    assert "m_MTBLS1000001_1_maf.tsv: 503" in message
+    assert api.uploads.count("m_MTBLS1000001_0_maf.tsv") == 1
+    assert api.uploads.count("m_MTBLS1000001_1_maf.tsv") == 4
+    index = repository.load_metadata_file_index(STUDY_ID)
+    assert sorted(index.files) == sorted(api.files)
+
+
+def test_download_submission_metadata_files_01(
+    api: MockSubmissionApi, tmp_path: Path, mocker
+):
+    for index in range(20):
+        filename = f"m_MTBLS1000001_{index}_maf.tsv"
+        api.files[filename] = f"maf {index}".encode()
+        api.created_at[filename] = "2020-01-01 00:00:00"
+    repository = get_repository(api, tmp_path)
+    mocker.patch.object(repository, "get_api_token", return_value=("token", None))
+
+    result = repository.download_submission_metadata_files(STUDY_ID, max_workers=8)
+
+    assert result.success, result.message
+    assert sorted(api.downloads) == sorted(api.files)
+    study_path = tmp_path / Path("data") / Path(STUDY_ID)
+    assert (study_path / "m_MTBLS1000001_3_maf.tsv").read_bytes() == b"maf 3"
+    assert set(result.actions.values()) == {"DOWNLOADED"}
+
+    api.downloads.clear()
+    api.files["m_MTBLS1000001_0_maf.tsv"] = b"updated maf"
+    api.created_at["m_MTBLS1000001_0_maf.tsv"] = "2020-01-01 00:00:01"
+    (study_path / "m_MTBLS1000001_1_maf.tsv").write_text("local update")
+    result = repository.download_submission_metadata_files(STUDY_ID)
+
+    assert result.success, result.message
+    assert api.downloads == ["m_MTBLS1000001_0_maf.tsv"]
+    assert (study_path / "m_MTBLS1000001_0_maf.tsv").read_bytes() == b"updated maf"
+    assert (study_path / "m_MTBLS1000001_1_maf.tsv").read_text() == "local update"
+    skipped = [x for x, y in result.actions.items() if y == "SKIPPED"]
+    assert len(skipped) == 19
+
+
+def test_validate_studies_01(api: MockSubmissionApi, tmp_path: Path):
+    repository = get_repository(api, tmp_path)
+    repository.validation_api_base_url = BASE_URL
+    study_ids = ["MTBLS1", "MTBLS2", "MTBLS3"]
+    file_paths = {x: str(tmp_path / Path(x) / "validation.json") for x in study_ids}
+
+    results = repository.validate_studies(
+        file_paths,
+        user_api_token="token",
+        task_waiter=TaskWaiter(initial_interval_in_seconds=0.01),
+    )
+
+    assert results["MTBLS1"] == (True, "task-MTBLS1")
+    assert results["MTBLS2"] == (True, "task-MTBLS2")
+    assert results["MTBLS3"] == (False, "Task task-MTBLS3 is not successful.")
+    assert api.validation_polls == {x: 3 for x in study_ids}
+    assert Path(file_paths["MTBLS1"]).exists()
+    assert not Path(file_paths["MTBLS3"]).exists()
@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from metabolights_utils.provider.task_waiter import TaskWaiter
+
+
+def get_poll(done_after: int):
+    calls = []
+
+    def poll():
+        calls.append(time.monotonic())
+        return len(calls) >= done_after, len(calls)
+
+    return poll, calls
+
+
+def test_get_interval_01():
+    waiter = TaskWaiter(initial_interval_in_seconds=1, max_interval_in_seconds=8)
+
+    for attempt, expected in ((1, 1), (2, 2), (3, 4), (4, 8), (10, 8)):
+        interval = waiter.get_interval(attempt)
+        assert expected / 2 <= interval <= expected
+
+
+def test_from_poll_period_01():
+    waiter = TaskWaiter.from_poll_period(pool_period=5, retry=20)
+
+    assert waiter.initial_interval_in_seconds == 1
+    assert waiter.max_interval_in_seconds == 5
+    assert waiter.deadline_in_seconds == 105
+
+
+def test_wait_01():
+    waiter = TaskWaiter(initial_interval_in_seconds=0.01, max_interval_in_seconds=0.02)
+    poll, calls = get_poll(done_after=4)
+
+    done, result = waiter.wait(poll)
+
+    assert done
+    assert result == 4
+    assert len(calls) == 4
+
+
+def test_wait_02():
+    waiter = TaskWaiter(
+        initial_interval_in_seconds=0.01,
+        max_interval_in_seconds=0.02,
+        deadline_in_seconds=0.1,
+    )
+    poll, calls = get_poll(done_after=1000)
+    start = time.monotonic()
+
+    done, result = waiter.wait(poll)
+
+    assert not done
+    assert result == len(calls)
+    assert time.monotonic() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_wait_all_01():
+    waiter = TaskWaiter(initial_interval_in_seconds=0.05, max_interval_in_seconds=0.05)
+
+    def get_async_poll(done_after: int):
+        poll, _ = get_poll(done_after)
+
+        async def async_poll():
+            return poll()
+
+        return async_poll
+
+    start = time.monotonic()
+    results = await waiter.wait_all([get_async_poll(x) for x in range(1, 21)])
+    duration = time.monotonic() - start
+
+    assert results == [(True, x) for x in range(1, 21)]
+    # Waiting one task after another takes at least 0.025 seconds per poll.
+    assert duration < 0.025 * sum(range(1, 21))
+
+    results = await waiter.wait_all(
+        [get_async_poll(2) for _ in range(6)], max_concurrency=2
+    )
+    assert all(x[0] for x in results)
@@ -0,0 +1,282 @@
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union
+
+import httpx
+import pytest
+
+from metabolights_utils.provider import utils
+from metabolights_utils.provider.utils import (
+    HttpRetryPolicy,
+    async_download_file_from_rest_api,
+    create_async_http_client,
+    create_http_client,
+    download_file_from_rest_api,
+    get_retry_after_seconds,
+    rest_api_get,
+)
+
+
+def mock_responses(mocker, responses: List[Union[int, Exception]], is_async=False):
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        item = responses[min(len(requests), len(responses)) - 1]
+        if isinstance(item, Exception):
+            raise item
+        stream = httpx.ByteStream(json.dumps({"status": item}).encode())
+        return httpx.Response(item, stream=stream, request=request)
+
+    async def handle_async(request: httpx.Request) -> httpx.Response:
+        return handle(request)
+
+    if is_async:
+        mocker.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=handle_async,
+        )
+    else:
+        mocker.patch.object(httpx.HTTPTransport, "handle_request", side_effect=handle)
+    return requests
+
+
+def test_http_client_retry_01(mocker):
+    requests = mock_responses(mocker, [503, 502, 200])
+    client = create_http_client(backoff_factor=0, http2=False)
+
+    response = client.get("https://www.ebi.ac.uk/metabolights/ws/studies")
+
+    assert response.status_code == 200
+    assert len(requests) == 3
+
+
+def test_http_client_retry_02(mocker):
+    requests = mock_responses(mocker, [503, 200])
+    client = create_http_client(backoff_factor=0, http2=False)
+
+    response = client.post("https://www.ebi.ac.uk/metabolights/ws/studies", json={})
+
+    assert response.status_code == 503
+    assert len(requests) == 1
+
+
+def test_http_client_retry_03(mocker):
+    requests = mock_responses(mocker, [httpx.ConnectError("refused"), 201])
+    client = create_http_client(backoff_factor=0, http2=False)
+
+    response = client.post("https://www.ebi.ac.uk/metabolights/ws/studies", json={})
+
+    assert response.status_code == 201
+    assert len(requests) == 2
+
+
+def test_http_client_retry_04(mocker):
+    requests = mock_responses(mocker, [httpx.ReadError("reset")])
+    client = create_http_client(max_retries=2, backoff_factor=0, http2=False)
+
+    with pytest.raises(httpx.ReadError):
+        client.get("https://www.ebi.ac.uk/metabolights/ws/studies")
+    assert len(requests) == 3
+
+
+class InFlightByteStream(httpx.SyncByteStream):
+    def __init__(self, counter: "InFlightCounter") -> None:
+        self.counter = counter
+
+    def __iter__(self):
+        yield b"{}"
+
+    def close(self) -> None:
+        self.counter.update(-1)
+
+
+class InFlightCounter:
+    """Counts responses that are sent and not closed yet."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def update(self, value: int) -> None:
+        with self.lock:
+            self.current += value
+            self.peak = max(self.peak, self.current)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.update(1)
+        time.sleep(0.02)
+        return httpx.Response(200, stream=InFlightByteStream(self), request=request)
+
+
+def test_http_client_host_limit_01(mocker):
+    counter = InFlightCounter()
+    mocker.patch.object(
+        httpx.HTTPTransport, "handle_request", side_effect=counter.handle
+    )
+    client = create_http_client(max_connections_per_host=2, http2=False)
+
+    def get(_):
+        with client.stream("GET", "https://www.ebi.ac.uk/ws") as response:
+            response.read()
+            time.sleep(0.02)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(get, range(12)))
+
+    assert counter.peak == 2
+    assert counter.current == 0
+
+
+@pytest.mark.asyncio
+async def test_async_http_client_retry_01(mocker):
+    requests = mock_responses(mocker, [429, 200], is_async=True)
+    async with create_async_http_client(backoff_factor=0, http2=False) as client:
+        response = await client.get("https://www.ebi.ac.uk/metabolights/ws/studies")
+
+    assert response.status_code == 200
+    assert len(requests) == 2
+
+
+def test_retry_policy_01():
+    policy = HttpRetryPolicy(backoff_factor=1, max_backoff_in_seconds=4)
+    response = httpx.Response(503, headers={"Retry-After": "7"})
+
+    assert policy.get_wait_time(1, response) == 7
+    assert 2 <= policy.get_wait_time(10) <= 4
+    assert get_retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert get_retry_after_seconds("invalid") is None
+
+
+def test_rest_api_get_01():
+    def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"path": request.url.path})
+
+    client = httpx.Client(transport=httpx.MockTransport(handle))
+
+    data, error = rest_api_get("https://www.ebi.ac.uk/ws/studies", client=client)
+
+    assert data == {"path": "/ws/studies"}
+    assert error is None
+
+
+def get_download_client(content: bytes, status_code: int = 200) -> httpx.Client:
+    def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code, content=content)
+
+    return httpx.Client(transport=httpx.MockTransport(handle))
+
+
+def test_download_file_from_rest_api_01(tmp_path):
+    content = os.urandom(3 * 1024 + 1)
+    client = get_download_client(content)
+    local_file_path = tmp_path / "MTBLS1" / "i_Investigation.txt"
+
+    success, error = download_file_from_rest_api(
+        "https://www.ebi.ac.uk/ws/download",
+        str(local_file_path),
+        modification_time=1700000000,
+        client=client,
+        chunk_size=1024,
+    )
+
+    assert success, error
+    assert local_file_path.read_bytes() == content
+    assert local_file_path.stat().st_mtime == 1700000000
+    assert os.listdir(local_file_path.parent) == ["i_Investigation.txt"]
+
+
+def test_download_file_from_rest_api_02(tmp_path):
+    zip_content = io.BytesIO()
+    with zipfile.ZipFile(zip_content, "w") as zip_file:
+        zip_file.writestr("i_Investigation.txt", "investigation")
+        zip_file.writestr("s_MTBLS1.txt", "Sample Name")
+    client = get_download_client(zip_content.getvalue())
+    local_file_path = tmp_path / "MTBLS1" / "metadata.zip"
+
+    success, error = download_file_from_rest_api(
+        "https://www.ebi.ac.uk/ws/download",
+        str(local_file_path),
+        modification_time=1700000000,
+        is_zip_response=True,
+        client=client,
+    )
+
+    assert success, error
+    assert sorted(os.listdir(local_file_path.parent)) == [
+        "i_Investigation.txt",
+        "s_MTBLS1.txt",
+    ]
+    sample_file = local_file_path.parent / "s_MTBLS1.txt"
+    assert sample_file.read_text() == "Sample Name"
+    assert sample_file.stat().st_mtime == 1700000000
+
+
+def test_download_file_from_rest_api_03(tmp_path):
+    local_file_path = tmp_path / "i_Investigation.txt"
+    local_file_path.write_text("current")
+    client = get_download_client(b"error", status_code=500)
+
+    success, _ = download_file_from_rest_api(
+        "https://www.ebi.ac.uk/ws/download", str(local_file_path), client=client
+    )
+
+    assert not success
+    assert local_file_path.read_text() == "current"
+    assert os.listdir(tmp_path) == ["i_Investigation.txt"]
+
+
+class ThreadRecordingFile:
+    """Records threads of file writes."""
+
+    def __init__(self, file) -> None:
+        self.file = file
+        self.write_threads = set()
+
+    def write(self, data: bytes) -> int:
+        self.write_threads.add(threading.get_ident())
+        return self.file.write(data)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+@pytest.mark.asyncio
+async def test_async_download_file_from_rest_api_01(tmp_path, mocker):
+    content = os.urandom(3 * 1024 + 1)
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=content)
+
+    files = []
+    fdopen = os.fdopen
+
+    def open_file(*args, **kwargs):
+        files.append(ThreadRecordingFile(fdopen(*args, **kwargs)))
+        return files[-1]
+
+    mocker.patch.object(utils.os, "fdopen", side_effect=open_file)
+    local_file_path = tmp_path / "MTBLS1" / "i_Investigation.txt"
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handle)) as client:
+        success, error = await async_download_file_from_rest_api(
+            "https://www.ebi.ac.uk/ws/download",
+            str(local_file_path),
+            client,
+            modification_time=1700000000,
+            chunk_size=1024,
+        )
+
+    assert success, error
+    assert local_file_path.read_bytes() == content
+    assert local_file_path.stat().st_mtime == 1700000000
+    assert os.listdir(local_file_path.parent) == ["i_Investigation.txt"]
+    assert files[0].write_threads
+    assert threading.get_ident() not in files[0].write_threads
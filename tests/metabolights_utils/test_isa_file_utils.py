@@ -0,0 +1,82 @@
+import asyncio
+import shutil
+import uuid
+from pathlib import Path
+
+import pytest
+
+from metabolights_utils.isa_file_utils import IsaFileUtils
+from metabolights_utils.models.isa.common import (
+    IsaTable,
+    IsaTableColumn,
+    IsaTableFile,
+)
+
+
+@pytest.fixture(scope="function")
+def tmp_path():
+    tmp_path = None
+    try:
+        tmp_path = Path(f"test-temp/test_{uuid.uuid4().hex}")
+        yield str(tmp_path)
+    finally:
+        if tmp_path and tmp_path.exists():
+            shutil.rmtree(str(tmp_path))
+
+
+def get_isa_table_file() -> IsaTableFile:
+    headers = ["Source Name", "Characteristics[Organism]", "Term Source REF"]
+    names = ["Source Name", "Characteristics[Organism]", "Term Source REF"]
+    data = {
+        names[0]: ["S1", "S2\twith tab", ""],
+        names[1]: [' "Homo sapiens" ', "Mus\nmusculus", ""],
+        names[2]: ["NCBITAXON", "", "NCBITAXON\r"],
+    }
+    table = IsaTable(
+        columns=names,
+        headers=[
+            IsaTableColumn(column_index=idx, column_header=x, column_name=names[idx])
+            for idx, x in enumerate(headers)
+        ],
+        data=data,
+        row_indices=[0, 1, 2],
+        column_indices=[0, 1, 2],
+    )
+    return IsaTableFile(file_path="s_test.txt", table=table)
+
+
+def test_save_isa_table_01(tmp_path: str):
+    file_path = Path(tmp_path) / Path("s_test.txt")
+    saved = asyncio.run(IsaFileUtils.save_isa_table(get_isa_table_file(), file_path))
+    assert saved
+    assert file_path.read_text().splitlines() == [
+        "Source Name\tCharacteristics[Organism]\tTerm Source REF",
+        "S1\tHomo sapiens\tNCBITAXON",
+        "S2 with tab\tMus musculus\t",
+        "\t\tNCBITAXON",
+    ]
+
+
+def test_save_isa_table_quotation_mark_01(tmp_path: str):
+    file_path = Path(tmp_path) / Path("s_test.txt")
+    IsaFileUtils.write_isa_table(
+        get_isa_table_file(), file_path, values_in_quotation_mark=True
+    )
+    lines = file_path.read_text().splitlines()
+    assert lines[0] == '"Source Name"\t"Characteristics[Organism]"\t"Term Source REF"'
+    assert lines[3] == '""\t""\t"NCBITAXON"'
+
+
+def test_save_isa_table_skip_unchanged_file_01(tmp_path: str):
+    file_path = Path(tmp_path) / Path("s_test.txt")
+    isa_table_file = get_isa_table_file()
+    assert IsaFileUtils.write_isa_table(isa_table_file, file_path)
+    assert not IsaFileUtils.write_isa_table(
+        isa_table_file, file_path, skip_unchanged_file=True
+    )
+    isa_table_file.table.data["Source Name"][0] = "S1 updated"
+    assert IsaFileUtils.write_isa_table(
+        isa_table_file, file_path, skip_unchanged_file=True
+    )
+    assert file_path.read_text().splitlines()[1].startswith("S1 updated\t")
+    assert len(list(Path(tmp_path).iterdir())) == 1
@@ -52,3 +52,24 @@ def test_copy_isa_metadata_files_02(tmp_path: str):
     )
     assert not target_path
     assert not Path(tmp_path).exists()
+
+
+def test_create_audit_folder_link_unchanged_files_01(tmp_path: str):
+    first_audit_path = MetabolightsAuditUtils.create_audit_folder(
+        src_root_path="tests/test-data/MTBLS1",
+        target_root_path=tmp_path,
+        timestamp_format="%Y-%m-%d_%H-%M-%S_1",
+    )
+    audit_path = MetabolightsAuditUtils.create_audit_folder(
+        src_root_path="tests/test-data/MTBLS1",
+        target_root_path=tmp_path,
+        timestamp_format="%Y-%m-%d_%H-%M-%S_2",
+        link_unchanged_files=True,
+    )
+    assert audit_path and audit_path != first_audit_path
+    audit_files = os.listdir(audit_path)
+    assert len(audit_files) == len(os.listdir(first_audit_path))
+    for file in audit_files:
+        assert os.path.samefile(
+            os.path.join(first_audit_path, file), os.path.join(audit_path, file)
+        )
@@ -0,0 +1,51 @@
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+import pytest
+
+from metabolights_utils.utils.lock_utils import FileLock, FileLockException
+
+
+@pytest.fixture(scope="function")
+def tmp_path():
+    tmp_path = None
+    try:
+        tmp_path = Path(f"test-temp/test_{uuid.uuid4().hex}")
+        yield str(tmp_path)
+    finally:
+        if tmp_path and tmp_path.exists():
+            shutil.rmtree(str(tmp_path))
+
+
+def test_file_lock_timeout_01(tmp_path: str):
+    file_path = Path(tmp_path) / Path("s_test.txt")
+    with FileLock(file_path, lock_folder_path=tmp_path) as lock:
+        assert lock.locked
+        with pytest.raises(FileLockException):
+            FileLock(file_path, lock_folder_path=tmp_path, timeout=0.1).acquire()
+    assert not lock.locked
+    with FileLock(file_path, lock_folder_path=tmp_path, timeout=0.1) as lock:
+        assert lock.locked
+
+
+def test_file_lock_threads_01(tmp_path: str):
+    file_path = Path(tmp_path) / Path("s_test.txt")
+    active = []
+    overlaps = []
+
+    def run():
+        for _ in range(20):
+            with FileLock(file_path, lock_folder_path=tmp_path, poll_interval=0.001):
+                active.append(1)
+                if len(active) > 1:
+                    overlaps.append(1)
+                active.pop()
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not overlaps